@@ -18,6 +18,10 @@ interface IERC4626 {
     ) external returns (uint256);
 }
 
+interface ICurvePool {
+    function balances(uint256 i) external view returns (uint256);
+}
+
 interface IStrategyProxy {
     function lock() external;
 
@@ -27,17 +31,33 @@ interface IStrategyProxy {
 contract Strategy is BaseStrategy {
     using SafeERC20 for IERC20;
 
+    // Config read on every harvest and trigger check is packed into two slots:
+    // swapThresholds in one, everything else below in the other (32 bytes).
     SwapThresholds public swapThresholds;
     ISwapper public swapper;
     bool public bypassClaim;
     bool public bypassMaxStake;
-    uint public thresholdTimeUntilWeekEnd = 1 hours;
+    // under 7 days
+    uint32 public thresholdTimeUntilWeekEnd;
+    // max price impact per sale on pool1 in bps, 0 sells on the swapThresholds schedule
+    uint16 public maxPriceImpact;
+    // max weeks of rewards claimed per harvest, 0 claims everything at once
+    uint16 public maxClaimWeeks;
+    // week number (timestamp / 1 weeks) of the last proxy lock
+    uint16 public lastLockWeek;
+    // swap output staked as max weighted in adjustPosition instead of right
+    // away, so a harvest can net it against what the vault takes back
+    uint internal toMaxStake;
+    // StrategyFactory clones run this deployment's code, so they share these
+    // and stay off storage on the hot path. Another staker needs its own
+    // original and factory.
     IYearnBoostedStaker public immutable ybs;
     IRewardDistributor public immutable rewardDistributor;
     IERC20 public immutable rewardToken;
     IERC20 public immutable rewardTokenUnderlying;
     IStrategyProxy public constant proxy =
         IStrategyProxy(0x78eDcb307AC1d1F8F5Fd070B377A6e69C8dcFC34);
+    uint internal constant MAX_BPS = 10_000;
 
     struct SwapThresholds {
         uint112 min;
@@ -45,6 +65,15 @@ contract Strategy is BaseStrategy {
         bool autoAdjustThresholds;
     }
 
+    enum TriggerReason {
+        None,
+        WeekEnd,
+        Forced,
+        ReportDelay,
+        Credit,
+        Claimable
+    }
+
     constructor(
         address _vault,
         IYearnBoostedStaker _ybs,
@@ -57,27 +86,60 @@ contract Strategy is BaseStrategy {
             _rewardDistributor.staker() == address(_ybs),
             "Invalid rewards"
         );
+        address _rewardToken = _rewardDistributor.rewardToken();
+        IERC20 _rewardTokenUnderlying = IERC20(IERC4626(_rewardToken).asset());
+
+        ybs = _ybs;
+        rewardDistributor = _rewardDistributor;
+        rewardToken = IERC20(_rewardToken);
+        rewardTokenUnderlying = _rewardTokenUnderlying;
+
+        _initializeStrategy(_ybs, _rewardTokenUnderlying, _swapper);
+        _setSwapThresholds(100e18, 10_000e18, true);
+    }
+
+    // For clones, see StrategyFactory. Reverts once want is set, so the
+    // original and initialized clones can't be initialized again.
+    function initialize(
+        address _vault,
+        address _strategist,
+        address _keeper,
+        ISwapper _swapper,
+        SwapThresholds calldata _swapThresholds,
+        uint256 _creditThreshold
+    ) external {
+        _initialize(_vault, _strategist, _strategist, _keeper);
+        _initializeStrategy(ybs, rewardTokenUnderlying, _swapper);
+        _setSwapThresholds(
+            _swapThresholds.min,
+            _swapThresholds.max,
+            _swapThresholds.autoAdjustThresholds
+        );
+        creditThreshold = _creditThreshold;
+    }
+
+    // takes the staker and reward token as arguments, the constructor can't
+    // read immutables yet
+    function _initializeStrategy(
+        IYearnBoostedStaker _ybs,
+        IERC20 _rewardTokenUnderlying,
+        ISwapper _swapper
+    ) internal {
         require(
             address(want) == address(_swapper.tokenOut()),
             "Invalid rewards"
         );
-        address _rewardToken = _rewardDistributor.rewardToken();
-        IERC20 _rewardTokenUnderlying = IERC20(IERC4626(_rewardToken).asset());
         require(
             _rewardTokenUnderlying == _swapper.tokenIn(),
             "Invalid rewards"
         );
-
-        ybs = _ybs;
-        rewardDistributor = _rewardDistributor;
         swapper = _swapper;
-        rewardToken = IERC20(_rewardToken);
-        rewardTokenUnderlying = _rewardTokenUnderlying;
 
         want.approve(address(_ybs), type(uint).max);
         _rewardTokenUnderlying.approve(address(_swapper), type(uint).max);
 
-        _setSwapThresholds(100e18, 10_000e18, true);
+        thresholdTimeUntilWeekEnd = 1 hours;
+        maxClaimWeeks = 8;
         minReportDelay = 22 hours;
     }
 
@@ -107,12 +169,14 @@ contract Strategy is BaseStrategy {
         (_amountFreed, _loss) = liquidatePosition(_debtOutstanding + _profit);
         _debtPayment = min(_debtOutstanding, _amountFreed);
 
-        // lock at the end of each epoch
-        uint weekEnd = (block.timestamp / 1 weeks + 1) * 1 weeks;
+        // lock at the end of each epoch, once
+        uint week = block.timestamp / 1 weeks;
+        uint weekEnd = (week + 1) * 1 weeks;
         bool isNearEnd = weekEnd - block.timestamp <= thresholdTimeUntilWeekEnd;
-        if (isNearEnd) {
+        if (isNearEnd && lastLockWeek < week) {
             proxy.lock();
             proxy.maxLock();
+            lastLockWeek = uint16(week);
         }
 
         //Net profit and loss calculation
@@ -126,7 +190,17 @@ contract Strategy is BaseStrategy {
     }
 
     function _claimAndSellRewards() internal {
-        if (!bypassClaim) rewardDistributor.claim();
+        if (!bypassClaim) {
+            if (maxClaimWeeks == 0) {
+                rewardDistributor.claim();
+            } else {
+                (uint start, uint end) = _claimRange();
+                // nothing has finished since our last claim
+                if (start < rewardDistributor.getWeek()) {
+                    rewardDistributor.claimWithRange(start, end);
+                }
+            }
+        }
 
         SwapThresholds memory st = swapThresholds;
         uint256 rewardBalance = balanceOfReward();
@@ -147,18 +221,45 @@ contract Strategy is BaseStrategy {
 
         uint256 toSwap = rewardTokenUnderlying.balanceOf(address(this));
         if (toSwap > st.min) {
-            toSwap = min(toSwap, st.max);
+            uint256 sized = swapSizeForPriceImpact();
+            // a thin pool sells under the schedule until a week of sales on
+            // it is waiting, the schedule then keeps the backlog from growing
+            if (
+                sized < st.max && (sized == 0 || toSwap > uint256(st.max) * 7)
+            ) sized = st.max;
+            toSwap = min(toSwap, sized);
             uint profit = swapper.swap(toSwap);
             if (
                 profit > 1 &&
                 !bypassMaxStake &&
                 ybs.approvedWeightedStaker(address(this))
             ) {
-                ybs.stakeAsMaxWeighted(address(this), profit);
+                toMaxStake = profit;
             }
         }
     }
 
+    // The distributor walks every week since our last claim, cap the range so a
+    // long pause can't make a harvest run out of gas. The rest is claimed later.
+    function _claimRange() internal view returns (uint start, uint end) {
+        (start, end) = rewardDistributor.getSuggestedClaimRange(address(this));
+        uint maxEnd = start + maxClaimWeeks - 1;
+        if (end > maxEnd) end = maxEnd;
+    }
+
+    // Largest sale keeping pool1's price impact under maxPriceImpact, treating the
+    // pool as constant product over its balance of crvUSD. Curve's concentrated
+    // liquidity makes the real impact lower, so this errs on the small side.
+    function swapSizeForPriceImpact() public view returns (uint256) {
+        uint256 impact = maxPriceImpact;
+        if (impact == 0) return 0;
+        ISwapper _swapper = swapper;
+        uint256 depth = ICurvePool(_swapper.pool1()).balances(
+            _swapper.pool1InTokenIdx()
+        );
+        return (depth * impact) / (MAX_BPS - impact);
+    }
+
     // use this during a migration to maintain the strategy's previous boost
     function manualStakeAsMaxWeighted(
         uint256 _maxStakeShare
@@ -171,8 +272,27 @@ contract Strategy is BaseStrategy {
         ybs.stake(balanceOfWant());
     }
 
+    // At most one unstake and one stake of each kind per harvest: loose want,
+    // swap output included, pays the vault first, and the swap output is max
+    // weighted staked here with whatever the vault sent along.
     function adjustPosition(uint256 _debtOutstanding) internal override {
         uint256 amount = balanceOfWant();
+        uint256 maxStake = toMaxStake;
+        if (maxStake > 0) {
+            toMaxStake = 0;
+            // the vault took some of the swap output, unless it wants funds back
+            // swap the shortfall out of pending stake so all of it is max weighted
+            if (maxStake > amount && _debtOutstanding == 0) {
+                uint256 shortfall = min(maxStake - amount, balanceOfStaked());
+                if (shortfall > 1) {
+                    amount += ybs.unstake(shortfall, address(this));
+                }
+            }
+            maxStake = min(maxStake, amount);
+            if (maxStake > 1) {
+                amount -= ybs.stakeAsMaxWeighted(address(this), maxStake);
+            }
+        }
         if (amount > 1) ybs.stake(amount);
     }
 
@@ -182,14 +302,17 @@ contract Strategy is BaseStrategy {
         uint256 loose = want.balanceOf(address(this));
 
         if (_amountNeeded > loose) {
-            _liquidatedAmount = loose;
             uint256 toUnstake = _amountNeeded - loose;
             if (toUnstake > 1) {
-                _liquidatedAmount += ybs.unstake(toUnstake, address(this));
+                // unstaking anyway, so free the swap output waiting to be max
+                // weighted too rather than unstaking again in adjustPosition
+                loose += ybs.unstake(
+                    min(toUnstake + toMaxStake, balanceOfStaked()),
+                    address(this)
+                );
             }
-            _loss = _amountNeeded > _liquidatedAmount
-                ? _amountNeeded - _liquidatedAmount
-                : 0;
+            _liquidatedAmount = min(_amountNeeded, loose);
+            _loss = _amountNeeded - _liquidatedAmount;
         } else {
             _liquidatedAmount = _amountNeeded;
         }
@@ -204,41 +327,83 @@ contract Strategy is BaseStrategy {
     function harvestTrigger(
         uint256 _callCostinEth
     ) public view override returns (bool) {
+        return _harvestTriggerReason() != TriggerReason.None;
+    }
+
+    // true until a harvest has locked through the proxy this week
+    function isLockPending() external view returns (bool) {
+        return lastLockWeek < block.timestamp / 1 weeks;
+    }
+
+    // the condition harvestTrigger fires on, None if it doesn't
+    function harvestTriggerReasons() external view returns (TriggerReason) {
+        return _harvestTriggerReason();
+    }
+
+    // Single pass over the trigger conditions: each external value is read at
+    // most once, and storage/timestamp checks run before external calls.
+    function _harvestTriggerReason() internal view returns (TriggerReason) {
         uint weekEnd = (block.timestamp / 1 weeks + 1) * 1 weeks;
-        bool isNearEnd = weekEnd - block.timestamp <= thresholdTimeUntilWeekEnd;
+        uint threshold = thresholdTimeUntilWeekEnd;
+        bool isNearEnd = weekEnd - block.timestamp <= threshold;
+        uint lastReport;
+        uint credit;
+        bool isCreditRead;
         if (isNearEnd) {
-            uint lastReport = vault.strategies(address(this)).lastReport;
-            bool isLastReportRecent = weekEnd - lastReport <=
-                thresholdTimeUntilWeekEnd;
-            if (vault.creditAvailable() > 0 && !isLastReportRecent) {
-                return true;
+            lastReport = vault.strategies(address(this)).lastReport;
+            bool isLastReportRecent = weekEnd - lastReport <= threshold;
+            if (!isLastReportRecent) {
+                credit = vault.creditAvailable();
+                if (credit > 0) return TriggerReason.WeekEnd;
+                isCreditRead = true;
             }
         }
 
         if (!isBaseFeeAcceptable()) {
-            return false;
+            return TriggerReason.None;
         }
 
         // trigger if we want to manually harvest, but only if our gas price is acceptable
         if (forceHarvestTriggerOnce) {
-            return true;
+            return TriggerReason.Forced;
         }
 
         // harvest if we hit our minDelay, but only if our gas price is acceptable
-        StrategyParams memory params = vault.strategies(address(this));
-        if (block.timestamp - params.lastReport > minReportDelay) {
-            return true;
+        if (!isNearEnd) {
+            lastReport = vault.strategies(address(this)).lastReport;
+        }
+        if (block.timestamp - lastReport > minReportDelay) {
+            return TriggerReason.ReportDelay;
         }
 
-        if (rewardDistributor.getClaimable(address(this)) > 0) {
-            return true;
+        if (!isCreditRead) {
+            credit = vault.creditAvailable();
+        }
+        if (credit > creditThreshold) {
+            return TriggerReason.Credit;
         }
 
-        if (vault.creditAvailable() > creditThreshold) {
-            return true;
+        // walks every unclaimed week, so it goes last
+        if (_claimable() > 0) {
+            return TriggerReason.Claimable;
         }
 
-        return false;
+        return TriggerReason.None;
+    }
+
+    // what the next harvest claims
+    function _claimable() internal view returns (uint) {
+        if (maxClaimWeeks == 0) {
+            return rewardDistributor.getClaimable(address(this));
+        }
+        (uint start, uint end) = _claimRange();
+        if (rewardDistributor.getWeek() <= start) return 0;
+        return
+            rewardDistributor.getTotalClaimableByRange(
+                address(this),
+                start,
+                end
+            );
     }
 
     function emergencyUnstake(
@@ -278,6 +443,20 @@ contract Strategy is BaseStrategy {
         swapThresholds.autoAdjustThresholds = _autoAdjustThresholds;
     }
 
+    function setMaxPriceImpact(
+        uint256 _maxPriceImpact
+    ) external onlyVaultManagers {
+        require(_maxPriceImpact < MAX_BPS, "!impact");
+        maxPriceImpact = uint16(_maxPriceImpact);
+    }
+
+    function setMaxClaimWeeks(
+        uint256 _maxClaimWeeks
+    ) external onlyVaultManagers {
+        require(_maxClaimWeeks <= type(uint16).max, "!weeks");
+        maxClaimWeeks = uint16(_maxClaimWeeks);
+    }
+
     function setBypasses(
         bool _bypassClaim,
         bool _bypassMaxStake
@@ -290,7 +469,7 @@ contract Strategy is BaseStrategy {
         uint256 _thresholdTimeUntilWeekEnd
     ) external onlyVaultManagers {
         require(_thresholdTimeUntilWeekEnd < 7 days, "Too High");
-        thresholdTimeUntilWeekEnd = _thresholdTimeUntilWeekEnd;
+        thresholdTimeUntilWeekEnd = uint32(_thresholdTimeUntilWeekEnd);
     }
 
     function upgradeSwapper(ISwapper _swapper) external onlyGovernance {
@@ -304,7 +483,9 @@ contract Strategy is BaseStrategy {
     // Before migrating, ensure rewards are manually claimed.
     function prepareMigration(address _newStrategy) internal override {
         uint256 amount = balanceOfStaked();
-        if (amount > 1) ybs.unstake(amount, _newStrategy);
+        if (amount > 1 && !_migrateStake(_newStrategy, amount)) {
+            ybs.unstake(amount, _newStrategy);
+        }
         amount = rewardToken.balanceOf(address(this));
         if (amount > 0) rewardToken.safeTransfer(_newStrategy, amount);
         amount = rewardTokenUnderlying.balanceOf(address(this));
@@ -312,6 +493,54 @@ contract Strategy is BaseStrategy {
             rewardTokenUnderlying.safeTransfer(_newStrategy, amount);
     }
 
+    // Restakes our position for the new strategy with the weight it has now,
+    // so its boost carries over instead of growing back from 1x. Max weighted
+    // units weigh MAX_STAKE_GROWTH_WEEKS + 1 and fresh ones 1, the split below
+    // adds up to our weight. Needs the new strategy to have approved us with
+    // setStakeMigrator and us to be a weighted staker, otherwise returns false
+    // and the position is unstaked to the new strategy as is.
+    function _migrateStake(
+        address _newStrategy,
+        uint256 _amount
+    ) internal returns (bool) {
+        IYearnBoostedStaker _ybs = ybs;
+        IYearnBoostedStaker.ApprovalStatus status = _ybs.approvedCaller(
+            _newStrategy,
+            address(this)
+        );
+        bool canStakeFor = status ==
+            IYearnBoostedStaker.ApprovalStatus.StakeOnly ||
+            status == IYearnBoostedStaker.ApprovalStatus.StakeAndUnstake;
+        if (!canStakeFor || !_ybs.approvedWeightedStaker(address(this))) {
+            return false;
+        }
+
+        uint256 weight = _ybs.getAccountWeight(address(this));
+        uint256 units = _amount >> 1;
+        uint256 maxStake = weight > units
+            ? ((weight - units) / _ybs.MAX_STAKE_GROWTH_WEEKS()) << 1
+            : 0;
+        _amount = _ybs.unstake(_amount, address(this));
+        if (maxStake > 1) _ybs.stakeAsMaxWeighted(_newStrategy, maxStake);
+        _amount -= maxStake;
+        if (_amount > 1) _ybs.stakeFor(_newStrategy, _amount);
+        return true;
+    }
+
+    // Lets _strategy carry its stake and boost over when it's migrated to us,
+    // see _migrateStake. Revoke once migrated.
+    function setStakeMigrator(
+        address _strategy,
+        bool _approved
+    ) external onlyVaultManagers {
+        ybs.setApprovedCaller(
+            _strategy,
+            _approved
+                ? IYearnBoostedStaker.ApprovalStatus.StakeOnly
+                : IYearnBoostedStaker.ApprovalStatus.None
+        );
+    }
+
     function balanceOfWant() public view returns (uint256) {
         return want.balanceOf(address(this));
     }
@@ -0,0 +1,45 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity ^0.8.18;
+
+import {Clones} from "@openzeppelin/contracts/proxy/Clones.sol";
+import {Strategy} from "./Strategy.sol";
+import {ISwapper} from "./interfaces/ISwapper.sol";
+
+// Deploys strategies as EIP-1167 clones of one Strategy, configured in the
+// same transaction. Clones share the original's staker and reward
+// distributor. The caller becomes strategist and rewards, governance still
+// adds the strategy to its vault.
+contract StrategyFactory {
+    event NewStrategy(
+        address indexed strategy,
+        address indexed vault,
+        address indexed ybs
+    );
+
+    address public immutable original;
+    address public immutable ybs;
+
+    constructor(address _original) {
+        original = _original;
+        ybs = address(Strategy(_original).ybs());
+    }
+
+    function newStrategy(
+        address _vault,
+        ISwapper _swapper,
+        address _keeper,
+        Strategy.SwapThresholds calldata _swapThresholds,
+        uint256 _creditThreshold
+    ) external returns (address strategy) {
+        strategy = Clones.clone(original);
+        Strategy(strategy).initialize(
+            _vault,
+            msg.sender,
+            _keeper,
+            _swapper,
+            _swapThresholds,
+            _creditThreshold
+        );
+        emit NewStrategy(strategy, _vault, ybs);
+    }
+}
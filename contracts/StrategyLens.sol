@@ -0,0 +1,113 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity ^0.8.18;
+
+import {StrategyParams} from "@yearnvaults/contracts/BaseStrategy.sol";
+import {Strategy} from "./Strategy.sol";
+import {IYBSUtilities} from "./interfaces/IYBSUtilities.sol";
+
+// Everything dashboards and monitoring poll about a strategy, for many
+// strategies in one eth_call. Holds no state, deploy anywhere.
+contract StrategyLens {
+    struct StrategyState {
+        Strategy strategy;
+        // false if reading the strategy reverted, the rest is then zero
+        bool ok;
+        uint estimatedTotalAssets;
+        uint balanceOfWant;
+        uint balanceOfStaked;
+        uint balanceOfReward;
+        uint balanceOfRewardUnderlying;
+        uint totalDebt;
+        uint lastReport;
+        uint swapThresholdMin;
+        uint swapThresholdMax;
+        bool autoAdjustThresholds;
+        bool bypassClaim;
+        bool bypassMaxStake;
+        uint claimable;
+        uint thresholdTimeUntilWeekEnd;
+        uint secondsUntilWeekEnd;
+        bool isNearWeekEnd;
+        bool isLockPending;
+        bool harvestTrigger;
+        Strategy.TriggerReason triggerReason;
+        // 0 when no utilities are given
+        uint activeBoost;
+        uint projectedBoost;
+    }
+
+    // `_utils` is the strategy's ybs utilities, one per strategy or none
+    function getStates(
+        Strategy[] calldata _strategies,
+        IYBSUtilities[] calldata _utils
+    ) external view returns (StrategyState[] memory states) {
+        require(
+            _utils.length == 0 || _utils.length == _strategies.length,
+            "!length"
+        );
+        states = new StrategyState[](_strategies.length);
+        for (uint i; i < _strategies.length; ++i) {
+            IYBSUtilities utils = _utils.length == 0
+                ? IYBSUtilities(address(0))
+                : _utils[i];
+            try this.getState(_strategies[i], utils) returns (
+                StrategyState memory state
+            ) {
+                states[i] = state;
+            } catch {
+                states[i].strategy = _strategies[i];
+            }
+        }
+    }
+
+    function getState(
+        Strategy _strategy,
+        IYBSUtilities _utils
+    ) public view returns (StrategyState memory s) {
+        s.strategy = _strategy;
+        s.ok = true;
+        s.estimatedTotalAssets = _strategy.estimatedTotalAssets();
+        s.balanceOfWant = _strategy.balanceOfWant();
+        s.balanceOfStaked = _strategy.balanceOfStaked();
+        s.balanceOfReward = _strategy.balanceOfReward();
+        s.balanceOfRewardUnderlying = _strategy
+            .rewardTokenUnderlying()
+            .balanceOf(address(_strategy));
+
+        StrategyParams memory params = _strategy.vault().strategies(
+            address(_strategy)
+        );
+        s.totalDebt = params.totalDebt;
+        s.lastReport = params.lastReport;
+
+        (
+            s.swapThresholdMin,
+            s.swapThresholdMax,
+            s.autoAdjustThresholds
+        ) = _strategy.swapThresholds();
+        s.bypassClaim = _strategy.bypassClaim();
+        s.bypassMaxStake = _strategy.bypassMaxStake();
+        s.claimable = _strategy.rewardDistributor().getClaimable(
+            address(_strategy)
+        );
+
+        s.thresholdTimeUntilWeekEnd = _strategy.thresholdTimeUntilWeekEnd();
+        s.secondsUntilWeekEnd =
+            (block.timestamp / 1 weeks + 1) *
+            1 weeks -
+            block.timestamp;
+        s.isNearWeekEnd = s.secondsUntilWeekEnd <= s.thresholdTimeUntilWeekEnd;
+        s.isLockPending = _strategy.isLockPending();
+        s.triggerReason = _strategy.harvestTriggerReasons();
+        s.harvestTrigger = s.triggerReason != Strategy.TriggerReason.None;
+
+        if (address(_utils) != address(0)) {
+            s.activeBoost = _utils.getUserActiveBoostMultiplier(
+                address(_strategy)
+            );
+            s.projectedBoost = _utils.getUserProjectedBoostMultiplier(
+                address(_strategy)
+            );
+        }
+    }
+}
@@ -9,6 +9,11 @@ import {ICurveInt128} from "./interfaces/curve/ICurveInt128.sol";
 contract Swapper {
     using SafeERC20 for ERC20;
 
+    event SlippageToleranceUpdated(uint slippageTolerance);
+    event SwapDeferred(uint amount, uint minOut);
+
+    uint internal constant MAX_BPS = 10_000;
+
     ERC20 public immutable tokenIn;
     ERC20 public immutable tokenOut;
     ERC20 public immutable tokenOutPool1;
@@ -19,6 +24,8 @@ contract Swapper {
     int128 public pool2InTokenIdx;
     int128 public pool2OutTokenIdx;
     address public constant owner = 0xFEB4acf3df3cDEA7399794D0869ef76A6EfAff52;
+    // max shortfall vs the curve oracle prices, in bps
+    uint public slippageTolerance = 300;
 
     constructor(
         ERC20 _tokenIn,
@@ -70,24 +77,63 @@ contract Swapper {
         tokenOutPool1.approve(address(_pool2), type(uint).max);
     }
 
+    // sells nothing and returns 0 if spot is off the oracles by more than the tolerance
     function swap(uint _amount) external returns (uint) {
+        (uint minCrv, uint minOut) = minAmountsOut(_amount);
+        uint crvOut = pool1.get_dy(pool1InTokenIdx, pool1OutTokenIdx, _amount);
+        if (
+            crvOut < minCrv ||
+            pool2.get_dy(pool2InTokenIdx, pool2OutTokenIdx, crvOut) < minOut
+        ) {
+            emit SwapDeferred(_amount, minOut);
+            return 0;
+        }
+
         tokenIn.safeTransferFrom(msg.sender, address(this), _amount);
         uint out = pool1.exchange_underlying(
             pool1InTokenIdx,
             pool1OutTokenIdx,
             _amount,
-            0
+            minCrv
         );
         return
             pool2.exchange(
                 pool2InTokenIdx,
                 pool2OutTokenIdx,
                 out,
-                0,
+                minOut,
                 msg.sender
             );
     }
 
+    // oracle priced CRV and yCRV out for `_amount`, less the tolerance
+    function minAmountsOut(
+        uint _amount
+    ) public view returns (uint minCrv, uint minOut) {
+        uint crv = (_amount * _pool1Price(pool1InTokenIdx)) /
+            _pool1Price(pool1OutTokenIdx);
+        uint ycrv = (crv * _pool2Price(pool2InTokenIdx)) /
+            _pool2Price(pool2OutTokenIdx);
+        minCrv = (crv * (MAX_BPS - slippageTolerance)) / MAX_BPS;
+        minOut = (ycrv * (MAX_BPS - slippageTolerance)) / MAX_BPS;
+    }
+
+    // tricrypto oracles price coin i + 1 in coin 0
+    function _pool1Price(uint _idx) internal view returns (uint) {
+        return _idx == 0 ? 1e18 : pool1.price_oracle(_idx - 1);
+    }
+
+    function _pool2Price(int128 _idx) internal view returns (uint) {
+        return _idx == 0 ? 1e18 : pool2.ema_price();
+    }
+
+    function setSlippageTolerance(uint _slippageTolerance) external {
+        require(msg.sender == owner, "!authorized");
+        require(_slippageTolerance < MAX_BPS, "!tolerance");
+        slippageTolerance = _slippageTolerance;
+        emit SlippageToleranceUpdated(_slippageTolerance);
+    }
+
     function sweep(address _token) external {
         require(msg.sender == owner, "!authorized");
         uint amount = ERC20(_token).balanceOf(address(this));
@@ -19,6 +19,11 @@ interface IZap {
 contract SwapperV2 {
     using SafeERC20 for ERC20;
 
+    event SlippageToleranceUpdated(uint slippageTolerance);
+    event SwapDeferred(uint amount, uint minOut);
+
+    uint internal constant MAX_BPS = 10_000;
+
     ERC20 public immutable tokenIn;
     ERC20 public immutable tokenOut;
     ERC20 public immutable tokenOutPool1;
@@ -26,6 +31,8 @@ contract SwapperV2 {
     uint public pool1InTokenIdx;
     uint public pool1OutTokenIdx;
     address public constant owner = 0xFEB4acf3df3cDEA7399794D0869ef76A6EfAff52;
+    // max shortfall vs the curve oracle price, in bps
+    uint public slippageTolerance = 300;
 
     // yCRV v4 zap
     IZap public constant zap = IZap(0x78ada385b15D89a9B845D2Cac0698663F0c69e3C);
@@ -62,24 +69,51 @@ contract SwapperV2 {
         tokenOutPool1.approve(address(zap), type(uint).max);
     }
 
+    // sells nothing and returns 0 if spot is off the oracle by more than the tolerance
     function swap(uint _amount) external returns (uint) {
+        uint minOut = minAmountOut(_amount);
+        if (pool1.get_dy(pool1InTokenIdx, pool1OutTokenIdx, _amount) < minOut) {
+            emit SwapDeferred(_amount, minOut);
+            return 0;
+        }
+
         tokenIn.safeTransferFrom(msg.sender, address(this), _amount);
         uint out = pool1.exchange_underlying(
             pool1InTokenIdx,
             pool1OutTokenIdx,
             _amount,
-            0
+            minOut
         );
+        // the zap never returns less than minting 1:1
         return
             zap.zap(
                 address(tokenOutPool1),
                 address(tokenOut),
                 out,
-                0,
+                out,
                 msg.sender
             );
     }
 
+    // oracle priced CRV out for `_amount`, less the tolerance
+    function minAmountOut(uint _amount) public view returns (uint) {
+        uint crv = (_amount * _pool1Price(pool1InTokenIdx)) /
+            _pool1Price(pool1OutTokenIdx);
+        return (crv * (MAX_BPS - slippageTolerance)) / MAX_BPS;
+    }
+
+    // tricrypto oracles price coin i + 1 in coin 0
+    function _pool1Price(uint _idx) internal view returns (uint) {
+        return _idx == 0 ? 1e18 : pool1.price_oracle(_idx - 1);
+    }
+
+    function setSlippageTolerance(uint _slippageTolerance) external {
+        require(msg.sender == owner, "!authorized");
+        require(_slippageTolerance < MAX_BPS, "!tolerance");
+        slippageTolerance = _slippageTolerance;
+        emit SlippageToleranceUpdated(_slippageTolerance);
+    }
+
     function sweep(address _token) external {
         require(msg.sender == owner, "!authorized");
         uint amount = ERC20(_token).balanceOf(address(this));
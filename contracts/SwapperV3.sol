@@ -0,0 +1,183 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity ^0.8.18;
+
+import {ERC20} from "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+import {SafeERC20} from "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
+import {ICurve} from "./interfaces/curve/ICurve.sol";
+import {ICurveInt128} from "./interfaces/curve/ICurveInt128.sol";
+import {IZap} from "./SwapperV2.sol";
+
+// Sells for CRV on pool1, then takes whichever of minting 1:1 through the zap
+// or exchanging on pool2 returns more yCRV.
+contract SwapperV3 {
+    using SafeERC20 for ERC20;
+
+    event Routed(bool minted, uint amountIn, uint amountOut);
+    event SlippageToleranceUpdated(uint slippageTolerance);
+    event SwapDeferred(uint amount, uint minOut);
+
+    uint internal constant MAX_BPS = 10_000;
+
+    ERC20 public immutable tokenIn;
+    ERC20 public immutable tokenOut;
+    ERC20 public immutable tokenOutPool1;
+    ICurve public immutable pool1;
+    ICurveInt128 public immutable pool2;
+    uint public pool1InTokenIdx;
+    uint public pool1OutTokenIdx;
+    int128 public pool2InTokenIdx;
+    int128 public pool2OutTokenIdx;
+    address public constant owner = 0xFEB4acf3df3cDEA7399794D0869ef76A6EfAff52;
+    // max shortfall vs the curve oracle prices, in bps
+    uint public slippageTolerance = 300;
+
+    // yCRV v4 zap
+    IZap public constant zap = IZap(0x78ada385b15D89a9B845D2Cac0698663F0c69e3C);
+
+    constructor(
+        ERC20 _tokenIn,
+        ERC20 _tokenOut,
+        ICurve _pool1,
+        ERC20 _tokenOutPool1,
+        ICurveInt128 _pool2
+    ) {
+        tokenIn = _tokenIn;
+        tokenOut = _tokenOut;
+        pool1 = _pool1;
+        pool2 = _pool2;
+        tokenOutPool1 = _tokenOutPool1;
+
+        uint idxFound;
+        address token;
+
+        for (uint i; i < 3; ++i) {
+            token = _pool1.coins(i);
+            if (token == address(_tokenIn)) {
+                pool1InTokenIdx = i;
+                idxFound++;
+                if (idxFound == 2) break;
+            }
+            if (token == address(_tokenOutPool1)) {
+                pool1OutTokenIdx = i;
+                idxFound++;
+                if (idxFound == 2) break;
+            }
+        }
+
+        idxFound = 0;
+
+        for (uint i; i < 3; ++i) {
+            token = _pool2.coins(i);
+            if (token == address(_tokenOutPool1)) {
+                pool2InTokenIdx = int128(int256(i));
+                idxFound++;
+                if (idxFound == 2) break;
+            }
+            if (token == address(_tokenOut)) {
+                pool2OutTokenIdx = int128(int256(i));
+                idxFound++;
+                if (idxFound == 2) break;
+            }
+        }
+
+        tokenIn.approve(address(_pool1), type(uint).max);
+        tokenOutPool1.approve(address(_pool2), type(uint).max);
+        tokenOutPool1.approve(address(zap), type(uint).max);
+    }
+
+    // expected yCRV out for `_amount` of tokenIn at current pool state
+    function quote(uint _amount) external view returns (uint out) {
+        (out, ) = _bestRoute(
+            pool1.get_dy(pool1InTokenIdx, pool1OutTokenIdx, _amount)
+        );
+    }
+
+    // sells nothing and returns 0 if the best route pays less than the
+    // oracles by more than the tolerance
+    function swap(uint _amount) external returns (uint out) {
+        (uint minCrv, uint minOut) = minAmountsOut(_amount);
+        uint crvAmount = pool1.get_dy(
+            pool1InTokenIdx,
+            pool1OutTokenIdx,
+            _amount
+        );
+        (uint expected, bool mint) = _bestRoute(crvAmount);
+        if (crvAmount < minCrv || expected < minOut) {
+            emit SwapDeferred(_amount, minOut);
+            return 0;
+        }
+
+        tokenIn.safeTransferFrom(msg.sender, address(this), _amount);
+        crvAmount = pool1.exchange_underlying(
+            pool1InTokenIdx,
+            pool1OutTokenIdx,
+            _amount,
+            minCrv
+        );
+        if (mint) {
+            out = zap.zap(
+                address(tokenOutPool1),
+                address(tokenOut),
+                crvAmount,
+                minOut,
+                msg.sender
+            );
+        } else {
+            out = pool2.exchange(
+                pool2InTokenIdx,
+                pool2OutTokenIdx,
+                crvAmount,
+                minOut,
+                msg.sender
+            );
+        }
+        emit Routed(mint, _amount, out);
+    }
+
+    // oracle priced CRV and yCRV out for `_amount`, less the tolerance
+    function minAmountsOut(
+        uint _amount
+    ) public view returns (uint minCrv, uint minOut) {
+        uint crv = (_amount * _pool1Price(pool1InTokenIdx)) /
+            _pool1Price(pool1OutTokenIdx);
+        uint ycrv = (crv * _pool2Price(pool2InTokenIdx)) /
+            _pool2Price(pool2OutTokenIdx);
+        minCrv = (crv * (MAX_BPS - slippageTolerance)) / MAX_BPS;
+        minOut = (ycrv * (MAX_BPS - slippageTolerance)) / MAX_BPS;
+    }
+
+    // minting is 1:1, prefer it on ties since it adds to the lock
+    function _bestRoute(
+        uint _crvAmount
+    ) internal view returns (uint out, bool mint) {
+        uint swapOut = pool2.get_dy(
+            pool2InTokenIdx,
+            pool2OutTokenIdx,
+            _crvAmount
+        );
+        if (swapOut > _crvAmount) return (swapOut, false);
+        return (_crvAmount, true);
+    }
+
+    // tricrypto oracles price coin i + 1 in coin 0
+    function _pool1Price(uint _idx) internal view returns (uint) {
+        return _idx == 0 ? 1e18 : pool1.price_oracle(_idx - 1);
+    }
+
+    function _pool2Price(int128 _idx) internal view returns (uint) {
+        return _idx == 0 ? 1e18 : pool2.ema_price();
+    }
+
+    function setSlippageTolerance(uint _slippageTolerance) external {
+        require(msg.sender == owner, "!authorized");
+        require(_slippageTolerance < MAX_BPS, "!tolerance");
+        slippageTolerance = _slippageTolerance;
+        emit SlippageToleranceUpdated(_slippageTolerance);
+    }
+
+    function sweep(address _token) external {
+        require(msg.sender == owner, "!authorized");
+        uint amount = ERC20(_token).balanceOf(address(this));
+        if (amount > 0) ERC20(_token).safeTransfer(owner, amount);
+    }
+}
@@ -0,0 +1,341 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity ^0.8.18;
+
+import {ERC20} from "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+import {SafeERC20} from "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
+import {ICurve} from "./interfaces/curve/ICurve.sol";
+import {ICurveInt128} from "./interfaces/curve/ICurveInt128.sol";
+import {IZap} from "./SwapperV2.sol";
+
+// Splits a sale to equalize marginal price instead of taking a single route:
+// crvUSD -> CRV across pool1 and an optional alternative pool, then
+// CRV -> yCRV across pool2 and minting 1:1 through the zap.
+contract SwapperV4 {
+    using SafeERC20 for ERC20;
+
+    event AltPoolUpdated(address altPool);
+    event SlippageToleranceUpdated(uint slippageTolerance);
+    event SwapDeferred(uint amount, uint minOut);
+    event Split(
+        uint amountIn,
+        uint toAltPool,
+        uint crvAmount,
+        uint toPool2,
+        uint amountOut
+    );
+
+    // each bisection step halves the search range, 5 gets within 1/32 of the
+    // sale. Output is flat around the best split, so finer steps buy little
+    // and every step costs four get_dy calls, each a Newton solve on tricrypto.
+    uint internal constant SPLIT_ITERATIONS = 5;
+    uint internal constant MAX_BPS = 10_000;
+
+    ERC20 public immutable tokenIn;
+    ERC20 public immutable tokenOut;
+    ERC20 public immutable tokenOutPool1;
+    ICurve public immutable pool1;
+    ICurveInt128 public immutable pool2;
+    uint public pool1InTokenIdx;
+    uint public pool1OutTokenIdx;
+    int128 public pool2InTokenIdx;
+    int128 public pool2OutTokenIdx;
+    ICurve public altPool;
+    uint public altPoolInTokenIdx;
+    uint public altPoolOutTokenIdx;
+    address public constant owner = 0xFEB4acf3df3cDEA7399794D0869ef76A6EfAff52;
+    // max shortfall vs the curve oracle prices, in bps
+    uint public slippageTolerance = 300;
+
+    // yCRV v4 zap
+    IZap public constant zap = IZap(0x78ada385b15D89a9B845D2Cac0698663F0c69e3C);
+
+    constructor(
+        ERC20 _tokenIn,
+        ERC20 _tokenOut,
+        ICurve _pool1,
+        ERC20 _tokenOutPool1,
+        ICurveInt128 _pool2
+    ) {
+        tokenIn = _tokenIn;
+        tokenOut = _tokenOut;
+        pool1 = _pool1;
+        pool2 = _pool2;
+        tokenOutPool1 = _tokenOutPool1;
+
+        uint idxFound;
+        address token;
+
+        for (uint i; i < 3; ++i) {
+            token = _pool1.coins(i);
+            if (token == address(_tokenIn)) {
+                pool1InTokenIdx = i;
+                idxFound++;
+                if (idxFound == 2) break;
+            }
+            if (token == address(_tokenOutPool1)) {
+                pool1OutTokenIdx = i;
+                idxFound++;
+                if (idxFound == 2) break;
+            }
+        }
+
+        idxFound = 0;
+
+        for (uint i; i < 3; ++i) {
+            token = _pool2.coins(i);
+            if (token == address(_tokenOutPool1)) {
+                pool2InTokenIdx = int128(int256(i));
+                idxFound++;
+                if (idxFound == 2) break;
+            }
+            if (token == address(_tokenOut)) {
+                pool2OutTokenIdx = int128(int256(i));
+                idxFound++;
+                if (idxFound == 2) break;
+            }
+        }
+
+        tokenIn.approve(address(_pool1), type(uint).max);
+        tokenOutPool1.approve(address(_pool2), type(uint).max);
+        tokenOutPool1.approve(address(zap), type(uint).max);
+    }
+
+    // expected yCRV out for `_amount` of tokenIn at current pool state
+    function quote(uint _amount) external view returns (uint out) {
+        (, , , out) = _route(_amount);
+    }
+
+    // sells nothing and returns 0 if the split pays less than the oracles by
+    // more than the tolerance
+    function swap(uint _amount) external returns (uint out) {
+        (uint minCrv, uint minOut) = minAmountsOut(_amount);
+        (uint toAlt, uint crvAmount, uint toPool2, uint expected) = _route(
+            _amount
+        );
+        if (crvAmount < minCrv || expected < minOut) {
+            emit SwapDeferred(_amount, minOut);
+            return 0;
+        }
+
+        tokenIn.safeTransferFrom(msg.sender, address(this), _amount);
+        crvAmount = _buyCrv(_amount, toAlt, minCrv);
+        // the split was priced before the alt pool leg, which can be pool1
+        toPool2 = _min(toPool2, crvAmount);
+        out = _buyYcrv(crvAmount, toPool2);
+        require(out >= minOut, "!minOut");
+        emit Split(_amount, toAlt, crvAmount, toPool2, out);
+    }
+
+    // each leg gets its share of the CRV minimum
+    function _buyCrv(
+        uint _amount,
+        uint _toAlt,
+        uint _minCrv
+    ) internal returns (uint crvAmount) {
+        uint minAlt;
+        if (_toAlt > 0) {
+            minAlt = (_minCrv * _toAlt) / _amount;
+            crvAmount = altPool.exchange(
+                altPoolInTokenIdx,
+                altPoolOutTokenIdx,
+                _toAlt,
+                minAlt,
+                address(this)
+            );
+        }
+        if (_amount > _toAlt) {
+            crvAmount += pool1.exchange_underlying(
+                pool1InTokenIdx,
+                pool1OutTokenIdx,
+                _amount - _toAlt,
+                _minCrv - minAlt
+            );
+        }
+    }
+
+    // pool2 only gets CRV it pays more than 1:1 for, and the zap never
+    // returns less than minting 1:1
+    function _buyYcrv(
+        uint _crvAmount,
+        uint _toPool2
+    ) internal returns (uint out) {
+        if (_toPool2 > 0) {
+            out = pool2.exchange(
+                pool2InTokenIdx,
+                pool2OutTokenIdx,
+                _toPool2,
+                _toPool2,
+                msg.sender
+            );
+        }
+        if (_crvAmount > _toPool2) {
+            out += zap.zap(
+                address(tokenOutPool1),
+                address(tokenOut),
+                _crvAmount - _toPool2,
+                _crvAmount - _toPool2,
+                msg.sender
+            );
+        }
+    }
+
+    // oracle priced CRV and yCRV out for `_amount`, less the tolerance
+    function minAmountsOut(
+        uint _amount
+    ) public view returns (uint minCrv, uint minOut) {
+        uint crv = (_amount * _pool1Price(pool1InTokenIdx)) /
+            _pool1Price(pool1OutTokenIdx);
+        uint ycrv = (crv * _pool2Price(pool2InTokenIdx)) /
+            _pool2Price(pool2OutTokenIdx);
+        minCrv = (crv * (MAX_BPS - slippageTolerance)) / MAX_BPS;
+        minOut = (ycrv * (MAX_BPS - slippageTolerance)) / MAX_BPS;
+    }
+
+    // the split for `_amount` at current pool state: crvUSD to the alt pool,
+    // CRV bought, CRV exchanged on pool2 and yCRV out
+    function _route(
+        uint _amount
+    )
+        internal
+        view
+        returns (uint toAlt, uint crvAmount, uint toPool2, uint out)
+    {
+        toAlt = _splitPool1(_amount);
+        crvAmount = _altPoolDy(toAlt) + _pool1Dy(_amount - toAlt);
+        toPool2 = _splitMint(crvAmount);
+        out = _pool2Dy(toPool2) + crvAmount - toPool2;
+    }
+
+    // amount of tokenIn to route through the alt pool, rest goes to pool1
+    function _splitPool1(uint _amount) internal view returns (uint) {
+        if (address(altPool) == address(0) || _amount == 0) return 0;
+
+        uint step = _step(_amount);
+        // alt pool gets all of it if its last step still beats pool1's first
+        if (
+            _altPoolDy(_amount) - _altPoolDy(_amount - step) >= _pool1Dy(step)
+        ) return _amount;
+        // and none of it if its first step doesn't beat pool1's last
+        if (
+            _altPoolDy(step) <= _pool1Dy(_amount) - _pool1Dy(_amount - step)
+        ) return 0;
+
+        uint lo;
+        uint hi = _amount;
+        for (uint i; i < SPLIT_ITERATIONS; ++i) {
+            uint mid = (lo + hi) / 2;
+            uint dx = _min(step, _amount - mid);
+            if (
+                _altPoolDy(mid + dx) - _altPoolDy(mid) >
+                _pool1Dy(_amount - mid) - _pool1Dy(_amount - mid - dx)
+            ) {
+                lo = mid;
+            } else {
+                hi = mid;
+            }
+        }
+        return lo;
+    }
+
+    // amount of CRV to exchange on pool2, rest is minted 1:1
+    function _splitMint(uint _crvAmount) internal view returns (uint) {
+        if (_crvAmount == 0) return 0;
+
+        uint step = _step(_crvAmount);
+        if (_pool2Dy(_crvAmount) - _pool2Dy(_crvAmount - step) > step) {
+            return _crvAmount;
+        }
+        // minting beats pool2's first step, mint it all
+        if (_pool2Dy(step) <= step) return 0;
+
+        uint lo;
+        uint hi = _crvAmount;
+        for (uint i; i < SPLIT_ITERATIONS; ++i) {
+            uint mid = (lo + hi) / 2;
+            uint dx = _min(step, _crvAmount - mid);
+            if (_pool2Dy(mid + dx) - _pool2Dy(mid) > dx) {
+                lo = mid;
+            } else {
+                hi = mid;
+            }
+        }
+        return lo;
+    }
+
+    function _step(uint _amount) internal pure returns (uint step) {
+        step = _amount >> SPLIT_ITERATIONS;
+        if (step == 0) step = _amount;
+    }
+
+    function _min(uint _a, uint _b) internal pure returns (uint) {
+        return _a < _b ? _a : _b;
+    }
+
+    function _pool1Dy(uint _dx) internal view returns (uint) {
+        if (_dx == 0) return 0;
+        return pool1.get_dy(pool1InTokenIdx, pool1OutTokenIdx, _dx);
+    }
+
+    function _altPoolDy(uint _dx) internal view returns (uint) {
+        if (_dx == 0) return 0;
+        return altPool.get_dy(altPoolInTokenIdx, altPoolOutTokenIdx, _dx);
+    }
+
+    function _pool2Dy(uint _dx) internal view returns (uint) {
+        if (_dx == 0) return 0;
+        return pool2.get_dy(pool2InTokenIdx, pool2OutTokenIdx, _dx);
+    }
+
+    // tricrypto oracles price coin i + 1 in coin 0
+    function _pool1Price(uint _idx) internal view returns (uint) {
+        return _idx == 0 ? 1e18 : pool1.price_oracle(_idx - 1);
+    }
+
+    function _pool2Price(int128 _idx) internal view returns (uint) {
+        return _idx == 0 ? 1e18 : pool2.ema_price();
+    }
+
+    // set to address(0) to only use pool1
+    function setAltPool(ICurve _altPool) external {
+        require(msg.sender == owner, "!authorized");
+        if (address(altPool) != address(0)) {
+            tokenIn.approve(address(altPool), 0);
+        }
+
+        if (address(_altPool) != address(0)) {
+            uint idxFound;
+            for (uint i; i < 3; ++i) {
+                // two coin pools revert past the last coin
+                try _altPool.coins(i) returns (address token) {
+                    if (token == address(tokenIn)) {
+                        altPoolInTokenIdx = i;
+                        idxFound++;
+                    } else if (token == address(tokenOutPool1)) {
+                        altPoolOutTokenIdx = i;
+                        idxFound++;
+                    }
+                } catch {
+                    break;
+                }
+            }
+            require(idxFound == 2, "!altPool");
+            tokenIn.approve(address(_altPool), type(uint).max);
+        }
+
+        altPool = _altPool;
+        emit AltPoolUpdated(address(_altPool));
+    }
+
+    function setSlippageTolerance(uint _slippageTolerance) external {
+        require(msg.sender == owner, "!authorized");
+        require(_slippageTolerance < MAX_BPS, "!tolerance");
+        slippageTolerance = _slippageTolerance;
+        emit SlippageToleranceUpdated(_slippageTolerance);
+    }
+
+    function sweep(address _token) external {
+        require(msg.sender == owner, "!authorized");
+        uint amount = ERC20(_token).balanceOf(address(this));
+        if (amount > 0) ERC20(_token).safeTransfer(owner, amount);
+    }
+}
@@ -0,0 +1,132 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity ^0.8.18;
+
+import {ERC20} from "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+import {SafeERC20} from "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
+import {ICurve} from "./interfaces/curve/ICurve.sol";
+import {IZap} from "./SwapperV2.sol";
+
+// SwapperV2's route with fewer token movements: pool1's exchange_extended calls
+// back for payment, so crvUSD goes straight from the caller to pool1 instead of
+// through the swapper, and the zap mints yCRV straight to the caller. CRV still
+// passes through, the zap only pulls from whoever calls it.
+contract SwapperV5 {
+    using SafeERC20 for ERC20;
+
+    event SlippageToleranceUpdated(uint slippageTolerance);
+    event SwapDeferred(uint amount, uint minOut);
+
+    uint internal constant MAX_BPS = 10_000;
+
+    ERC20 public immutable tokenIn;
+    ERC20 public immutable tokenOut;
+    ERC20 public immutable tokenOutPool1;
+    ICurve public immutable pool1;
+    uint public pool1InTokenIdx;
+    uint public pool1OutTokenIdx;
+    address public constant owner = 0xFEB4acf3df3cDEA7399794D0869ef76A6EfAff52;
+    // max shortfall vs the curve oracle price, in bps
+    uint public slippageTolerance = 300;
+
+    // yCRV v4 zap
+    IZap public constant zap = IZap(0x78ada385b15D89a9B845D2Cac0698663F0c69e3C);
+
+    constructor(
+        ERC20 _tokenIn,
+        ERC20 _tokenOut,
+        ICurve _pool1,
+        ERC20 _tokenOutPool1
+    ) {
+        tokenIn = _tokenIn;
+        tokenOut = _tokenOut;
+        pool1 = _pool1;
+        tokenOutPool1 = _tokenOutPool1;
+
+        uint idxFound;
+        address token;
+
+        for (uint i; i < 3; ++i) {
+            token = _pool1.coins(i);
+            if (token == address(_tokenIn)) {
+                pool1InTokenIdx = i;
+                idxFound++;
+                if (idxFound == 2) break;
+            }
+            if (token == address(_tokenOutPool1)) {
+                pool1OutTokenIdx = i;
+                idxFound++;
+                if (idxFound == 2) break;
+            }
+        }
+
+        // no tokenIn approval, pool1 is paid from the caller in pool1Callback
+        tokenOutPool1.approve(address(zap), type(uint).max);
+    }
+
+    // sells nothing and returns 0 if spot is off the oracle by more than the tolerance
+    function swap(uint _amount) external returns (uint) {
+        uint minOut = minAmountOut(_amount);
+        if (pool1.get_dy(pool1InTokenIdx, pool1OutTokenIdx, _amount) < minOut) {
+            emit SwapDeferred(_amount, minOut);
+            return 0;
+        }
+
+        uint out = pool1.exchange_extended(
+            pool1InTokenIdx,
+            pool1OutTokenIdx,
+            _amount,
+            minOut,
+            false,
+            msg.sender,
+            address(this),
+            bytes32(this.pool1Callback.selector)
+        );
+        // the zap never returns less than minting 1:1
+        return
+            zap.zap(
+                address(tokenOutPool1),
+                address(tokenOut),
+                out,
+                out,
+                msg.sender
+            );
+    }
+
+    // pool1 only calls back whoever called exchange_extended, so `_sender` is
+    // always the caller of swap above
+    function pool1Callback(
+        address _sender,
+        address,
+        address,
+        uint _dx,
+        uint
+    ) external {
+        require(msg.sender == address(pool1), "!pool1");
+        tokenIn.safeTransferFrom(_sender, msg.sender, _dx);
+    }
+
+    // oracle priced CRV out for `_amount`, less the tolerance
+    function minAmountOut(uint _amount) public view returns (uint) {
+        uint crv = (_amount * _pool1Price(pool1InTokenIdx)) /
+            _pool1Price(pool1OutTokenIdx);
+        return (crv * (MAX_BPS - slippageTolerance)) / MAX_BPS;
+    }
+
+    // tricrypto oracles price coin i + 1 in coin 0
+    function _pool1Price(uint _idx) internal view returns (uint) {
+        return _idx == 0 ? 1e18 : pool1.price_oracle(_idx - 1);
+    }
+
+    function setSlippageTolerance(uint _slippageTolerance) external {
+        require(msg.sender == owner, "!authorized");
+        require(_slippageTolerance < MAX_BPS, "!tolerance");
+        slippageTolerance = _slippageTolerance;
+        emit SlippageToleranceUpdated(_slippageTolerance);
+    }
+
+    function sweep(address _token) external {
+        require(msg.sender == owner, "!authorized");
+        uint amount = ERC20(_token).balanceOf(address(this));
+        if (amount > 0) ERC20(_token).safeTransfer(owner, amount);
+    }
+}
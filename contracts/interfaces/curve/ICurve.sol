@@ -31,6 +31,9 @@ interface ICurve {
 
     function get_balances() external view returns (uint256[2] memory);
 
+    // CryptoSwap oracle, price of coin k + 1 in coin 0
+    function price_oracle(uint256 k) external view returns (uint256);
+
     function admin_fee() external view returns (uint256);
 
     function A() external view returns (uint256);
@@ -87,6 +90,19 @@ interface ICurve {
         uint256 _min_dy
     ) external returns (uint256);
 
+    // tricrypto-ng: pays dx by calling cb on msg.sender with
+    // (sender, receiver, coin, dx, dy) instead of pulling it
+    function exchange_extended(
+        uint256 i,
+        uint256 j,
+        uint256 _dx,
+        uint256 _min_dy,
+        bool _use_eth,
+        address _sender,
+        address _receiver,
+        bytes32 _cb
+    ) external returns (uint256);
+
     function remove_liquidity_one_coin(
         uint256 _burn_amount,
         int128 i,
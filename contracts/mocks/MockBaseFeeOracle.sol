@@ -0,0 +1,11 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity ^0.8.18;
+
+// stands in for the oracle BaseStrategy.isBaseFeeAcceptable reads, open setter for tests
+contract MockBaseFeeOracle {
+    bool public isCurrentBaseFeeAcceptable = true;
+
+    function setCurrentBaseFeeAcceptable(bool _acceptable) external {
+        isCurrentBaseFeeAcceptable = _acceptable;
+    }
+}
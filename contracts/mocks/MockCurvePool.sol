@@ -0,0 +1,118 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity ^0.8.18;
+
+import {ERC20} from "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+import {SafeERC20} from "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
+
+// constant product pricing over the pool's own balances, enough to get price impact
+abstract contract MockCurvePool {
+    using SafeERC20 for ERC20;
+
+    event TokenExchange(
+        address indexed buyer,
+        uint sold_id,
+        uint tokens_sold,
+        uint bought_id,
+        uint tokens_bought
+    );
+
+    uint public constant FEE_DENOMINATOR = 1e10;
+    uint public constant MA_TIME = 600;
+    uint public immutable fee;
+    address[] internal _coins;
+    // price of coin k + 1 in coin 0, like curve's oracles
+    uint[] internal _lastPrices;
+    uint[] internal _oraclePrices;
+    uint internal _lastTimestamp;
+
+    constructor(address[] memory _poolCoins, uint _fee) {
+        _coins = _poolCoins;
+        fee = _fee;
+        _lastPrices = new uint[](_poolCoins.length - 1);
+        _oraclePrices = new uint[](_poolCoins.length - 1);
+    }
+
+    function coins(uint i) external view returns (address) {
+        return _coins[i];
+    }
+
+    function balances(uint i) public view returns (uint) {
+        return ERC20(_coins[i]).balanceOf(address(this));
+    }
+
+    function _spotPrice(uint k) internal view returns (uint) {
+        return (balances(0) * 1e18) / balances(k + 1);
+    }
+
+    // linear stand-in for curve's moving average of last_price over MA_TIME
+    function _priceOracle(uint k) internal view returns (uint) {
+        uint last = _lastPrices[k];
+        if (last == 0) return _spotPrice(k);
+        uint dt = block.timestamp - _lastTimestamp;
+        if (dt >= MA_TIME) return last;
+        return (_oraclePrices[k] * (MA_TIME - dt) + last * dt) / MA_TIME;
+    }
+
+    function _getDy(uint i, uint j, uint dx) internal view returns (uint dy) {
+        uint x = balances(i);
+        uint y = balances(j);
+        dy = (y * dx) / (x + dx);
+        dy -= (dy * fee) / FEE_DENOMINATOR;
+    }
+
+    function _exchange(
+        uint i,
+        uint j,
+        uint dx,
+        uint minDy,
+        address receiver
+    ) internal returns (uint dy) {
+        return _exchange(i, j, dx, minDy, msg.sender, receiver, bytes32(0));
+    }
+
+    // with a callback the pool calls msg.sender back to be paid dx instead of
+    // pulling it, like tricrypto-ng's exchange_extended
+    function _exchange(
+        uint i,
+        uint j,
+        uint dx,
+        uint minDy,
+        address sender,
+        address receiver,
+        bytes32 cb
+    ) internal returns (uint dy) {
+        dy = _getDy(i, j, dx);
+        require(dy >= minDy, "Exchange resulted in fewer coins than expected");
+        uint n = _lastPrices.length;
+        for (uint k; k < n; ++k) _oraclePrices[k] = _priceOracle(k);
+        _lastTimestamp = block.timestamp;
+
+        if (cb == bytes32(0)) {
+            ERC20(_coins[i]).safeTransferFrom(msg.sender, address(this), dx);
+        } else {
+            _callback(ERC20(_coins[i]), dx, dy, sender, receiver, cb);
+        }
+        ERC20(_coins[j]).safeTransfer(receiver, dy);
+        for (uint k; k < n; ++k) _lastPrices[k] = _spotPrice(k);
+        emit TokenExchange(msg.sender, i, dx, j, dy);
+    }
+
+    function _callback(
+        ERC20 coin,
+        uint dx,
+        uint dy,
+        address sender,
+        address receiver,
+        bytes32 cb
+    ) internal {
+        uint before = coin.balanceOf(address(this));
+        (bool success, ) = msg.sender.call(
+            abi.encodePacked(
+                bytes4(cb),
+                abi.encode(sender, receiver, address(coin), dx, dy)
+            )
+        );
+        require(success, "callback failed");
+        require(coin.balanceOf(address(this)) - before == dx, "!callback");
+    }
+}
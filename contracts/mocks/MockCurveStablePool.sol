@@ -0,0 +1,55 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity ^0.8.18;
+
+import {MockCurvePool} from "./MockCurvePool.sol";
+
+// CRV/yCRV style pool, int128 coin indices (ICurveInt128)
+contract MockCurveStablePool is MockCurvePool {
+    constructor(
+        address[] memory _poolCoins,
+        uint _fee
+    ) MockCurvePool(_poolCoins, _fee) {}
+
+    function get_dy(
+        int128 i,
+        int128 j,
+        uint dx
+    ) external view returns (uint) {
+        return _getDy(_idx(i), _idx(j), dx);
+    }
+
+    function price_oracle() external view returns (uint) {
+        return _priceOracle(0);
+    }
+
+    function ema_price() external view returns (uint) {
+        return _priceOracle(0);
+    }
+
+    function last_price() external view returns (uint) {
+        return _lastPrices[0];
+    }
+
+    function exchange(
+        int128 i,
+        int128 j,
+        uint dx,
+        uint min_dy
+    ) external returns (uint) {
+        return _exchange(_idx(i), _idx(j), dx, min_dy, msg.sender);
+    }
+
+    function exchange(
+        int128 i,
+        int128 j,
+        uint dx,
+        uint min_dy,
+        address receiver
+    ) external returns (uint) {
+        return _exchange(_idx(i), _idx(j), dx, min_dy, receiver);
+    }
+
+    function _idx(int128 i) internal pure returns (uint) {
+        return uint(int256(i));
+    }
+}
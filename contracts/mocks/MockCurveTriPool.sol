@@ -0,0 +1,77 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity ^0.8.18;
+
+import {MockCurvePool} from "./MockCurvePool.sol";
+
+// TriCRV style pool, uint256 coin indices (ICurve)
+contract MockCurveTriPool is MockCurvePool {
+    constructor(
+        address[] memory _poolCoins,
+        uint _fee
+    ) MockCurvePool(_poolCoins, _fee) {}
+
+    function get_dy(uint i, uint j, uint dx) external view returns (uint) {
+        return _getDy(i, j, dx);
+    }
+
+    function price_oracle(uint k) external view returns (uint) {
+        return _priceOracle(k);
+    }
+
+    function last_prices(uint k) external view returns (uint) {
+        return _lastPrices[k];
+    }
+
+    function exchange(
+        uint i,
+        uint j,
+        uint dx,
+        uint min_dy
+    ) external returns (uint) {
+        return _exchange(i, j, dx, min_dy, msg.sender);
+    }
+
+    function exchange(
+        uint i,
+        uint j,
+        uint dx,
+        uint min_dy,
+        address receiver
+    ) external returns (uint) {
+        return _exchange(i, j, dx, min_dy, receiver);
+    }
+
+    function exchange_underlying(
+        uint i,
+        uint j,
+        uint dx,
+        uint min_dy
+    ) external returns (uint) {
+        return _exchange(i, j, dx, min_dy, msg.sender);
+    }
+
+    function exchange_underlying(
+        uint i,
+        uint j,
+        uint dx,
+        uint min_dy,
+        address receiver
+    ) external returns (uint) {
+        return _exchange(i, j, dx, min_dy, receiver);
+    }
+
+    function exchange_extended(
+        uint i,
+        uint j,
+        uint dx,
+        uint min_dy,
+        bool use_eth,
+        address sender,
+        address receiver,
+        bytes32 cb
+    ) external returns (uint) {
+        require(!use_eth, "!eth");
+        require(cb != bytes32(0), "!callback");
+        return _exchange(i, j, dx, min_dy, sender, receiver, cb);
+    }
+}
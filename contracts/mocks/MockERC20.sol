@@ -0,0 +1,18 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity ^0.8.18;
+
+import {ERC20} from "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+
+contract MockERC20 is ERC20 {
+    event Mint(address indexed minter, address indexed receiver, uint value);
+
+    constructor(
+        string memory _name,
+        string memory _symbol
+    ) ERC20(_name, _symbol) {}
+
+    function mint(address _to, uint _amount) external {
+        _mint(_to, _amount);
+        emit Mint(msg.sender, _to, _amount);
+    }
+}
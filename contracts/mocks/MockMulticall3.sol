@@ -0,0 +1,41 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity ^0.8.18;
+
+// the parts of Multicall3 (0xcA11bde05977b3631167028862bE2a173976CA11) the keeper uses
+contract MockMulticall3 {
+    struct Call3 {
+        address target;
+        bool allowFailure;
+        bytes callData;
+    }
+
+    struct Result {
+        bool success;
+        bytes returnData;
+    }
+
+    function aggregate3(
+        Call3[] calldata calls
+    ) external payable returns (Result[] memory returnData) {
+        uint length = calls.length;
+        returnData = new Result[](length);
+        for (uint i; i < length; ++i) {
+            Result memory result = returnData[i];
+            (result.success, result.returnData) = calls[i].target.call(
+                calls[i].callData
+            );
+            require(
+                calls[i].allowFailure || result.success,
+                "Multicall3: call failed"
+            );
+        }
+    }
+
+    function getBlockNumber() external view returns (uint blockNumber) {
+        blockNumber = block.number;
+    }
+
+    function getCurrentBlockTimestamp() external view returns (uint timestamp) {
+        timestamp = block.timestamp;
+    }
+}
@@ -0,0 +1,202 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity ^0.8.18;
+
+import {IERC20} from "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import {SafeERC20} from "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
+import {IRewardDistributor} from "../interfaces/IRewardDistributor.sol";
+import {IYearnBoostedStaker} from "../interfaces/IYearnBoostedStaker.sol";
+
+/**
+    @title Mock Reward Distributor
+    @dev Rewards deposited during a week are split by staker weight at that
+         week and become claimable once the week is over.
+ */
+contract MockRewardDistributor {
+    using SafeERC20 for IERC20;
+
+    event RewardDeposited(
+        uint indexed week,
+        address indexed depositor,
+        uint rewardAmount
+    );
+    event RewardsClaimed(
+        address indexed account,
+        uint indexed week,
+        uint rewardAmount
+    );
+    event RecipientConfigured(
+        address indexed account,
+        address indexed recipient
+    );
+    event ClaimerApproved(
+        address indexed account,
+        address indexed claimer,
+        bool approved
+    );
+
+    IYearnBoostedStaker public immutable staker;
+    IERC20 public immutable rewardToken;
+    uint public immutable START_TIME;
+
+    mapping(uint => uint) public weeklyRewardAmount;
+    mapping(address => IRewardDistributor.AccountInfo) public accountInfo;
+    mapping(address => mapping(address => bool)) public approvedClaimer;
+
+    constructor(IYearnBoostedStaker _staker, IERC20 _rewardToken) {
+        staker = _staker;
+        rewardToken = _rewardToken;
+        START_TIME = _staker.START_TIME();
+    }
+
+    function getWeek() public view returns (uint) {
+        return (block.timestamp - START_TIME) / 1 weeks;
+    }
+
+    function depositReward(uint _amount) external {
+        _depositReward(msg.sender, _amount);
+    }
+
+    function depositRewardFrom(address _target, uint _amount) external {
+        _depositReward(_target, _amount);
+    }
+
+    function _depositReward(address _target, uint _amount) internal {
+        require(_amount > 0, "!amount");
+        uint week = getWeek();
+        weeklyRewardAmount[week] += _amount;
+        rewardToken.safeTransferFrom(_target, address(this), _amount);
+        emit RewardDeposited(week, _target, _amount);
+    }
+
+    // move rewards from a week nobody was staked in to the current week
+    function pushRewards(uint _week) external returns (bool) {
+        uint week = getWeek();
+        require(_week < week, "!week");
+        uint amount = weeklyRewardAmount[_week];
+        if (amount == 0 || staker.getGlobalWeightAt(_week) > 0) return false;
+        weeklyRewardAmount[_week] = 0;
+        weeklyRewardAmount[week] += amount;
+        return true;
+    }
+
+    function claim() external returns (uint amountClaimed) {
+        (uint start, uint end) = getSuggestedClaimRange(msg.sender);
+        return _claim(msg.sender, start, end);
+    }
+
+    function claimFor(address _account) external returns (uint amountClaimed) {
+        _requireClaimer(_account);
+        (uint start, uint end) = getSuggestedClaimRange(_account);
+        return _claim(_account, start, end);
+    }
+
+    function claimWithRange(
+        uint _claimStartWeek,
+        uint _claimEndWeek
+    ) external returns (uint amountClaimed) {
+        return _claim(msg.sender, _claimStartWeek, _claimEndWeek);
+    }
+
+    function claimWithRangeFor(
+        address _account,
+        uint _claimStartWeek,
+        uint _claimEndWeek
+    ) external returns (uint amountClaimed) {
+        _requireClaimer(_account);
+        return _claim(_account, _claimStartWeek, _claimEndWeek);
+    }
+
+    function _requireClaimer(address _account) internal view {
+        require(
+            msg.sender == _account || approvedClaimer[_account][msg.sender],
+            "!approvedClaimer"
+        );
+    }
+
+    function _claim(
+        address _account,
+        uint _claimStartWeek,
+        uint _claimEndWeek
+    ) internal returns (uint amountClaimed) {
+        IRewardDistributor.AccountInfo memory info = accountInfo[_account];
+        // nothing has finished since the last claim
+        if (getWeek() <= info.lastClaimWeek) return 0;
+
+        require(_claimStartWeek >= info.lastClaimWeek, "claimStartWeek too low");
+        require(
+            _claimStartWeek <= _claimEndWeek && _claimEndWeek < getWeek(),
+            "Invalid range"
+        );
+
+        amountClaimed = getTotalClaimableByRange(
+            _account,
+            _claimStartWeek,
+            _claimEndWeek
+        );
+        info.lastClaimWeek = uint96(_claimEndWeek + 1);
+        accountInfo[_account] = info;
+
+        if (amountClaimed > 0) {
+            address recipient = info.recipient == address(0)
+                ? _account
+                : info.recipient;
+            rewardToken.safeTransfer(recipient, amountClaimed);
+        }
+        emit RewardsClaimed(_account, _claimEndWeek, amountClaimed);
+    }
+
+    function getSuggestedClaimRange(
+        address _account
+    ) public view returns (uint claimStartWeek, uint claimEndWeek) {
+        claimStartWeek = accountInfo[_account].lastClaimWeek;
+        uint week = getWeek();
+        claimEndWeek = week > claimStartWeek ? week - 1 : claimStartWeek;
+    }
+
+    function getClaimable(
+        address _account
+    ) external view returns (uint claimable) {
+        (uint start, uint end) = getSuggestedClaimRange(_account);
+        if (getWeek() <= start) return 0;
+        return getTotalClaimableByRange(_account, start, end);
+    }
+
+    function getTotalClaimableByRange(
+        address _account,
+        uint _claimStartWeek,
+        uint _claimEndWeek
+    ) public view returns (uint claimable) {
+        for (uint week = _claimStartWeek; week <= _claimEndWeek; ++week) {
+            claimable += getClaimableAt(_account, week);
+        }
+    }
+
+    function getClaimableAt(
+        address _account,
+        uint _week
+    ) public view returns (uint rewardAmount) {
+        if (_week >= getWeek()) return 0;
+        uint globalWeight = staker.getGlobalWeightAt(_week);
+        if (globalWeight == 0) return 0;
+        return
+            (weeklyRewardAmount[_week] *
+                staker.getAccountWeightAt(_account, _week)) / globalWeight;
+    }
+
+    function computeSharesAt(
+        address _account,
+        uint _week
+    ) external view returns (uint rewardShare) {
+        return staker.getAccountWeightRatioAt(_account, _week);
+    }
+
+    function configureRecipient(address _recipient) external {
+        accountInfo[msg.sender].recipient = _recipient;
+        emit RecipientConfigured(msg.sender, _recipient);
+    }
+
+    function approveClaimer(address _claimer, bool _approved) external {
+        approvedClaimer[msg.sender][_claimer] = _approved;
+        emit ClaimerApproved(msg.sender, _claimer, _approved);
+    }
+}
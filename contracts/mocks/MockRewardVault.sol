@@ -0,0 +1,12 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity ^0.8.18;
+
+import {ERC20} from "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+import {IERC20, ERC4626} from "@openzeppelin/contracts/token/ERC20/extensions/ERC4626.sol";
+
+// stand-in for the crvUSD vault rewards are paid in
+contract MockRewardVault is ERC4626 {
+    constructor(
+        IERC20 _asset
+    ) ERC20("Mock crvUSD Vault", "mvcrvUSD") ERC4626(_asset) {}
+}
@@ -0,0 +1,29 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity ^0.8.18;
+
+// etched at the strategy's constant proxy address, so no constructor storage
+contract MockStrategyProxy {
+    address public immutable governance;
+    mapping(address => bool) public lockers;
+    uint public lockCount;
+    uint public maxLockCount;
+
+    constructor(address _governance) {
+        governance = _governance;
+    }
+
+    function approveLocker(address _locker, bool _approved) external {
+        require(msg.sender == governance, "!governance");
+        lockers[_locker] = _approved;
+    }
+
+    function lock() external {
+        require(lockers[msg.sender], "!locker");
+        lockCount++;
+    }
+
+    function maxLock() external {
+        require(lockers[msg.sender], "!locker");
+        maxLockCount++;
+    }
+}
@@ -0,0 +1,125 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity ^0.8.18;
+
+import {IERC20} from "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+
+interface IMockStaker {
+    function MAX_STAKE_GROWTH_WEEKS() external view returns (uint);
+
+    function stakeToken() external view returns (IERC20);
+
+    function getWeek() external view returns (uint);
+
+    function getAccountWeightAt(
+        address _account,
+        uint _week
+    ) external view returns (uint);
+
+    function getGlobalWeightAt(uint _week) external view returns (uint);
+
+    function getAccountStakeAmountAt(
+        address _account,
+        uint _week
+    ) external view returns (uint);
+
+    function getGlobalStakeAmountAt(uint _week) external view returns (uint);
+}
+
+interface IMockDistributor {
+    function weeklyRewardAmount(uint _week) external view returns (uint);
+}
+
+// boost is weight per unit staked, 1x for a fresh stake up to MAX_STAKE_GROWTH_WEEKS + 1
+contract MockYBSUtilities {
+    uint public constant PRECISION = 1e18;
+    uint public constant WEEKS_PER_YEAR = 52;
+
+    IMockStaker public immutable YBS;
+    IMockDistributor public immutable REWARDS_DISTRIBUTOR;
+
+    constructor(IMockStaker _ybs, IMockDistributor _rewardsDistributor) {
+        YBS = _ybs;
+        REWARDS_DISTRIBUTOR = _rewardsDistributor;
+    }
+
+    function MAX_STAKE_GROWTH_WEEKS() external view returns (uint) {
+        return YBS.MAX_STAKE_GROWTH_WEEKS();
+    }
+
+    function TOKEN() external view returns (IERC20) {
+        return YBS.stakeToken();
+    }
+
+    function getWeek() public view returns (uint) {
+        return YBS.getWeek();
+    }
+
+    function getUserActiveBoostMultiplier(
+        address _user
+    ) external view returns (uint) {
+        uint week = getWeek();
+        if (week == 0) return 0;
+        return
+            _boost(
+                YBS.getAccountWeightAt(_user, week - 1),
+                YBS.getAccountStakeAmountAt(_user, week - 1)
+            );
+    }
+
+    function getUserProjectedBoostMultiplier(
+        address _user
+    ) external view returns (uint) {
+        uint week = getWeek();
+        return
+            _boost(
+                YBS.getAccountWeightAt(_user, week),
+                YBS.getAccountStakeAmountAt(_user, week)
+            );
+    }
+
+    function getGlobalActiveBoostMultiplier() external view returns (uint) {
+        uint week = getWeek();
+        if (week == 0) return 0;
+        return
+            _boost(
+                YBS.getGlobalWeightAt(week - 1),
+                YBS.getGlobalStakeAmountAt(week - 1)
+            );
+    }
+
+    function getGlobalProjectedBoostMultiplier() external view returns (uint) {
+        uint week = getWeek();
+        return
+            _boost(YBS.getGlobalWeightAt(week), YBS.getGlobalStakeAmountAt(week));
+    }
+
+    function getAccountStakeAmountAt(
+        address _account,
+        uint _week
+    ) external view returns (uint) {
+        return YBS.getAccountStakeAmountAt(_account, _week);
+    }
+
+    function getGlobalStakeAmountAt(uint _week) external view returns (uint) {
+        return YBS.getGlobalStakeAmountAt(_week);
+    }
+
+    function weeklyRewardAmountAt(uint _week) public view returns (uint) {
+        return REWARDS_DISTRIBUTOR.weeklyRewardAmount(_week);
+    }
+
+    function activeRewardAmount() external view returns (uint) {
+        uint week = getWeek();
+        if (week == 0) return 0;
+        return weeklyRewardAmountAt(week - 1);
+    }
+
+    function projectedRewardAmount() external view returns (uint) {
+        return weeklyRewardAmountAt(getWeek());
+    }
+
+    function _boost(uint _weight, uint _stake) internal pure returns (uint) {
+        if (_stake < 2) return 0;
+        return (_weight * PRECISION) / (_stake >> 1);
+    }
+}
@@ -0,0 +1,47 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity ^0.8.18;
+
+import {ERC20} from "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+import {SafeERC20} from "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
+
+interface IMintable {
+    function mint(address _to, uint _amount) external;
+}
+
+// etched at the yCRV zap address, always mints yCRV 1:1 for CRV
+contract MockYCrvZap {
+    using SafeERC20 for ERC20;
+
+    ERC20 public immutable crv;
+    IMintable public immutable ycrv;
+
+    constructor(ERC20 _crv, IMintable _ycrv) {
+        crv = _crv;
+        ycrv = _ycrv;
+    }
+
+    function calc_expected_out(
+        address _inputToken,
+        address _outputToken,
+        uint256 _amountIn
+    ) external view returns (uint256) {
+        require(_inputToken == address(crv), "!input");
+        require(_outputToken == address(ycrv), "!output");
+        return _amountIn;
+    }
+
+    function zap(
+        address _inputToken,
+        address _outputToken,
+        uint256 _amountIn,
+        uint256 _minOut,
+        address _recipient
+    ) external returns (uint256) {
+        require(_inputToken == address(crv), "!input");
+        require(_outputToken == address(ycrv), "!output");
+        require(_amountIn >= _minOut, "slippage");
+        crv.safeTransferFrom(msg.sender, address(this), _amountIn);
+        ycrv.mint(_recipient, _amountIn);
+        return _amountIn;
+    }
+}
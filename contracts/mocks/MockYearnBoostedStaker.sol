@@ -0,0 +1,445 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity ^0.8.18;
+
+import {IERC20} from "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import {SafeERC20} from "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
+import {IYearnBoostedStaker} from "../interfaces/IYearnBoostedStaker.sol";
+
+/**
+    @title Mock Yearn Boosted Staker
+    @dev ABI compatible subset of the staker. Weight is `amount >> 1` on stake,
+         grows by the same every week for `MAX_STAKE_GROWTH_WEEKS` weeks and is
+         then realized. Max weighted stakes start fully grown. Unstakes take
+         from the newest pending stake first.
+ */
+contract MockYearnBoostedStaker {
+    using SafeERC20 for IERC20;
+
+    event Stake(
+        address indexed account,
+        uint indexed week,
+        uint amount,
+        uint newUserWeight,
+        uint weightAdded
+    );
+    event Unstake(
+        address indexed account,
+        uint indexed week,
+        uint amount,
+        uint newUserWeight,
+        uint weightRemoved
+    );
+    event ApprovedCallerSet(
+        address indexed account,
+        address indexed caller,
+        IYearnBoostedStaker.ApprovalStatus status
+    );
+    event WeightedStakerSet(address indexed staker, bool approved);
+
+    uint public immutable MAX_STAKE_GROWTH_WEEKS;
+    uint public immutable START_TIME;
+    IERC20 public immutable stakeToken;
+    address public immutable owner;
+    uint8 public constant decimals = 18;
+
+    uint public totalSupply;
+    uint112 public globalGrowthRate;
+    uint16 public globalLastUpdateWeek;
+
+    mapping(address => uint) public balanceOf;
+    mapping(address => IYearnBoostedStaker.AccountData) public accountData;
+    mapping(address => mapping(address => IYearnBoostedStaker.ApprovalStatus))
+        public approvedCaller;
+    mapping(address => bool) public approvedWeightedStaker;
+
+    mapping(address => mapping(uint => uint)) public accountWeeklyWeights;
+    mapping(address => mapping(uint => uint)) public accountWeeklyBalance;
+    mapping(address => mapping(uint => uint)) public accountWeeklyMaxStake;
+    mapping(address => mapping(uint => IYearnBoostedStaker.ToRealize))
+        internal _accountWeeklyToRealize;
+
+    mapping(uint => uint) public globalWeeklyWeights;
+    mapping(uint => uint) public globalWeeklyBalance;
+    mapping(uint => uint) public globalWeeklyMaxStake;
+    mapping(uint => IYearnBoostedStaker.ToRealize)
+        internal _globalWeeklyToRealize;
+
+    constructor(IERC20 _stakeToken, uint _maxStakeGrowthWeeks, address _owner) {
+        require(_maxStakeGrowthWeeks > 0, "invalid growth weeks");
+        stakeToken = _stakeToken;
+        MAX_STAKE_GROWTH_WEEKS = _maxStakeGrowthWeeks;
+        owner = _owner;
+        START_TIME = (block.timestamp / 1 weeks) * 1 weeks;
+    }
+
+    function getWeek() public view returns (uint) {
+        return (block.timestamp - START_TIME) / 1 weeks;
+    }
+
+    function stake(uint _amount) external returns (uint) {
+        return _stake(msg.sender, _amount, false);
+    }
+
+    function stakeFor(address _account, uint _amount) external returns (uint) {
+        if (msg.sender != _account) {
+            IYearnBoostedStaker.ApprovalStatus status = approvedCaller[
+                _account
+            ][msg.sender];
+            require(
+                status == IYearnBoostedStaker.ApprovalStatus.StakeAndUnstake ||
+                    status == IYearnBoostedStaker.ApprovalStatus.StakeOnly,
+                "!Permission"
+            );
+        }
+        return _stake(_account, _amount, false);
+    }
+
+    function stakeAsMaxWeighted(
+        address _account,
+        uint _amount
+    ) external returns (uint) {
+        require(approvedWeightedStaker[msg.sender], "!approvedStaker");
+        return _stake(_account, _amount, true);
+    }
+
+    function unstake(uint _amount, address _receiver) external returns (uint) {
+        return _unstake(msg.sender, _amount, _receiver);
+    }
+
+    function unstakeFor(
+        address _account,
+        uint _amount,
+        address _receiver
+    ) external returns (uint) {
+        if (msg.sender != _account) {
+            IYearnBoostedStaker.ApprovalStatus status = approvedCaller[
+                _account
+            ][msg.sender];
+            require(
+                status == IYearnBoostedStaker.ApprovalStatus.StakeAndUnstake ||
+                    status == IYearnBoostedStaker.ApprovalStatus.UnstakeOnly,
+                "!Permission"
+            );
+        }
+        return _unstake(_account, _amount, _receiver);
+    }
+
+    function _stake(
+        address _account,
+        uint _amount,
+        bool _maxWeighted
+    ) internal returns (uint) {
+        require(_amount > 1 && _amount < type(uint112).max, "invalid amount");
+        uint week = getWeek();
+        (IYearnBoostedStaker.AccountData memory acctData, ) = _checkpointAccount(
+            _account,
+            week
+        );
+        _checkpointGlobal(week);
+
+        uint weight = _amount >> 1;
+        _amount = weight << 1;
+        uint weightAdded = weight;
+
+        if (_maxWeighted) {
+            weightAdded = weight * (MAX_STAKE_GROWTH_WEEKS + 1);
+            acctData.realizedStake += uint112(weight);
+            accountWeeklyMaxStake[_account][week] += _amount;
+            globalWeeklyMaxStake[week] += _amount;
+        } else {
+            uint realizeWeek = week + MAX_STAKE_GROWTH_WEEKS;
+            acctData.pendingStake += uint112(weight);
+            _accountWeeklyToRealize[_account][realizeWeek].weight += uint112(
+                weight
+            );
+            _accountWeeklyToRealize[_account][realizeWeek]
+                .weightPersistent += uint112(weight);
+            _globalWeeklyToRealize[realizeWeek].weight += uint112(weight);
+            _globalWeeklyToRealize[realizeWeek].weightPersistent += uint112(
+                weight
+            );
+            globalGrowthRate += uint112(weight);
+        }
+        accountData[_account] = acctData;
+        accountWeeklyWeights[_account][week] += weightAdded;
+        globalWeeklyWeights[week] += weightAdded;
+
+        balanceOf[_account] += _amount;
+        totalSupply += _amount;
+        accountWeeklyBalance[_account][week] = balanceOf[_account];
+        globalWeeklyBalance[week] = totalSupply;
+
+        stakeToken.safeTransferFrom(msg.sender, address(this), _amount);
+        emit Stake(
+            _account,
+            week,
+            _amount,
+            accountWeeklyWeights[_account][week],
+            weightAdded
+        );
+        return _amount;
+    }
+
+    function _unstake(
+        address _account,
+        uint _amount,
+        address _receiver
+    ) internal returns (uint) {
+        require(
+            _amount > 1 && _amount <= balanceOf[_account],
+            "invalid amount"
+        );
+        uint week = getWeek();
+        (
+            IYearnBoostedStaker.AccountData memory acctData,
+            uint weight
+        ) = _checkpointAccount(_account, week);
+        _checkpointGlobal(week);
+
+        uint amountNeeded = _amount >> 1;
+        _amount = amountNeeded << 1;
+        (uint pendingRemoved, uint weightRemoved) = _removePending(
+            _account,
+            week,
+            amountNeeded
+        );
+        acctData.pendingStake -= uint112(pendingRemoved);
+        amountNeeded -= pendingRemoved;
+        if (amountNeeded > 0) {
+            acctData.realizedStake -= uint112(amountNeeded);
+            weightRemoved += amountNeeded * (MAX_STAKE_GROWTH_WEEKS + 1);
+        }
+
+        accountData[_account] = acctData;
+        accountWeeklyWeights[_account][week] = weight - weightRemoved;
+        globalWeeklyWeights[week] -= weightRemoved;
+
+        balanceOf[_account] -= _amount;
+        totalSupply -= _amount;
+        accountWeeklyBalance[_account][week] = balanceOf[_account];
+        globalWeeklyBalance[week] = totalSupply;
+
+        stakeToken.safeTransfer(_receiver, _amount);
+        emit Unstake(
+            _account,
+            week,
+            _amount,
+            weight - weightRemoved,
+            weightRemoved
+        );
+        return _amount;
+    }
+
+    // newest pending stake first, it carries the least weight
+    function _removePending(
+        address _account,
+        uint _week,
+        uint _amountNeeded
+    ) internal returns (uint removed, uint weightRemoved) {
+        for (uint i; i < MAX_STAKE_GROWTH_WEEKS && removed < _amountNeeded; ++i) {
+            uint realizeWeek = _week + MAX_STAKE_GROWTH_WEEKS - i;
+            uint pending = _accountWeeklyToRealize[_account][realizeWeek]
+                .weight;
+            if (pending == 0) continue;
+            uint toRemove = _amountNeeded - removed;
+            if (pending < toRemove) toRemove = pending;
+            _accountWeeklyToRealize[_account][realizeWeek].weight = uint112(
+                pending - toRemove
+            );
+            _globalWeeklyToRealize[realizeWeek].weight -= uint112(toRemove);
+            globalGrowthRate -= uint112(toRemove);
+            weightRemoved += toRemove * (i + 1);
+            removed += toRemove;
+        }
+    }
+
+    function checkpointAccount(
+        address _account
+    )
+        external
+        returns (IYearnBoostedStaker.AccountData memory acctData, uint weight)
+    {
+        return _checkpointAccount(_account, getWeek());
+    }
+
+    function checkpointAccountWithLimit(
+        address _account,
+        uint _week
+    )
+        external
+        returns (IYearnBoostedStaker.AccountData memory acctData, uint weight)
+    {
+        uint week = getWeek();
+        return _checkpointAccount(_account, _week < week ? _week : week);
+    }
+
+    function checkpointGlobal() external returns (uint) {
+        return _checkpointGlobal(getWeek());
+    }
+
+    function _checkpointAccount(
+        address _account,
+        uint _week
+    )
+        internal
+        returns (IYearnBoostedStaker.AccountData memory acctData, uint weight)
+    {
+        acctData = accountData[_account];
+        uint lastWeek = acctData.lastUpdateWeek;
+        if (lastWeek >= _week) {
+            return (acctData, accountWeeklyWeights[_account][_week]);
+        }
+
+        // nothing staked, nothing to write for the skipped weeks
+        if (acctData.realizedStake == 0 && acctData.pendingStake == 0) {
+            acctData.lastUpdateWeek = uint16(_week);
+            accountData[_account] = acctData;
+            return (acctData, 0);
+        }
+
+        weight = accountWeeklyWeights[_account][lastWeek];
+        uint pending = acctData.pendingStake;
+        uint realized = acctData.realizedStake;
+        uint balance = balanceOf[_account];
+        while (lastWeek < _week) {
+            ++lastWeek;
+            weight += pending;
+            uint toRealize = _accountWeeklyToRealize[_account][lastWeek]
+                .weight;
+            pending -= toRealize;
+            realized += toRealize;
+            accountWeeklyWeights[_account][lastWeek] = weight;
+            accountWeeklyBalance[_account][lastWeek] = balance;
+        }
+
+        acctData.pendingStake = uint112(pending);
+        acctData.realizedStake = uint112(realized);
+        acctData.lastUpdateWeek = uint16(_week);
+        accountData[_account] = acctData;
+    }
+
+    function _checkpointGlobal(uint _week) internal returns (uint weight) {
+        uint lastWeek = globalLastUpdateWeek;
+        if (lastWeek >= _week) return globalWeeklyWeights[_week];
+
+        uint supply = totalSupply;
+        if (supply == 0) {
+            globalLastUpdateWeek = uint16(_week);
+            return 0;
+        }
+
+        weight = globalWeeklyWeights[lastWeek];
+        uint rate = globalGrowthRate;
+        while (lastWeek < _week) {
+            ++lastWeek;
+            weight += rate;
+            rate -= _globalWeeklyToRealize[lastWeek].weight;
+            globalWeeklyWeights[lastWeek] = weight;
+            globalWeeklyBalance[lastWeek] = supply;
+        }
+
+        globalGrowthRate = uint112(rate);
+        globalLastUpdateWeek = uint16(_week);
+    }
+
+    function getAccountWeight(address _account) external view returns (uint) {
+        return getAccountWeightAt(_account, getWeek());
+    }
+
+    function getAccountWeightAt(
+        address _account,
+        uint _week
+    ) public view returns (uint) {
+        if (_week > getWeek()) return 0;
+        IYearnBoostedStaker.AccountData memory acctData = accountData[_account];
+        uint lastWeek = acctData.lastUpdateWeek;
+        if (_week <= lastWeek) return accountWeeklyWeights[_account][_week];
+
+        uint weight = accountWeeklyWeights[_account][lastWeek];
+        uint pending = acctData.pendingStake;
+        while (lastWeek < _week) {
+            ++lastWeek;
+            weight += pending;
+            pending -= _accountWeeklyToRealize[_account][lastWeek].weight;
+        }
+        return weight;
+    }
+
+    function getGlobalWeight() external view returns (uint) {
+        return getGlobalWeightAt(getWeek());
+    }
+
+    function getGlobalWeightAt(uint _week) public view returns (uint) {
+        if (_week > getWeek()) return 0;
+        uint lastWeek = globalLastUpdateWeek;
+        if (_week <= lastWeek) return globalWeeklyWeights[_week];
+
+        uint weight = globalWeeklyWeights[lastWeek];
+        uint rate = globalGrowthRate;
+        while (lastWeek < _week) {
+            ++lastWeek;
+            weight += rate;
+            rate -= _globalWeeklyToRealize[lastWeek].weight;
+        }
+        return weight;
+    }
+
+    function getAccountWeightRatio(
+        address _account
+    ) external view returns (uint) {
+        return getAccountWeightRatioAt(_account, getWeek());
+    }
+
+    function getAccountWeightRatioAt(
+        address _account,
+        uint _week
+    ) public view returns (uint) {
+        uint globalWeight = getGlobalWeightAt(_week);
+        if (globalWeight == 0) return 0;
+        return (getAccountWeightAt(_account, _week) * 1e18) / globalWeight;
+    }
+
+    function getAccountStakeAmountAt(
+        address _account,
+        uint _week
+    ) external view returns (uint) {
+        if (_week > getWeek()) return 0;
+        if (_week <= accountData[_account].lastUpdateWeek) {
+            return accountWeeklyBalance[_account][_week];
+        }
+        return balanceOf[_account];
+    }
+
+    function getGlobalStakeAmountAt(uint _week) external view returns (uint) {
+        if (_week > getWeek()) return 0;
+        if (_week <= globalLastUpdateWeek) return globalWeeklyBalance[_week];
+        return totalSupply;
+    }
+
+    function accountWeeklyToRealize(
+        address _account,
+        uint _week
+    ) external view returns (IYearnBoostedStaker.ToRealize memory) {
+        return _accountWeeklyToRealize[_account][_week];
+    }
+
+    function globalWeeklyToRealize(
+        uint _week
+    ) external view returns (IYearnBoostedStaker.ToRealize memory) {
+        return _globalWeeklyToRealize[_week];
+    }
+
+    function setApprovedCaller(
+        address _caller,
+        IYearnBoostedStaker.ApprovalStatus _status
+    ) external {
+        approvedCaller[msg.sender][_caller] = _status;
+        emit ApprovedCallerSet(msg.sender, _caller, _status);
+    }
+
+    function setWeightedStaker(address _staker, bool _approved) external {
+        require(msg.sender == owner, "!authorized");
+        approvedWeightedStaker[_staker] = _approved;
+        emit WeightedStakerSet(_staker, _approved);
+    }
+}
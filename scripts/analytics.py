@@ -0,0 +1,169 @@
+"""
+Weekly ybs history for the strategy (or any staker), boost and APR included.
+
+Reads `getGlobalWeightAt`, `getGlobalStakeAmountAt` and `weeklyRewardAmount`
+for every week, and `getAccountWeightAt`, `getAccountStakeAmountAt`,
+`accountWeeklyMaxStake` and `accountWeeklyToRealize` for every week and
+account, through batched Multicall3 calls pinned to one block. Finished weeks
+are kept in a columnar cache (one array of wei integers per column, indexed by
+week) under $YBS_ANALYTICS_CACHE and only the weeks since the last run are
+fetched. The exception is the rewards of finished weeks without weight, which
+`pushRewards` can still move to the current week, so they're fetched again on
+every run:
+
+    brownie run analytics main <utils> <account> [...] --network mainnet
+"""
+import os
+from pathlib import Path
+
+import numpy as np
+from brownie import chain, interface
+
+from scripts.multicall import MULTICALL3, aggregate
+
+WEEKS_PER_YEAR = 52
+
+GLOBAL_COLUMNS = ("weight", "stake", "rewards")
+ACCOUNT_COLUMNS = ("weight", "stake", "max_stake", "to_realize")
+
+DEFAULT_CACHE = Path.home() / ".cache" / "ybs-analytics"
+
+
+class History:
+    def __init__(self, utils, cache_dir=None, multicall_address=MULTICALL3):
+        self.utils = interface.IYBSUtilities(utils)
+        self.ybs = interface.IYearnBoostedStaker(self.utils.YBS())
+        self.distributor = interface.IRewardDistributor(
+            self.utils.REWARDS_DISTRIBUTOR()
+        )
+        self.multicall_address = multicall_address
+        cache_dir = cache_dir or os.environ.get("YBS_ANALYTICS_CACHE", DEFAULT_CACHE)
+        self.path = Path(cache_dir) / f"{chain.id}-{self.ybs.address}.npz"
+        self.columns = {}
+        if self.path.exists():
+            with np.load(self.path) as cached:
+                # saved as decimal strings, uint256 doesn't fit a numpy int
+                self.columns = {
+                    key: np.array([int(v) for v in cached[key]], dtype=object)
+                    for key in cached.files
+                }
+
+    def _global_calls(self, week):
+        return [
+            (self.ybs.getGlobalWeightAt, (week,)),
+            (self.utils.getGlobalStakeAmountAt, (week,)),
+            (self.distributor.weeklyRewardAmount, (week,)),
+        ]
+
+    def _account_calls(self, account, week):
+        return [
+            (self.ybs.getAccountWeightAt, (account, week)),
+            (self.utils.getAccountStakeAmountAt, (account, week)),
+            (self.ybs.accountWeeklyMaxStake, (account, week)),
+            (self.ybs.accountWeeklyToRealize, (account, week)),
+        ]
+
+    def _column(self, key):
+        return self.columns.get(key, np.zeros(0, dtype=object))
+
+    def update(self, accounts=(), block_identifier=None):
+        """
+        Fetch the finished weeks missing from the cache for the globals and each
+        of `accounts`, refresh the rewards of cached weeks without weight, then
+        save it. Returns the number of new (owner, week) rows fetched.
+        """
+        week = self.utils.getWeek(block_identifier=block_identifier)
+
+        # (column prefix, column names, first missing week, calls for a week)
+        owners = [("global", GLOBAL_COLUMNS, self._global_calls)]
+        owners += [
+            (str(a), ACCOUNT_COLUMNS, lambda w, a=str(a): self._account_calls(a, w))
+            for a in accounts
+        ]
+        jobs = []
+        calls = []
+        for prefix, names, calls_at in owners:
+            start = len(self._column(f"{prefix}:{names[0]}"))
+            if start < week:
+                jobs.append((prefix, names, week - start))
+                for w in range(start, week):
+                    calls += calls_at(w)
+        unweighted = np.flatnonzero(self._column("global:weight") == 0)
+        calls += [(self.distributor.weeklyRewardAmount, (w,)) for w in unweighted]
+
+        results = aggregate(calls, block_identifier, address=self.multicall_address)
+
+        offset = 0
+        for prefix, names, weeks in jobs:
+            rows = results[offset : offset + weeks * len(names)]
+            offset += len(rows)
+            # accountWeeklyToRealize is a (weightPersistent, weight) struct
+            rows = [r[1] if isinstance(r, tuple) else r for r in rows]
+            new = np.array(rows, dtype=object).reshape(weeks, len(names))
+            for i, name in enumerate(names):
+                key = f"{prefix}:{name}"
+                self.columns[key] = np.concatenate([self._column(key), new[:, i]])
+        if len(unweighted):
+            self.columns["global:rewards"][unweighted] = results[offset:]
+
+        if jobs or len(unweighted):
+            self._save()
+        return sum(weeks for _, _, weeks in jobs)
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp.npz")
+        np.savez(tmp, **{key: col.astype(str) for key, col in self.columns.items()})
+        tmp.replace(self.path)
+
+    def report(self, account, stake_price=1.0, reward_price=1.0):
+        """
+        Per week columns for `account`: its stake in wei, boost (1e0 = 1x),
+        share of the global weight, rewards earned and APR at the given token
+        prices. Only the ratios and what's derived from them are floats.
+        """
+        stake = self._column(f"{account}:stake")
+        weeks = len(stake)
+        weight = self._column(f"{account}:weight").astype(np.float64)
+        global_weight = self._column("global:weight")[:weeks].astype(np.float64)
+        rewards = self._column("global:rewards")[:weeks].astype(np.float64)
+
+        # same rounding as utils: weight over half the stake, 0 under 2 wei
+        half = (stake // 2).astype(np.float64)
+        boost = np.divide(weight, half, out=np.zeros(weeks), where=half > 0)
+        share = np.divide(
+            weight, global_weight, out=np.zeros(weeks), where=global_weight > 0
+        )
+        earned = rewards * share
+        apr = np.divide(
+            earned * WEEKS_PER_YEAR * reward_price,
+            stake.astype(np.float64) * stake_price,
+            out=np.zeros(weeks),
+            where=stake > 0,
+        )
+        return {
+            "week": np.arange(weeks),
+            "stake": stake,
+            "max_stake": self._column(f"{account}:max_stake"),
+            "to_realize": self._column(f"{account}:to_realize"),
+            "boost": boost,
+            "share": share,
+            "rewards": earned,
+            "apr": apr,
+        }
+
+
+def main(utils, *accounts):
+    history = History(utils)
+    fetched = history.update(accounts)
+    print(f"fetched {fetched} rows, cache at {history.path}")
+    for account in accounts:
+        report = history.report(account)
+        print(f"\n{account}")
+        print(f"{'week':>6} {'stake':>14} {'boost':>7} {'rewards':>12} {'apr':>8}")
+        for i in report["week"][-12:]:
+            print(
+                f"{i:>6} {report['stake'][i] / 1e18:>14,.2f} "
+                f"{report['boost'][i]:>6.3f}x {report['rewards'][i] / 1e18:>12,.2f} "
+                f"{report['apr'][i]:>8.2%}"
+            )
@@ -1,8 +1,20 @@
-from brownie import Strategy, Swapper, accounts, config, Contract, project, web3
+from brownie import (
+    Strategy,
+    StrategyFactory,
+    Swapper,
+    accounts,
+    config,
+    Contract,
+    project,
+    web3,
+)
+
+from scripts.view_cache import ViewCache
 
 
 def main():
     wavey = accounts.load("wavey3")
+    cache = ViewCache()
     ycrv = "0xFCc5c47bE19d06BF83eB04298b026F81069ff65b"
     # Strategy unwraps from vault
     token_in = "0xf939E0A03FB07F59A73314E73794Be0E57ac1b4E"  # crvUSD
@@ -15,21 +27,30 @@ def main():
     vault = "0x27B5739e22ad9033bcBf192059122d163b60349D"
     ybs = "0xE9A115b77A1057C918F997c32663FdcE24FB873f"
     ylockers_registry = Contract("0x262be1d31d0754399d8d5dc63B99c22146E9f738")
-    deployment = ylockers_registry.deployments(ycrv)
+    deployment = cache.call(ylockers_registry.deployments, ycrv)
+    cache.save()
     assert ybs == deployment["yearnBoostedStaker"]
     reward_distributor = deployment["rewardDistributor"]
-    strategy = wavey.deploy(
+    # Deployed once per staker, every other strategy on it is a
+    # StrategyFactory clone of it configured in one transaction.
+    original = wavey.deploy(
         Strategy,
         vault,
         ybs,
         reward_distributor,
         swapper,
-        1000e18,  # min sell
-        60_000e18,  # max sell
         publish_source=True,
     )
+    factory = wavey.deploy(StrategyFactory, original, publish_source=True)
     keeper = "0x736D7e3c5a6CB2CE3B764300140ABF476F6CFCCF"
-    strategy.setKeeper(keeper)
-    strategy.setCreditThreshold(20_000e18)
-    vault.addStrategy(strategy, 10_000, 0, 2**256 - 1, 1_000, {"from": gov})
-    yield strategy
+    tx = factory.newStrategy(
+        vault,
+        swapper,
+        keeper,
+        (1000e18, 60_000e18, True),  # min sell, max sell, auto adjust
+        20_000e18,  # credit threshold
+        {"from": wavey},
+    )
+    strategy = Strategy.at(tx.events["NewStrategy"]["strategy"])
+    print(f"governance: vault.addStrategy({strategy}, 10_000, 0, 2**256 - 1, 1_000)")
+    return strategy
@@ -0,0 +1,180 @@
+"""
+Gas profile of a harvest by contract and function, internal ones included.
+
+Walks brownie's expanded trace (`tx.trace`, one step per opcode tagged with the
+contract and function it ran in) and charges every opcode to the function it
+ran in. Call opcodes are only charged their own cost, the callee's gas goes to
+the callee. Writes a JSON summary and a speedscope profile
+(https://www.speedscope.app) where the x axis is cumulative gas.
+
+Without a txid, deploys the mock stack, lets a week of rewards accrue and
+profiles a week end harvest (claim, sell, lock and stake):
+
+    brownie run gas_profile main --network development
+    brownie run gas_profile main <txid> [out dir] --network mainnet-fork
+
+From the tests, `--profile-harvests <dir>` profiles every harvest a test sends.
+"""
+import json
+from pathlib import Path
+
+from brownie import chain
+
+from scripts.scenario import DAY, HOUR, WEEK, DepositRewards, setup
+
+
+def _contract(step, labels):
+    # labels name the mock stack and fork contracts brownie has no source for
+    address = step.get("address")
+    return labels.get(address) or step.get("contractName") or address
+
+
+def _frame_name(step, labels):
+    if step.get("fn"):
+        return step["fn"]
+    return f"{_contract(step, labels)}.<unknown>"
+
+
+def step_costs(trace):
+    """Gas charged to each step, with callee gas taken out of call opcodes."""
+    costs = [step["gasCost"] for step in trace]
+    calls = []
+    for i, step in enumerate(trace[:-1]):
+        following = trace[i + 1]
+        if following["depth"] > step["depth"]:
+            calls.append(i)
+        elif following["depth"] == step["depth"]:
+            costs[i] = step["gas"] - following["gas"]
+        else:
+            # last step of a frame, the call opcode that opened it gets what the
+            # frame didn't account for
+            call = calls.pop()
+            callee_start = trace[call + 1]["gas"]
+            consumed = callee_start - (step["gas"] - step["gasCost"])
+            costs[call] = trace[call]["gas"] - following["gas"] - consumed
+    return costs
+
+
+def labels_of(**contracts):
+    """Address to name for `profile`, skipping anything without an address."""
+    return {c.address: name for name, c in contracts.items() if hasattr(c, "address")}
+
+
+def profile(tx, labels=None):
+    """Self and inclusive gas by function and self gas by contract."""
+    labels = labels or {}
+    trace = tx.trace
+    costs = step_costs(trace)
+
+    functions = {}
+    contracts = {}
+    frames = []
+    frame_index = {}
+    events = []
+    # open frames as (depth, jumpDepth, name, index into frames, opened at)
+    stack = []
+    at = 0
+
+    def open_frame(level, name):
+        if name not in functions:
+            functions[name] = {"self": 0, "inclusive": 0, "calls": 0}
+            frame_index[name] = len(frames)
+            frames.append({"name": name})
+        index = frame_index[name]
+        functions[name]["calls"] += 1
+        stack.append((level, name, index, at))
+        events.append({"type": "O", "frame": index, "at": at})
+
+    def close_frame():
+        _, name, index, opened = stack.pop()
+        # recursion would count twice, only the outermost frame counts
+        if all(entry[1] != name for entry in stack):
+            functions[name]["inclusive"] += at - opened
+        events.append({"type": "C", "frame": index, "at": at})
+
+    for step, cost in zip(trace, costs):
+        level = (step["depth"], step.get("jumpDepth", 0))
+        name = _frame_name(step, labels)
+        while stack and (
+            stack[-1][0] > level or (stack[-1][0] == level and stack[-1][1] != name)
+        ):
+            close_frame()
+        if not stack or stack[-1][0] < level:
+            open_frame(level, name)
+
+        functions[name]["self"] += cost
+        contract = _contract(step, labels)
+        contracts[contract] = contracts.get(contract, 0) + cost
+        at += cost
+
+    while stack:
+        close_frame()
+
+    return {
+        "txid": tx.txid,
+        "gas_used": tx.gas_used,
+        # gas_used also has the intrinsic 21k plus calldata, minus refunds
+        "traced": at,
+        "contracts": dict(sorted(contracts.items(), key=lambda kv: -kv[1])),
+        "functions": dict(sorted(functions.items(), key=lambda kv: -kv[1]["self"])),
+        "speedscope": {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "evented",
+                    "name": tx.txid,
+                    "unit": "none",
+                    "startValue": 0,
+                    "endValue": at,
+                    "events": events,
+                }
+            ],
+        },
+    }
+
+
+def write(result, out_dir, name):
+    """Writes <name>.json and <name>.speedscope.json, returns their paths."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    summary = {k: v for k, v in result.items() if k != "speedscope"}
+    summary_path = out_dir / f"{name}.json"
+    speedscope_path = out_dir / f"{name}.speedscope.json"
+    summary_path.write_text(json.dumps(summary, indent=2) + "\n")
+    speedscope_path.write_text(json.dumps(result["speedscope"]))
+    return summary_path, speedscope_path
+
+
+def _local_harvest(Vault=None):
+    from brownie import Strategy, SwapperV2, accounts, config, project
+    from brownie._config import _get_data_folder
+
+    if Vault is None:
+        org, repo = config["dependencies"][0].split("/")
+        Vault = project.load(
+            _get_data_folder().joinpath("packages", org, repo), name="Vaults"
+        ).Vault
+    env = setup(accounts, Vault, Strategy, SwapperV2)
+    week = chain.time() // WEEK + 1
+    chain.mine(timestamp=week * WEEK + DAY)
+    DepositRewards(5_000 * 10**18).apply(env)
+    # an hour before the next week ends, week 0 is claimable and the lock is due
+    chain.mine(timestamp=(week + 2) * WEEK - HOUR)
+    tx = env.strategy.harvest({"from": env.gov})
+    return tx, labels_of(**vars(env))
+
+
+def main(txid=None, out_dir="profiles"):
+    if txid is None:
+        tx, labels = _local_harvest()
+    else:
+        tx, labels = chain.get_transaction(txid), {}
+    result = profile(tx, labels)
+    for path in write(result, out_dir, tx.txid[:10]):
+        print(f"wrote {path}")
+    print(f"{'':<48} {'self':>10} {'inclusive':>10}")
+    for name, gas in list(result["functions"].items())[:15]:
+        print(f"{name:<48} {gas['self']:>10,} {gas['inclusive']:>10,}")
+    for name, gas in result["contracts"].items():
+        print(f"{name:<48} {gas:>10,}")
@@ -0,0 +1,308 @@
+"""
+Incremental event index of the strategy and the contracts around it in SQLite.
+
+Fetches the logs of a set of named contracts (strategy, want, swapper, pools,
+ybs, reward distributor) in block ranges that shrink when the node refuses a
+range and grow back while batches stay small, decodes them with the
+contracts' ABIs and stores them with their block, timestamp and week. Every
+batch is committed with a per contract cursor, so a rerun picks up from the
+last indexed block:
+
+    brownie run indexer main <strategy> [db path] --network mainnet
+
+and answers the questions we used to dig out of `tx.events` by hand:
+
+    indexer = Indexer("harvests.db", discover(strategy))
+    indexer.sync()
+    indexer.gas_per_harvest()   # week, harvests, gas
+    indexer.realized_rate()     # week, crvUSD sold, yCRV realized, rate
+"""
+import json
+import os
+import sqlite3
+from collections.abc import Mapping
+from pathlib import Path
+
+import requests
+from brownie import Contract, web3
+from eth_utils import event_abi_to_log_topic
+from hexbytes import HexBytes
+
+from scripts.view_cache import DEV_CHAIN_IDS
+
+WEEK = 60 * 60 * 24 * 7
+# blocks kept out of the index on live networks in case of a reorg
+REORG_DEPTH = 12
+
+DEFAULT_DB = Path.home() / ".cache" / "ybs-indexer.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    tx_hash TEXT NOT NULL,
+    log_index INTEGER NOT NULL,
+    block INTEGER NOT NULL,
+    timestamp INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    contract TEXT NOT NULL,
+    address TEXT NOT NULL,
+    event TEXT NOT NULL,
+    args TEXT NOT NULL,
+    PRIMARY KEY (tx_hash, log_index)
+);
+CREATE INDEX IF NOT EXISTS events_block ON events (block);
+CREATE INDEX IF NOT EXISTS events_week ON events (week, event);
+CREATE TABLE IF NOT EXISTS receipts (
+    tx_hash TEXT PRIMARY KEY,
+    gas_used INTEGER NOT NULL,
+    gas_price INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cursors (
+    address TEXT PRIMARY KEY,
+    block INTEGER NOT NULL
+);
+"""
+
+# events whose transactions get their receipt stored, for gas
+RECEIPT_EVENTS = {"Harvested"}
+
+
+def _jsonable(value):
+    if isinstance(value, (bytes, HexBytes)):
+        return HexBytes(value).hex()
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, Mapping):
+        return {k: _jsonable(v) for k, v in value.items()}
+    return value
+
+
+def discover(strategy):
+    """The strategy and everything its harvests touch, by name."""
+    strategy = Contract(strategy)
+    swapper = Contract(strategy.swapper())
+    contracts = {
+        "strategy": strategy,
+        # yCRV, its transfers to the strategy are the swap output
+        "want": Contract(strategy.want()),
+        "swapper": swapper,
+        "ybs": Contract(strategy.ybs()),
+        "reward_distributor": Contract(strategy.rewardDistributor()),
+        "pool1": Contract(swapper.pool1()),
+    }
+    if hasattr(swapper, "pool2"):
+        contracts["pool2"] = Contract(swapper.pool2())
+    return contracts
+
+
+class Indexer:
+    def __init__(
+        self,
+        path=None,
+        contracts=None,
+        start_block=0,
+        batch_size=2_000,
+        max_batch_size=100_000,
+        target_logs=2_000,
+    ):
+        path = path or os.environ.get("YBS_INDEXER_DB", DEFAULT_DB)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+        self.start_block = start_block
+        self.batch_size = batch_size
+        self.max_batch_size = max_batch_size
+        self.target_logs = target_logs
+        self.contracts = contracts or {}
+        # (address, topic0) to (contract name, web3 event)
+        self.decoders = {}
+        for name, contract in self.contracts.items():
+            w3_contract = web3.eth.contract(address=contract.address, abi=contract.abi)
+            for abi in contract.abi:
+                if abi["type"] != "event" or abi.get("anonymous"):
+                    continue
+                topic = HexBytes(event_abi_to_log_topic(abi))
+                event = getattr(w3_contract.events, abi["name"])()
+                self.decoders[(contract.address.lower(), topic)] = (name, event)
+
+    def cursor(self, address):
+        row = self.db.execute(
+            "SELECT block FROM cursors WHERE address = ?", (address.lower(),)
+        ).fetchone()
+        return row[0] if row else self.start_block - 1
+
+    def _get_logs(self, from_block, to_block):
+        return web3.eth.get_logs(
+            {
+                "address": [c.address for c in self.contracts.values()],
+                "fromBlock": from_block,
+                "toBlock": to_block,
+            }
+        )
+
+    def sync(self, to_block=None):
+        """Index up to `to_block` (latest by default), returns the events added."""
+        if to_block is None:
+            to_block = web3.eth.block_number
+        # a contract added since the last run backfills from its own cursor,
+        # everything else already indexed in that range is skipped on insert
+        addresses = [c.address.lower() for c in self.contracts.values()]
+        block = min(self.cursor(address) for address in addresses) + 1
+        size = self.batch_size
+        # the largest range worth trying, lowered to below what the node refused
+        limit = self.max_batch_size
+        added = 0
+        while block <= to_block:
+            end = min(block + size - 1, to_block)
+            try:
+                logs = self._get_logs(block, end)
+            except (ValueError, requests.exceptions.RequestException):
+                # too many results or too slow, the limit depends on the node
+                if size == 1:
+                    raise
+                size = limit = max(1, size // 2)
+                continue
+            added += self._store(logs)
+            self.db.executemany(
+                "INSERT INTO cursors VALUES (?, ?) ON CONFLICT (address) "
+                "DO UPDATE SET block = MAX(block, excluded.block)",
+                [(address, end) for address in addresses],
+            )
+            self.db.commit()
+            block = end + 1
+            if len(logs) < self.target_logs // 2:
+                size = min(size * 2, limit)
+        return added
+
+    def _store(self, logs):
+        timestamps = {}
+        rows = []
+        receipts = set()
+        for log in logs:
+            if not log["topics"]:
+                continue
+            key = (log["address"].lower(), HexBytes(log["topics"][0]))
+            if key not in self.decoders:
+                continue
+            name, event = self.decoders[key]
+            decoded = event.process_log(log)
+            number = log["blockNumber"]
+            if number not in timestamps:
+                timestamps[number] = web3.eth.get_block(number)["timestamp"]
+            tx_hash = HexBytes(log["transactionHash"]).hex()
+            rows.append(
+                (
+                    tx_hash,
+                    log["logIndex"],
+                    number,
+                    timestamps[number],
+                    timestamps[number] // WEEK,
+                    name,
+                    key[0],
+                    decoded["event"],
+                    json.dumps(_jsonable(dict(decoded["args"]))),
+                )
+            )
+            if decoded["event"] in RECEIPT_EVENTS:
+                receipts.add(tx_hash)
+        before = self.db.total_changes
+        self.db.executemany(
+            "INSERT OR IGNORE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+        )
+        added = self.db.total_changes - before
+        for tx_hash in receipts:
+            receipt = web3.eth.get_transaction_receipt(tx_hash)
+            self.db.execute(
+                "INSERT OR IGNORE INTO receipts VALUES (?, ?, ?)",
+                (tx_hash, receipt["gasUsed"], receipt.get("effectiveGasPrice", 0)),
+            )
+        return added
+
+    def events(self, event=None, contract=None, week=None):
+        """Decoded events in log order, filtered by name, contract and week."""
+        query = "SELECT block, week, tx_hash, contract, event, args FROM events"
+        clauses, params = [], []
+        for column, value in (("event", event), ("contract", contract), ("week", week)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY block, log_index"
+        return [
+            {
+                "block": block,
+                "week": week,
+                "tx_hash": tx_hash,
+                "contract": contract,
+                "event": name,
+                "args": json.loads(args),
+            }
+            for block, week, tx_hash, contract, name, args in self.db.execute(
+                query, params
+            )
+        ]
+
+    def gas_per_harvest(self, contract="strategy"):
+        """(week, harvests, total gas) for every week with a harvest."""
+        return self.db.execute(
+            "SELECT e.week, COUNT(*), SUM(r.gas_used) FROM events e "
+            "JOIN receipts r ON r.tx_hash = e.tx_hash "
+            "WHERE e.event = 'Harvested' AND e.contract = ? "
+            "GROUP BY e.week ORDER BY e.week",
+            (contract,),
+        ).fetchall()
+
+    def realized_rate(self, contract="strategy", pool="pool1", sold_id=None):
+        """
+        (week, crvUSD sold, yCRV realized, yCRV per crvUSD) over the harvests
+        that sold on `pool`. The yCRV realized is what the strategy received
+        in the same transaction from anyone but its vault and ybs, so the swap
+        output whichever route it took. `sold_id` is crvUSD's index in `pool`,
+        the swapper's by default.
+        """
+        if sold_id is None:
+            sold_id = self.contracts["swapper"].pool1InTokenIdx()
+        strategy = self.contracts[contract]
+        harvests = {e["tx_hash"]: e for e in self.events("Harvested", contract)}
+        sold = {}
+        for e in self.events("TokenExchange", pool):
+            if e["tx_hash"] in harvests and e["args"]["sold_id"] == sold_id:
+                sold[e["tx_hash"]] = (
+                    sold.get(e["tx_hash"], 0) + e["args"]["tokens_sold"]
+                )
+        # credit from the vault and unstaked yCRV aren't swap output
+        others = {strategy.vault().lower(), self.contracts["ybs"].address.lower()}
+        received = {}
+        for e in self.events("Transfer", "want"):
+            # yCRV and OpenZeppelin tokens name the arguments differently
+            sender, receiver, value = e["args"].values()
+            if (
+                e["tx_hash"] in sold
+                and receiver.lower() == strategy.address.lower()
+                and sender.lower() not in others
+            ):
+                received[e["tx_hash"]] = received.get(e["tx_hash"], 0) + value
+        weeks = {}
+        for tx_hash, amount in sold.items():
+            week = harvests[tx_hash]["week"]
+            total, realized = weeks.get(week, (0, 0))
+            weeks[week] = (total + amount, realized + received.get(tx_hash, 0))
+        return [
+            (week, total, realized, realized / total)
+            for week, (total, realized) in sorted(weeks.items())
+        ]
+
+
+def main(strategy, path=None):
+    indexer = Indexer(path, discover(strategy))
+    head = web3.eth.block_number
+    if web3.eth.chain_id not in DEV_CHAIN_IDS:
+        head -= REORG_DEPTH
+    print(f"indexed {indexer.sync(head):,} new events up to block {head:,}")
+    for week, harvests, gas in indexer.gas_per_harvest():
+        print(f"week {week}: {harvests} harvests, {gas / harvests:,.0f} gas each")
+    for week, sold, realized, rate in indexer.realized_rate():
+        print(
+            f"week {week}: {sold / 1e18:,.2f} crvUSD -> "
+            f"{realized / 1e18:,.2f} yCRV ({rate:.4f})"
+        )
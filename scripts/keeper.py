@@ -0,0 +1,148 @@
+"""
+Harvest keeper for many strategies.
+
+Each check reads `harvestTrigger(0)`, `thresholdTimeUntilWeekEnd`,
+`minReportDelay` and the vault's `lastReport` for every strategy in a single
+Multicall3 `aggregate3` eth_call pinned to one block, then harvests the ones
+that triggered. Between checks the keeper sleeps until the earliest time a
+trigger can flip on its own (a week end window opening, a report delay running
+out, a new week of rewards), capped at `max_wait` so credit and base fee
+changes are still picked up:
+
+    brownie run keeper main <account id> <strategy> [...] --network mainnet
+"""
+import time
+from dataclasses import dataclass
+
+from brownie import Contract, Strategy, accounts
+
+from scripts.multicall import MULTICALL3, aggregate, multicall
+
+WEEK = 60 * 60 * 24 * 7
+
+# 0.4.x vault, only what the keeper reads
+VAULT_ABI = [
+    {
+        "name": "strategies",
+        "type": "function",
+        "stateMutability": "view",
+        "inputs": [{"name": "arg0", "type": "address"}],
+        "outputs": [
+            {
+                "name": "",
+                "type": "tuple",
+                "components": [
+                    {"name": "performanceFee", "type": "uint256"},
+                    {"name": "activation", "type": "uint256"},
+                    {"name": "debtRatio", "type": "uint256"},
+                    {"name": "minDebtPerHarvest", "type": "uint256"},
+                    {"name": "maxDebtPerHarvest", "type": "uint256"},
+                    {"name": "lastReport", "type": "uint256"},
+                    {"name": "totalDebt", "type": "uint256"},
+                    {"name": "totalGain", "type": "uint256"},
+                    {"name": "totalLoss", "type": "uint256"},
+                ],
+            }
+        ],
+    },
+]
+
+
+def week_end_window(now, threshold_time_until_week_end):
+    """(start, end) of the week end window `now` is in or before."""
+    week_end = (now // WEEK + 1) * WEEK
+    return week_end - threshold_time_until_week_end, week_end
+
+
+@dataclass
+class Check:
+    strategy: object
+    ok: bool
+    trigger: bool = False
+    threshold_time_until_week_end: int = 0
+    min_report_delay: int = 0
+    last_report: int = 0
+
+    def next_check(self, now):
+        # the earliest time the trigger can flip without anything else changing
+        start, week_end = week_end_window(now, self.threshold_time_until_week_end)
+        candidates = [
+            start,
+            week_end,
+            self.last_report + self.min_report_delay + 1,
+        ]
+        return min((t for t in candidates if t > now), default=now + 1)
+
+
+class Keeper:
+    def __init__(self, strategies, multicall_address=MULTICALL3):
+        self.strategies = [Strategy.at(str(s)) for s in strategies]
+        self.vaults = [
+            Contract.from_abi("Vault", s.vault(), VAULT_ABI) for s in self.strategies
+        ]
+        self.multicall = multicall(multicall_address)
+        self._calls = [(self.multicall.getCurrentBlockTimestamp, ())]
+        for strategy, vault in zip(self.strategies, self.vaults):
+            self._calls += [
+                (strategy.harvestTrigger, (0,)),
+                (strategy.thresholdTimeUntilWeekEnd, ()),
+                (strategy.minReportDelay, ()),
+                (vault.strategies, (strategy,)),
+            ]
+
+    def check(self, block_identifier=None):
+        """Returns (block timestamp, [Check]) from one eth_call."""
+        results = aggregate(
+            self._calls,
+            block_identifier,
+            allow_failure=True,
+            batch_size=len(self._calls),
+            address=self.multicall.address,
+        )
+        now = results[0]
+
+        checks = []
+        for i, strategy in enumerate(self.strategies):
+            values = results[1 + 4 * i : 5 + 4 * i]
+            if any(v is None for v in values):
+                checks.append(Check(strategy, ok=False))
+                continue
+            trigger, threshold, delay, params = values
+            checks.append(
+                Check(
+                    strategy,
+                    ok=True,
+                    trigger=trigger,
+                    threshold_time_until_week_end=threshold,
+                    min_report_delay=delay,
+                    last_report=params[5],
+                )
+            )
+        return now, checks
+
+    def harvest(self, account, checks):
+        """Harvest every strategy whose trigger fired, returns the transactions."""
+        return [
+            check.strategy.harvest({"from": account})
+            for check in checks
+            if check.ok and check.trigger
+        ]
+
+    def next_check(self, now, checks):
+        return min((c.next_check(now) for c in checks if c.ok), default=now + 1)
+
+    def run(self, account, max_wait=600, rounds=None, sleep=time.sleep):
+        """Check, harvest and wait, forever or for `rounds` rounds."""
+        done = 0
+        while rounds is None or done < rounds:
+            now, checks = self.check()
+            for tx in self.harvest(account, checks):
+                print(f"harvested {tx.receiver} in {tx.txid}")
+            wait = min(max(self.next_check(now, checks) - now, 1), max_wait)
+            done += 1
+            if rounds is None or done < rounds:
+                sleep(wait)
+
+
+def main(account_id, *strategies):
+    Keeper(strategies).run(accounts.load(account_id))
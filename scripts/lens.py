@@ -0,0 +1,49 @@
+"""
+Full state of many strategies in one eth_call through StrategyLens.
+
+Balances, debt, swap thresholds, bypasses, claimable rewards, the week end
+window, the harvest trigger and boost for every strategy come back from a
+single `getStates` call instead of a dozen calls per strategy. A strategy
+that can't be read (an older version, a wrong address) comes back with
+`ok` False instead of failing the whole call:
+
+    brownie run lens main <lens> <utils> <strategy> [...] --network mainnet
+"""
+from brownie import StrategyLens
+
+
+class Lens:
+    def __init__(self, address):
+        self.lens = StrategyLens.at(address)
+        abi = next(a for a in self.lens.abi if a.get("name") == "getStates")
+        self.fields = [c["name"] for c in abi["outputs"][0]["components"]]
+
+    def states(self, strategies, utils=None, block_identifier=None):
+        """
+        One dict per strategy, keyed like StrategyLens.StrategyState. `utils`
+        is one ybs utilities address for all strategies or one per strategy,
+        boost is left at 0 without it.
+        """
+        strategies = [str(s) for s in strategies]
+        if utils is None:
+            utils = []
+        elif isinstance(utils, (list, tuple)):
+            utils = [str(u) for u in utils]
+        else:
+            utils = [str(utils)] * len(strategies)
+        rows = self.lens.getStates(strategies, utils, block_identifier=block_identifier)
+        return [dict(zip(self.fields, row)) for row in rows]
+
+
+def main(lens, utils, *strategies):
+    for s in Lens(lens).states(strategies, utils):
+        if not s["ok"]:
+            print(f"{s['strategy']}: unreadable")
+            continue
+        print(
+            f"{s['strategy']}: {s['estimatedTotalAssets'] / 1e18:,.2f} assets, "
+            f"{s['claimable'] / 1e18:,.2f} claimable, "
+            f"boost {s['activeBoost'] / 1e18:.2f}x "
+            f"(projected {s['projectedBoost'] / 1e18:.2f}x), "
+            f"trigger {s['harvestTrigger']}"
+        )
@@ -0,0 +1,122 @@
+"""
+Local stand-ins for the mainnet contracts the strategy depends on, so the test
+suite runs on a plain development chain instead of a mainnet fork:
+
+    brownie test --local --network development
+
+Contracts referenced by constant address (the yCRV zap in SwapperV2, the
+strategy proxy in Strategy, the base fee oracle in BaseStrategy and Multicall3
+for the keeper) are deployed normally and their runtime code is then etched at
+the constant address. Etched code starts with empty storage, so the base fee
+oracle has to be switched on after etching.
+"""
+from types import SimpleNamespace
+
+from brownie import (
+    MockBaseFeeOracle,
+    MockCurveStablePool,
+    MockCurveTriPool,
+    MockERC20,
+    MockMulticall3,
+    MockRewardDistributor,
+    MockRewardVault,
+    MockStrategyProxy,
+    MockYBSUtilities,
+    MockYCrvZap,
+    MockYearnBoostedStaker,
+    web3,
+)
+
+GOV = "0xFEB4acf3df3cDEA7399794D0869ef76A6EfAff52"
+STRATEGY_PROXY = "0x78eDcb307AC1d1F8F5Fd070B377A6e69C8dcFC34"
+YCRV_ZAP = "0x78ada385b15D89a9B845D2Cac0698663F0c69e3C"
+MULTICALL3 = "0xcA11bde05977b3631167028862bE2a173976CA11"
+BASE_FEE_ORACLE = "0xb5e1CAcB567d98faaDB60a1fD4820720141f064F"
+MAX_STAKE_GROWTH_WEEKS = 4
+TRICRV_FEE = 4_000_000  # 0.04%, curve fees are 1e10 based
+YCRV_POOL_FEE = 1_000_000
+
+
+def set_code(address, code):
+    # anvil, hardhat and ganache each name this differently
+    for method in ("anvil_setCode", "hardhat_setCode", "evm_setAccountCode"):
+        response = web3.provider.make_request(method, [address, code])
+        if "error" not in response:
+            return
+    raise RuntimeError(f"local node cannot set code at {address}")
+
+
+def etch(container, address, deployer, *args):
+    """Deploy `container` and copy its runtime code to `address`."""
+    template = container.deploy(*args, {"from": deployer})
+    set_code(address, "0x" + bytes(web3.eth.get_code(template.address)).hex())
+    return container.at(address)
+
+
+def deploy(deployer, gov, Vault, rewards, guardian, management):
+    """Deploy the full mock stack and a fresh 0.4.6 vault for yCRV."""
+    if gov.balance() < 10 * 10**18:
+        deployer.transfer(gov, 100 * 10**18)
+
+    tx = {"from": deployer}
+    crvusd = MockERC20.deploy("Curve.Fi USD Stablecoin", "crvUSD", tx)
+    crv = MockERC20.deploy("Curve DAO Token", "CRV", tx)
+    weth = MockERC20.deploy("Wrapped Ether", "WETH", tx)
+    ycrv = MockERC20.deploy("Yearn CRV", "yCRV", tx)
+
+    reward_token = MockRewardVault.deploy(crvusd, tx)
+    ybs = MockYearnBoostedStaker.deploy(ycrv, MAX_STAKE_GROWTH_WEEKS, gov, tx)
+    reward_distributor = MockRewardDistributor.deploy(ybs, reward_token, tx)
+    utils = MockYBSUtilities.deploy(ybs, reward_distributor, tx)
+
+    # roughly mainnet prices: 1 crvUSD ~ 2 CRV, CRV ~ yCRV
+    pool1 = MockCurveTriPool.deploy([crvusd, weth, crv], TRICRV_FEE, tx)
+    crvusd.mint(pool1, 10_000_000 * 10**18, tx)
+    weth.mint(pool1, 3_000 * 10**18, tx)
+    crv.mint(pool1, 20_000_000 * 10**18, tx)
+    # a shallower crvUSD/CRV pool for swappers that split across pools
+    alt_pool = MockCurveTriPool.deploy([crvusd, crv], TRICRV_FEE, tx)
+    crvusd.mint(alt_pool, 1_000_000 * 10**18, tx)
+    crv.mint(alt_pool, 2_000_000 * 10**18, tx)
+    pool2 = MockCurveStablePool.deploy([crv, ycrv], YCRV_POOL_FEE, tx)
+    crv.mint(pool2, 5_000_000 * 10**18, tx)
+    ycrv.mint(pool2, 5_000_000 * 10**18, tx)
+
+    zap = etch(MockYCrvZap, YCRV_ZAP, deployer, crv, ycrv)
+    proxy = etch(MockStrategyProxy, STRATEGY_PROXY, deployer, gov)
+    multicall = etch(MockMulticall3, MULTICALL3, deployer)
+    base_fee_oracle = etch(MockBaseFeeOracle, BASE_FEE_ORACLE, deployer)
+    base_fee_oracle.setCurrentBaseFeeAcceptable(True, tx)
+
+    vault = Vault.deploy(tx)
+    vault.initialize(ycrv, gov, rewards, "", "", guardian, management, {"from": gov})
+    vault.setDepositLimit(2**256 - 1, {"from": gov})
+
+    return SimpleNamespace(
+        crvusd=crvusd,
+        crv=crv,
+        weth=weth,
+        ycrv=ycrv,
+        reward_token=reward_token,
+        ybs=ybs,
+        reward_distributor=reward_distributor,
+        utils=utils,
+        pool1=pool1,
+        alt_pool=alt_pool,
+        pool2=pool2,
+        zap=zap,
+        proxy=proxy,
+        multicall=multicall,
+        base_fee_oracle=base_fee_oracle,
+        vault=vault,
+    )
+
+
+def seed_strategy(stack, strategy, gov, depositor, amount=100_000 * 10**18):
+    """Add `strategy` to the vault and give it a staked position, like the live one."""
+    stack.vault.addStrategy(strategy, 10_000, 0, 2**256 - 1, 1_000, {"from": gov})
+    stack.ycrv.mint(depositor, amount, {"from": depositor})
+    stack.ycrv.approve(stack.vault, amount, {"from": depositor})
+    stack.vault.deposit(amount, {"from": depositor})
+    stack.proxy.approveLocker(strategy, True, {"from": gov})
+    strategy.harvest({"from": gov})
@@ -0,0 +1,79 @@
+"""
+Batched view calls through Multicall3.
+
+    aggregate([(ybs.getGlobalWeightAt, (week,)) for week in weeks], block)
+
+Every batch is one `aggregate3` eth_call pinned to the same block, results come
+back decoded by the method's own ABI.
+"""
+from brownie import Contract
+
+MULTICALL3 = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+MULTICALL3_ABI = [
+    {
+        "name": "aggregate3",
+        "type": "function",
+        "stateMutability": "payable",
+        "inputs": [
+            {
+                "name": "calls",
+                "type": "tuple[]",
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"},
+                ],
+            }
+        ],
+        "outputs": [
+            {
+                "name": "returnData",
+                "type": "tuple[]",
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"},
+                ],
+            }
+        ],
+    },
+    {
+        "name": "getCurrentBlockTimestamp",
+        "type": "function",
+        "stateMutability": "view",
+        "inputs": [],
+        "outputs": [{"name": "timestamp", "type": "uint256"}],
+    },
+]
+
+
+def multicall(address=MULTICALL3):
+    return Contract.from_abi("Multicall3", address, MULTICALL3_ABI)
+
+
+def aggregate(
+    calls,
+    block_identifier=None,
+    allow_failure=False,
+    batch_size=500,
+    address=MULTICALL3,
+):
+    """
+    Run `calls`, a list of (contract method, args), returning the decoded
+    results in order. Failed calls come back as None with `allow_failure`,
+    otherwise the whole batch reverts.
+    """
+    mc = multicall(address)
+    results = []
+    for i in range(0, len(calls), batch_size):
+        batch = calls[i : i + batch_size]
+        returned = mc.aggregate3.call(
+            [
+                (method._address, allow_failure, method.encode_input(*args))
+                for method, args in batch
+            ],
+            block_identifier=block_identifier,
+        )
+        for (method, _), (success, data) in zip(batch, returned):
+            results.append(method.decode_output(data) if success else None)
+    return results
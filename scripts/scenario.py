@@ -0,0 +1,284 @@
+"""
+Multi-week scenarios against the local mock stack.
+
+A scenario is a declarative timeline of events anchored to week boundaries:
+
+    Scenario("rewards then withdraw", [
+        (WeekStart(0), Deposit(10_000 * 10**18)),
+        (WeekStart(0, DAY), DepositRewards(5_000 * 10**18)),
+        (WeekEnd(1, HOUR), Harvest()),
+        (WeekStart(2), PushRewards()),
+        (WeekStart(2, DAY), Harvest()),
+    ])
+
+Week 0 is the first full week after the chain's current time, so a timeline
+lands on the same point of the week however long setup took. The chain jumps
+straight to each event's timestamp instead of stepping through blocks.
+Independent scenarios run in parallel worker processes, each with its own
+development chain and mock stack, and every scenario reports its harvested
+profit and loss and the gas used per event type:
+
+    brownie run scenario main --network development
+"""
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+from pathlib import Path
+from types import SimpleNamespace
+
+WEEK = 60 * 60 * 24 * 7
+DAY = 60 * 60 * 24
+HOUR = 60 * 60
+
+ROOT = Path(__file__).parent.parent
+
+
+@dataclass(frozen=True)
+class At:
+    week: int
+    offset: int = 0
+
+    def timestamp(self, start_week):
+        return (start_week + self.week) * WEEK + self.offset
+
+
+def WeekStart(week, after=0):
+    """`after` seconds into `week`."""
+    return At(week, after)
+
+
+def WeekEnd(week, before=0):
+    """`before` seconds before `week` ends."""
+    return At(week + 1, -before)
+
+
+@dataclass(frozen=True)
+class Deposit:
+    amount: int
+
+    def apply(self, env):
+        env.token.mint(env.user, self.amount, {"from": env.user})
+        env.token.approve(env.vault, self.amount, {"from": env.user})
+        return [env.vault.deposit(self.amount, {"from": env.user})]
+
+
+@dataclass(frozen=True)
+class Withdraw:
+    # vault shares, all of the user's when None
+    shares: int = None
+
+    def apply(self, env):
+        shares = self.shares or env.vault.balanceOf(env.user)
+        return [env.vault.withdraw(shares, env.user, 10_000, {"from": env.user})]
+
+
+@dataclass(frozen=True)
+class DepositRewards:
+    # crvUSD, deposited into the reward vault and then the distributor
+    amount: int
+
+    def apply(self, env):
+        tx = {"from": env.user}
+        env.crvusd.mint(env.user, self.amount, tx)
+        env.crvusd.approve(env.reward_token, self.amount, tx)
+        env.reward_token.deposit(self.amount, env.user, tx)
+        shares = env.reward_token.balanceOf(env.user)
+        env.reward_token.approve(env.reward_distributor, shares, tx)
+        return [env.reward_distributor.depositReward(shares, tx)]
+
+
+@dataclass(frozen=True)
+class PushRewards:
+    # moves last week's rewards forward if nobody had weight to earn them
+    def apply(self, env):
+        week = env.reward_distributor.getWeek()
+        if week == 0 or env.ybs.getGlobalWeightAt(week - 1) > 0:
+            return []
+        return [env.reward_distributor.pushRewards(week - 1, {"from": env.gov})]
+
+
+@dataclass(frozen=True)
+class WhaleSwap:
+    # sells crvUSD for CRV on pool1, or CRV for crvUSD with `sell_crv`
+    amount: int
+    sell_crv: bool = False
+
+    def apply(self, env):
+        sold, bought = (env.crv, env.crvusd) if self.sell_crv else (env.crvusd, env.crv)
+        i = [env.pool1.coins(k) for k in range(3)].index(sold)
+        j = [env.pool1.coins(k) for k in range(3)].index(bought)
+        tx = {"from": env.whale}
+        sold.mint(env.whale, self.amount, tx)
+        sold.approve(env.pool1, self.amount, tx)
+        return [env.pool1.exchange(i, j, self.amount, 0, tx)]
+
+
+@dataclass(frozen=True)
+class Harvest:
+    def apply(self, env):
+        return [env.strategy.harvest({"from": env.gov})]
+
+
+@dataclass(frozen=True)
+class DebtRatio:
+    bps: int
+
+    def apply(self, env):
+        return [
+            env.vault.updateStrategyDebtRatio(env.strategy, self.bps, {"from": env.gov})
+        ]
+
+
+@dataclass
+class Scenario:
+    name: str
+    timeline: list
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    profit: int = 0
+    loss: int = 0
+    harvests: int = 0
+    gas: dict = field(default_factory=dict)
+    # the event that reverted, if any
+    error: str = None
+
+
+def run_scenario(scenario, env, chain):
+    """Play `scenario` on the connected chain. Doesn't revert it afterwards."""
+    result = ScenarioResult(scenario.name)
+    start_week = chain.time() // WEEK + 1
+    timeline = sorted(scenario.timeline, key=lambda item: item[0].timestamp(start_week))
+    for at, event in timeline:
+        timestamp = at.timestamp(start_week)
+        if timestamp > chain.time():
+            chain.mine(timestamp=timestamp)
+        kind = type(event).__name__
+        try:
+            txs = event.apply(env)
+        except Exception as e:
+            result.error = f"{kind} at week {at.week} +{at.offset}s: {e}"
+            return result
+        for tx in txs:
+            result.gas[kind] = result.gas.get(kind, 0) + tx.gas_used
+            if "Harvested" not in tx.events:
+                continue
+            for harvested in tx.events["Harvested"]:
+                result.profit += harvested["profit"]
+                result.loss += harvested["loss"]
+                result.harvests += 1
+    return result
+
+
+def setup(accounts, Vault, Strategy, SwapperV2):
+    """Mock stack and a seeded strategy on the connected development chain."""
+    from scripts import local_stack
+
+    gov = accounts.at(local_stack.GOV, force=True)
+    stack = local_stack.deploy(
+        accounts[0],
+        gov,
+        Vault,
+        rewards=accounts[1],
+        guardian=accounts[2],
+        management=accounts[3],
+    )
+    swapper = gov.deploy(SwapperV2, stack.crvusd, stack.ycrv, stack.pool1, stack.crv)
+    strategy = accounts[4].deploy(
+        Strategy, stack.vault, stack.ybs, stack.reward_distributor, swapper
+    )
+    local_stack.seed_strategy(stack, strategy, gov, accounts[9])
+    return SimpleNamespace(
+        **vars(stack),
+        token=stack.ycrv,
+        strategy=strategy,
+        gov=gov,
+        user=accounts[6],
+        whale=accounts[8],
+    )
+
+
+def _worker(args):
+    # a fresh interpreter: load the project and launch a chain on our own port
+    port, scenarios = args
+    from brownie import network, project
+    from brownie._config import CONFIG, _get_data_folder
+
+    build = project.load(ROOT, name="ScenarioProject")
+    org, repo = CONFIG.settings["dependencies"][0].split("/")
+    Vault = project.load(
+        _get_data_folder().joinpath("packages", org, repo), name="Vaults"
+    ).Vault
+    CONFIG.networks["development"]["cmd_settings"]["port"] = port
+    network.connect("development")
+    try:
+        env = setup(network.accounts, Vault, build.Strategy, build.SwapperV2)
+        results = []
+        for scenario in scenarios:
+            network.chain.snapshot()
+            results.append(run_scenario(scenario, env, network.chain))
+            network.chain.revert()
+        return results
+    finally:
+        network.disconnect()
+
+
+def run(scenarios, processes=4, base_port=8600):
+    """Run `scenarios` split across `processes` chains, results in input order."""
+    processes = max(1, min(processes, len(scenarios)))
+    shards = [scenarios[i::processes] for i in range(processes)]
+    with get_context("spawn").Pool(processes) as pool:
+        sharded = pool.map(
+            _worker, [(base_port + i, shard) for i, shard in enumerate(shards)]
+        )
+    # undo the round robin split
+    results = [None] * len(scenarios)
+    for i, shard in enumerate(sharded):
+        results[i::processes] = shard
+    return results
+
+
+def report(results):
+    for r in results:
+        gas = ", ".join(f"{k} {v:,}" for k, v in sorted(r.gas.items()))
+        status = f"FAILED {r.error}" if r.error else f"{r.harvests} harvests"
+        print(
+            f"{r.name:<28} profit {r.profit / 1e18:>12,.2f}  "
+            f"loss {r.loss / 1e18:>10,.2f}  {status}\n{'':<28} gas: {gas}"
+        )
+
+
+SCENARIOS = [
+    Scenario(
+        "weekly rewards",
+        [(WeekStart(0), Deposit(10_000 * 10**18))]
+        + [(WeekStart(w, DAY), DepositRewards(5_000 * 10**18)) for w in range(4)]
+        + [(WeekEnd(w, HOUR), Harvest()) for w in range(4)],
+    ),
+    Scenario(
+        "rewards with crv dump",
+        [(WeekStart(0), Deposit(10_000 * 10**18))]
+        + [(WeekStart(w, DAY), DepositRewards(5_000 * 10**18)) for w in range(4)]
+        + [
+            (WeekStart(w, 2 * DAY), WhaleSwap(2_000_000 * 10**18, True))
+            for w in range(4)
+        ]
+        + [(WeekEnd(w, HOUR), Harvest()) for w in range(4)],
+    ),
+    Scenario(
+        "debt ratio cut",
+        [
+            (WeekStart(0), Deposit(10_000 * 10**18)),
+            (WeekStart(0, DAY), DepositRewards(5_000 * 10**18)),
+            (WeekEnd(0, HOUR), Harvest()),
+            (WeekStart(1), DebtRatio(5_000)),
+            (WeekStart(1, HOUR), Harvest()),
+            (WeekStart(2), Withdraw()),
+        ],
+    ),
+]
+
+
+def main(processes=4):
+    report(run(SCENARIOS, int(processes)))
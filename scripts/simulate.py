@@ -0,0 +1,537 @@
+"""
+Off-chain model of the Strategy harvest loop.
+
+Mirrors `prepareReturn`, `_claimAndSellRewards`, `liquidatePosition` and
+`harvestTrigger`/`harvestTriggerReasons` from contracts/Strategy.sol on uint256 semantics (checked
+arithmetic reverts, `uint112` casts truncate, division floors), together with
+the parts of the 0.4.6 vault `report` that feed back into the strategy. Used to
+tune `swapThresholds`, `maxPriceImpact`, `minReportDelay` and
+`thresholdTimeUntilWeekEnd` without running the fork suite:
+
+    python -m scripts.simulate
+
+Amounts are plain python ints so results match the contracts to the wei.
+"""
+import itertools
+from dataclasses import dataclass, field, replace
+from enum import IntEnum
+from multiprocessing import Pool
+
+WEEK = 60 * 60 * 24 * 7
+HOUR = 60 * 60
+MAX_BPS = 10_000
+MAX_UINT256 = 2**256 - 1
+MAX_UINT112 = 2**112 - 1
+
+
+class Revert(Exception):
+    pass
+
+
+def uint(value):
+    # checked arithmetic, same as solidity >=0.8
+    if value < 0 or value > MAX_UINT256:
+        raise Revert("arithmetic underflow or overflow")
+    return value
+
+
+def uint112(value):
+    # explicit downcasts truncate
+    return value & MAX_UINT112
+
+
+def ybs_stake(strategy, amount, max_weighted=False):
+    # ybs only moves even amounts (weight is amount >> 1), the odd wei stays loose
+    amount = amount >> 1 << 1
+    strategy.want = uint(strategy.want - amount)
+    strategy.staked += amount
+    if max_weighted:
+        strategy.staked_max_weighted += amount
+    return amount
+
+
+def ybs_unstake(strategy, amount):
+    amount = amount >> 1 << 1
+    if amount > strategy.staked:
+        raise Revert("ybs: insufficient balance")
+    strategy.staked -= amount
+    strategy.staked_max_weighted = min(strategy.staked_max_weighted, strategy.staked)
+    strategy.want += amount
+    return amount
+
+
+@dataclass
+class StrategyState:
+    swap_min: int = 100 * 10**18
+    swap_max: int = 10_000 * 10**18
+    auto_adjust: bool = True
+    bypass_claim: bool = False
+    bypass_max_stake: bool = False
+    threshold_time_until_week_end: int = HOUR
+    min_report_delay: int = 22 * HOUR
+    credit_threshold: int = 1_000_000 * 10**18
+    force_harvest_trigger_once: bool = False
+    approved_weighted_staker: bool = True
+    max_price_impact: int = 0
+    max_claim_weeks: int = 8
+    # balances
+    want: int = 0
+    staked: int = 0
+    staked_max_weighted: int = 0
+    reward_shares: int = 0
+    reward_underlying: int = 0
+    last_lock_week: int = 0
+    to_max_stake: int = 0
+    # counters, not part of the contract state
+    locks: int = 0
+
+    def estimated_total_assets(self):
+        return uint(self.staked + self.want)
+
+
+@dataclass
+class VaultModel:
+    """Single strategy view of a 0.4.6 vault (no fees or per harvest limits)."""
+
+    idle: int = 0
+    total_debt: int = 0
+    debt_ratio: int = MAX_BPS
+    last_report: int = 0
+    emergency_shutdown: bool = False
+    total_gain: int = 0
+    total_loss: int = 0
+
+    def total_assets(self):
+        return self.idle + self.total_debt
+
+    def debt_outstanding(self):
+        if self.debt_ratio == 0:
+            return self.total_debt
+        debt_limit = self.debt_ratio * self.total_assets() // MAX_BPS
+        if self.emergency_shutdown:
+            return self.total_debt
+        if self.total_debt <= debt_limit:
+            return 0
+        return self.total_debt - debt_limit
+
+    def credit_available(self):
+        if self.emergency_shutdown:
+            return 0
+        debt_limit = self.debt_ratio * self.total_assets() // MAX_BPS
+        if debt_limit <= self.total_debt:
+            return 0
+        return min(self.idle, debt_limit - self.total_debt)
+
+    def report(self, strategy, now, gain, loss, debt_payment):
+        if strategy.want < gain + debt_payment:
+            raise Revert("vault: insufficient strategy balance")
+        if loss > 0:
+            if self.total_debt < loss:
+                raise Revert("vault: loss exceeds debt")
+            if self.debt_ratio != 0:
+                self.debt_ratio -= min(
+                    loss * self.debt_ratio // self.total_debt, self.debt_ratio
+                )
+            self.total_loss += loss
+            self.total_debt -= loss
+
+        self.total_gain += gain
+        credit = self.credit_available()
+        debt = self.debt_outstanding()
+        debt_payment = min(debt_payment, debt)
+        if debt_payment > 0:
+            self.total_debt -= debt_payment
+            debt -= debt_payment
+        if credit > 0:
+            self.total_debt += credit
+
+        total_available = gain + debt_payment
+        if total_available < credit:
+            self.idle -= credit - total_available
+            strategy.want += credit - total_available
+        elif total_available > credit:
+            self.idle += total_available - credit
+            strategy.want = uint(strategy.want - (total_available - credit))
+
+        self.last_report = now
+        if self.debt_ratio == 0 or self.emergency_shutdown:
+            return strategy.estimated_total_assets()
+        return debt
+
+
+class Environment:
+    """
+    External contracts the strategy talks to during a harvest.
+
+    `claim(now, max_weeks)` returns the reward vault shares paid out by the
+    distributor for at most `max_weeks` weeks (0 for all of them),
+    `redeem(shares)` the crvUSD received for them, `swap(amount)` the yCRV
+    bought by the swapper (0 for a deferred sale) and `swap_depth()` pool1's
+    crvUSD balance. Subclass or pass callables to plug in a market model or
+    live chain quotes.
+    """
+
+    def __init__(self, claimable=None, redeem=None, swap=None, swap_depth=None):
+        self._claimable = claimable or (lambda max_weeks: 0)
+        self._redeem = redeem or (lambda shares: shares)
+        self._swap = swap or (lambda amount: amount)
+        self._swap_depth = swap_depth or (lambda: 0)
+
+    def claimable(self, now, max_weeks=0):
+        return self._claimable(max_weeks)
+
+    def claim(self, now, max_weeks=0):
+        return self.claimable(now, max_weeks)
+
+    def redeem(self, shares):
+        return self._redeem(shares)
+
+    def swap(self, amount):
+        return self._swap(amount)
+
+    def swap_depth(self):
+        return self._swap_depth()
+
+
+def swap_size_for_price_impact(strategy, env):
+    impact = strategy.max_price_impact
+    if impact == 0:
+        return 0
+    return env.swap_depth() * impact // (MAX_BPS - impact)
+
+
+def claim_and_sell_rewards(strategy, env, now):
+    if not strategy.bypass_claim:
+        strategy.reward_shares += env.claim(now, strategy.max_claim_weeks)
+
+    st_min, st_max = strategy.swap_min, strategy.swap_max
+    reward_balance = strategy.reward_shares
+    if reward_balance > st_min:
+        output = env.redeem(reward_balance)
+        strategy.reward_shares = 0
+        strategy.reward_underlying += output
+
+        if strategy.auto_adjust:
+            st_max = uint112(uint(output * 101) // 700)
+            strategy.swap_max = st_max
+
+    to_swap = strategy.reward_underlying
+    if to_swap > st_min:
+        sized = swap_size_for_price_impact(strategy, env)
+        if sized < st_max and (sized == 0 or to_swap > st_max * 7):
+            sized = st_max
+        to_swap = min(to_swap, sized)
+        profit = env.swap(to_swap)
+        # a deferred sale pulls nothing
+        if profit > 0:
+            strategy.reward_underlying = uint(strategy.reward_underlying - to_swap)
+        strategy.want += profit
+        if (
+            profit > 1
+            and not strategy.bypass_max_stake
+            and strategy.approved_weighted_staker
+        ):
+            strategy.to_max_stake = profit
+
+
+def liquidate_position(strategy, amount_needed):
+    loose = strategy.want
+    loss = 0
+    if amount_needed > loose:
+        to_unstake = amount_needed - loose
+        if to_unstake > 1:
+            to_unstake = min(to_unstake + strategy.to_max_stake, strategy.staked)
+            loose += ybs_unstake(strategy, to_unstake)
+        liquidated = min(amount_needed, loose)
+        loss = amount_needed - liquidated
+    else:
+        liquidated = amount_needed
+    return liquidated, loss
+
+
+def _is_near_week_end(strategy, now):
+    week_end = (now // WEEK + 1) * WEEK
+    return week_end - now <= strategy.threshold_time_until_week_end, week_end
+
+
+def prepare_return(strategy, vault, env, debt_outstanding, now):
+    claim_and_sell_rewards(strategy, env, now)
+
+    total_assets = strategy.estimated_total_assets()
+    total_debt = vault.total_debt
+    profit = total_assets - total_debt if total_assets > total_debt else 0
+
+    amount_freed, loss = liquidate_position(strategy, uint(debt_outstanding + profit))
+    debt_payment = min(debt_outstanding, amount_freed)
+
+    week = now // WEEK
+    if _is_near_week_end(strategy, now)[0] and strategy.last_lock_week < week:
+        strategy.locks += 1
+        strategy.last_lock_week = week
+
+    if loss > profit:
+        loss, profit = loss - profit, 0
+    else:
+        profit, loss = profit - loss, 0
+    return profit, loss, debt_payment
+
+
+def adjust_position(strategy, debt_outstanding):
+    amount = strategy.want
+    max_stake = strategy.to_max_stake
+    if max_stake > 0:
+        strategy.to_max_stake = 0
+        if max_stake > amount and debt_outstanding == 0:
+            shortfall = min(max_stake - amount, strategy.staked)
+            if shortfall > 1:
+                amount += ybs_unstake(strategy, shortfall)
+        max_stake = min(max_stake, amount)
+        if max_stake > 1:
+            amount -= ybs_stake(strategy, max_stake, max_weighted=True)
+    if amount > 1:
+        ybs_stake(strategy, amount)
+
+
+def harvest(strategy, vault, env, now):
+    """BaseStrategy.harvest for the non emergency path, returns (profit, loss, debt_payment)."""
+    debt_outstanding = vault.debt_outstanding()
+    profit, loss, debt_payment = prepare_return(
+        strategy, vault, env, debt_outstanding, now
+    )
+    strategy.force_harvest_trigger_once = False
+    debt_outstanding = vault.report(strategy, now, profit, loss, debt_payment)
+    adjust_position(strategy, debt_outstanding)
+    return profit, loss, debt_payment
+
+
+class TriggerReason(IntEnum):
+    # same order as Strategy.TriggerReason
+    NONE = 0
+    WEEK_END = 1
+    FORCED = 2
+    REPORT_DELAY = 3
+    CREDIT = 4
+    CLAIMABLE = 5
+
+
+def harvest_trigger_reason(strategy, vault, env, now, base_fee_acceptable=True):
+    is_near_end, week_end = _is_near_week_end(strategy, now)
+    if is_near_end:
+        is_last_report_recent = (
+            week_end - vault.last_report <= strategy.threshold_time_until_week_end
+        )
+        if not is_last_report_recent and vault.credit_available() > 0:
+            return TriggerReason.WEEK_END
+
+    if not base_fee_acceptable:
+        return TriggerReason.NONE
+
+    if strategy.force_harvest_trigger_once:
+        return TriggerReason.FORCED
+
+    if uint(now - vault.last_report) > strategy.min_report_delay:
+        return TriggerReason.REPORT_DELAY
+
+    if vault.credit_available() > strategy.credit_threshold:
+        return TriggerReason.CREDIT
+
+    if env.claimable(now, strategy.max_claim_weeks) > 0:
+        return TriggerReason.CLAIMABLE
+
+    return TriggerReason.NONE
+
+
+def harvest_trigger(strategy, vault, env, now, base_fee_acceptable=True):
+    reason = harvest_trigger_reason(strategy, vault, env, now, base_fee_acceptable)
+    return reason != TriggerReason.NONE
+
+
+class WeeklyRewards(Environment):
+    """
+    Synthetic market: the distributor pays `weekly[i]` reward shares for week
+    `start_week + i` once that week is over, shares redeem at `pps` and the
+    swap returns `price` yCRV per crvUSD, scaled down by a constant product
+    style impact term when `depth` is set.
+    """
+
+    def __init__(self, weekly, start_week, pps=10**18, price=10**18, depth=0):
+        super().__init__()
+        self.weekly = weekly
+        self.start_week = start_week
+        self.claim_week = start_week
+        self.pps = pps
+        self.price = price
+        self.depth = depth
+        self.sold = 0
+        self.bought = 0
+
+    def _claim_end(self, now, max_weeks):
+        # first week not claimed, like the distributor's lastClaimWeek
+        end = now // WEEK
+        if max_weeks:
+            end = min(end, self.claim_week + max_weeks)
+        return end
+
+    def claimable(self, now, max_weeks=0):
+        start = self.claim_week
+        end = min(self._claim_end(now, max_weeks), self.start_week + len(self.weekly))
+        if end <= start:
+            return 0
+        return sum(self.weekly[start - self.start_week : end - self.start_week])
+
+    def claim(self, now, max_weeks=0):
+        amount = self.claimable(now, max_weeks)
+        self.claim_week = max(self.claim_week, self._claim_end(now, max_weeks))
+        return amount
+
+    def redeem(self, shares):
+        return shares * self.pps // 10**18
+
+    def swap_depth(self):
+        return self.depth
+
+    def swap(self, amount):
+        out = amount * self.price // 10**18
+        if self.depth:
+            out = out * self.depth // (self.depth + amount)
+        self.sold += amount
+        self.bought += out
+        return out
+
+
+@dataclass(frozen=True)
+class Params:
+    swap_min: int = 100 * 10**18
+    swap_max: int = 10_000 * 10**18
+    auto_adjust: bool = True
+    min_report_delay: int = 22 * HOUR
+    threshold_time_until_week_end: int = HOUR
+    max_price_impact: int = 0
+
+
+@dataclass
+class Result:
+    params: Params
+    harvests: int = 0
+    locks: int = 0
+    sold: int = 0
+    bought: int = 0
+    unsold: int = 0
+    profit: int = 0
+    loss: int = 0
+    harvest_times: list = field(default_factory=list, repr=False)
+
+    @property
+    def price(self):
+        return self.bought / self.sold if self.sold else 0
+
+
+def _next_check(strategy, vault, now):
+    # the trigger can only flip at a report delay expiry, a new claimable week
+    # or the start of the week end window, so only look there
+    week_end = (now // WEEK + 1) * WEEK
+    candidates = [
+        vault.last_report + strategy.min_report_delay + 1,
+        week_end,
+        week_end - strategy.threshold_time_until_week_end,
+    ]
+    return min(t for t in candidates if t > now)
+
+
+def run(
+    params,
+    weekly,
+    start=None,
+    deposit=1_000_000 * 10**18,
+    pps=10**18,
+    price=10**18,
+    depth=0,
+    keeper_delay=0,
+):
+    """Simulate a keeper harvesting whenever `harvestTrigger` fires over `len(weekly)` weeks."""
+    if start is None:
+        start = WEEK * 2_800
+    start_week = start // WEEK
+    strategy = StrategyState(
+        swap_min=params.swap_min,
+        swap_max=params.swap_max,
+        auto_adjust=params.auto_adjust,
+        min_report_delay=params.min_report_delay,
+        threshold_time_until_week_end=params.threshold_time_until_week_end,
+        max_price_impact=params.max_price_impact,
+    )
+    vault = VaultModel(idle=deposit, last_report=start)
+    env = WeeklyRewards(weekly, start_week, pps=pps, price=price, depth=depth)
+    result = Result(params)
+
+    end = (start_week + len(weekly) + 1) * WEEK
+    now = start
+    harvest(strategy, vault, env, now)
+    while True:
+        now = _next_check(strategy, vault, now)
+        if now >= end:
+            break
+        if harvest_trigger(strategy, vault, env, now):
+            profit, loss, _ = harvest(strategy, vault, env, now + keeper_delay)
+            result.harvests += 1
+            result.profit += profit
+            result.loss += loss
+            result.harvest_times.append(now + keeper_delay)
+            now += keeper_delay
+
+    result.locks = strategy.locks
+    result.sold = env.sold
+    result.bought = env.bought
+    result.unsold = strategy.reward_underlying + strategy.reward_shares
+    return result
+
+
+def _run(args):
+    params, kwargs = args
+    return run(params, **kwargs)
+
+
+def sweep(grid, processes=None, **kwargs):
+    """
+    Run every combination of `grid`, a mapping of `Params` field -> values.
+    Combinations are spread over `processes` worker processes.
+    """
+    keys = list(grid)
+    combos = [
+        replace(Params(), **dict(zip(keys, values)))
+        for values in itertools.product(*(grid[k] for k in keys))
+    ]
+    jobs = [(params, kwargs) for params in combos]
+    if processes == 1:
+        return [_run(job) for job in jobs]
+    with Pool(processes) as pool:
+        return pool.map(_run, jobs, chunksize=max(1, len(jobs) // 64))
+
+
+def main():
+    weekly = [50_000 * 10**18] * 52
+    grid = {
+        "swap_min": [100 * 10**18, 1_000 * 10**18],
+        "swap_max": [5_000 * 10**18, 10_000 * 10**18, 60_000 * 10**18],
+        "auto_adjust": [True, False],
+        "min_report_delay": [h * HOUR for h in (6, 12, 22, 46)],
+        "threshold_time_until_week_end": [HOUR, 6 * HOUR],
+        "max_price_impact": [0, 50],
+    }
+    results = sweep(grid, weekly=weekly, depth=2_000_000 * 10**18)
+    results.sort(key=lambda r: (-r.bought, r.harvests))
+    print(f"{len(results)} scenarios over {len(weekly)} weeks, best first:")
+    for r in results[:10]:
+        p = r.params
+        print(
+            f"min {p.swap_min / 1e18:>8,.0f} max {p.swap_max / 1e18:>8,.0f} "
+            f"auto {p.auto_adjust!s:5} delay {p.min_report_delay // HOUR:>2}h "
+            f"window {p.threshold_time_until_week_end // HOUR}h "
+            f"impact {p.max_price_impact:>2}bps | "
+            f"harvests {r.harvests:>4} bought {r.bought / 1e18:>12,.0f} "
+            f"yCRV/crvUSD {r.price:.4f} unsold {r.unsold / 1e18:,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
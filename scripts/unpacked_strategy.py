@@ -0,0 +1,41 @@
+"""
+Generates contracts/mocks/StrategyUnpacked.sol, Strategy with its config laid
+out as before it was packed: thresholdTimeUntilWeekEnd, maxPriceImpact,
+maxClaimWeeks and lastLockWeek back in a full slot each. The gas benchmarks
+run the same harvest on both to price the packing. Rerun after changing
+Strategy.sol, tests/test_storage_layout.py fails until then:
+
+    brownie run unpacked_strategy
+"""
+import re
+from pathlib import Path
+
+CONTRACTS = Path(__file__).resolve().parent.parent / "contracts"
+SOURCE = CONTRACTS / "Strategy.sol"
+TARGET = CONTRACTS / "mocks" / "StrategyUnpacked.sol"
+
+
+def unpacked(source):
+    source = source.replace('"./interfaces/', '"../interfaces/')
+    # brownie wants contract names unique, share Strategy.sol's interfaces
+    source = source.replace(
+        'IYearnBoostedStaker.sol";\n',
+        'IYearnBoostedStaker.sol";\n'
+        'import {IERC4626, ICurvePool, IStrategyProxy} from "../Strategy.sol";\n',
+    )
+    source = re.sub(r"interface \w+ \{\n.*?\n\}\n\n", "", source, flags=re.S)
+    source = source.replace(
+        "contract Strategy is BaseStrategy {",
+        "// Generated by scripts/unpacked_strategy.py for the gas benchmarks, edit\n"
+        "// Strategy.sol instead.\n"
+        "contract StrategyUnpacked is BaseStrategy {",
+    )
+    source = re.sub(
+        r"    // Config read on every harvest.*?\n.*?\n", "", source, count=1
+    )
+    return re.sub(r"uint(16|32) public (\w+);", r"uint public \2;", source)
+
+
+def main():
+    TARGET.write_text(unpacked(SOURCE.read_text()))
+    print(f"wrote {TARGET}")
@@ -0,0 +1,121 @@
+"""
+Memoized view calls for scripts and tests.
+
+    cache = ViewCache()
+    deployment = cache.call(registry.deployments, token)
+    decimals = cache.call(token.decimals)
+    cache.save()
+
+Results are kept as raw return data, keyed by (chain, address, selector + args,
+block hash) so a reorg or a `chain.revert` never serves stale state. Calls in
+`PERMANENT` can't change once a contract is deployed. They're keyed by the
+contract's code hash instead of a block, which also covers immutables baked
+into the bytecode. The address stays in the key, EIP-1167 clones all have the
+same proxy code but get entries of their own. Entries are evicted least recently used past `max_entries`,
+and the cache persists to $YBS_VIEW_CACHE between runs, except on local dev
+chains where the same addresses get different contracts every run.
+"""
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+from brownie import chain, web3
+from brownie.network.state import _revert_register
+
+DEFAULT_PATH = Path.home() / ".cache" / "ybs-view-cache.json"
+
+# immutables, and constants by design (token metadata, pool coins)
+PERMANENT = {
+    "MAX_STAKE_GROWTH_WEEKS",
+    "rewardToken",
+    "rewardTokenUnderlying",
+    "tokenIn",
+    "tokenOut",
+    "tokenOutPool1",
+    "pool1",
+    "pool2",
+    "YBS",
+    "REWARDS_DISTRIBUTOR",
+    "decimals",
+    "asset",
+    "coins",
+}
+
+# ganache and anvil without a fork
+DEV_CHAIN_IDS = {1337, 31337}
+
+
+class ViewCache:
+    def __init__(
+        self, path=None, max_entries=10_000, permanent=PERMANENT, persist=None
+    ):
+        self.path = Path(path or os.environ.get("YBS_VIEW_CACHE", DEFAULT_PATH))
+        self.max_entries = max_entries
+        self.permanent = set(permanent)
+        self.persist = chain.id not in DEV_CHAIN_IDS if persist is None else persist
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        # per address for the session, forgotten when the chain reverts since a
+        # redeploy can put different code at the same address
+        self._code_hashes = {}
+        _revert_register(self)
+        if self.path.exists():
+            self._entries.update(json.loads(self.path.read_text()))
+
+    def call(self, method, *args, block_identifier="latest"):
+        """`method(*args)` at `block_identifier`, from the cache when possible."""
+        address = method._address
+        data = method.encode_input(*args)
+        if method.abi["name"] in self.permanent:
+            scope = self._code_hash(address, block_identifier)
+        else:
+            scope = web3.eth.get_block(block_identifier)["hash"].hex()
+        key = f"{chain.id}:{address}:{data}:{scope}"
+
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        else:
+            self.misses += 1
+            returned = web3.eth.call({"to": address, "data": data}, block_identifier)
+            self._entries[key] = returned.hex()
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return method.decode_output(self._entries[key])
+
+    def _code_hash(self, address, block_identifier):
+        if address in self._code_hashes:
+            return self._code_hashes[address]
+        code = web3.eth.get_code(address, block_identifier)
+        code_hash = web3.keccak(code).hex()
+        # nothing deployed yet at that block, the address may get code later
+        if code:
+            self._code_hashes[address] = code_hash
+        return code_hash
+
+    # called by brownie on chain.revert / chain.undo and chain.reset
+    def _revert(self, height):
+        self._code_hashes.clear()
+
+    def _reset(self):
+        self._code_hashes.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._entries),
+        }
+
+    def save(self):
+        if not self.persist:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # one writer per process, e.g. xdist workers sharing the cache
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self._entries))
+        tmp.replace(self.path)
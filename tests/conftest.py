@@ -1,52 +1,224 @@
+import json
+from pathlib import Path
+
 import pytest
 import brownie
 from brownie import Contract, ZERO_ADDRESS, interface, config, chain
 
+from scripts.view_cache import ViewCache
 
-@pytest.fixture
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--local",
+        action="store_true",
+        help="run against local mock contracts instead of a mainnet fork "
+        "(use with --network development)",
+    )
+    parser.addoption(
+        "--gas-budget",
+        type=float,
+        default=2.0,
+        help="percent a benchmarked path may exceed tests/gas_baseline.json",
+    )
+    parser.addoption(
+        "--update-gas",
+        action="store_true",
+        help="rewrite tests/gas_baseline.json with the measured gas",
+    )
+    parser.addoption(
+        "--profile-harvests",
+        metavar="DIR",
+        default=None,
+        help="write a gas profile (JSON and speedscope) of every harvest to DIR",
+    )
+
+
+_setup_durations = []
+
+
+def pytest_runtest_logreport(report):
+    if report.when == "setup" and report.passed:
+        _setup_durations.append((report.duration, report.nodeid))
+
+
+_gas_report = {}
+_gas_measured = {}
+_execution_report = {}
+_view_cache_stats = {}
+
+GAS_BASELINE = Path(__file__).parent / "gas_baseline.json"
+
+
+# With `brownie test -n <workers>` every xdist worker launches its own chain on
+# its own port (forked or the mock stack), so impersonated whales and minted
+# balances are per worker. Workers ship their reports to the controller, which
+# prints the summary and is the only one writing the gas baseline.
+def _is_worker(config):
+    return hasattr(config, "workerinput")
+
+
+def pytest_sessionfinish(session):
+    if _is_worker(session.config):
+        session.config.workeroutput["ybs_reports"] = {
+            "gas": _gas_report,
+            "gas_measured": _gas_measured,
+            "execution": _execution_report,
+            "view_cache": _view_cache_stats,
+        }
+    elif _gas_measured:
+        _write_gas_baseline(session.config, _gas_measured)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    reports = getattr(node, "workeroutput", {}).get("ybs_reports")
+    if not reports:
+        return
+    _gas_report.update(reports["gas"])
+    _gas_measured.update(reports["gas_measured"])
+    for size, rates in reports["execution"].items():
+        _execution_report.setdefault(size, {}).update(rates)
+    if reports["view_cache"]:
+        for key in ("hits", "misses", "entries"):
+            _view_cache_stats[key] = (
+                _view_cache_stats.get(key, 0) + reports["view_cache"][key]
+            )
+        total = _view_cache_stats["hits"] + _view_cache_stats["misses"]
+        _view_cache_stats["hit_rate"] = (
+            _view_cache_stats["hits"] / total if total else 0.0
+        )
+
+
+def _write_gas_baseline(config, measured):
+    # only rewritten on request, a path without a baseline fails in `gas`
+    if not config.getoption("--update-gas"):
+        return
+    baseline = json.loads(GAS_BASELINE.read_text())
+    local = config.getoption("--local")
+    baseline.setdefault("local" if local else "fork", {}).update(measured)
+    GAS_BASELINE.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+
+
+# Per-test fixture setup cost; the slowest test is the one that built the
+# session fixtures. Also lists gas of benchmarked paths against the baseline
+# and the realized yCRV per crvUSD of each swapper by sale size, and how many
+# fixture view calls the view cache served.
+def pytest_terminal_summary(terminalreporter):
+    if _view_cache_stats:
+        terminalreporter.write_sep("-", "view cache")
+        terminalreporter.write_line(
+            "{hits} hits, {misses} misses ({hit_rate:.0%}), {entries} entries".format(
+                **_view_cache_stats
+            )
+        )
+    if _gas_report:
+        terminalreporter.write_sep("-", "gas")
+        for name, (used, expected) in sorted(_gas_report.items()):
+            delta = f"{(used - expected) / expected:+.2%}" if expected else "new"
+            terminalreporter.write_line(f"{name:<32} {used:>10,} {delta:>8}")
+    if _execution_report:
+        terminalreporter.write_sep("-", "execution (yCRV per crvUSD)")
+        for size, rates in sorted(_execution_report.items()):
+            line = "  ".join(f"{k} {v:.6f}" for k, v in sorted(rates.items()))
+            terminalreporter.write_line(f"{size / 1e18:>12,.0f}  {line}")
+    if not _setup_durations:
+        return
+    durations = sorted(_setup_durations)
+    total = sum(d for d, _ in durations)
+    median = durations[len(durations) // 2][0]
+    slowest, slowest_id = durations[-1]
+    terminalreporter.write_sep("-", "fixture setup")
+    terminalreporter.write_line(
+        f"{len(durations)} tests: {total:.2f}s total, {median:.3f}s median, "
+        f"slowest {slowest:.2f}s ({slowest_id})"
+    )
+
+
+@pytest.fixture(scope="session")
+def local(request):
+    yield request.config.getoption("--local")
+
+
+# Deploys the mock stack once per session when running with --local.
+@pytest.fixture(scope="session")
+def local_stack(local, accounts, pm):
+    if not local:
+        yield None
+        return
+    from scripts import local_stack
+
+    gov = accounts.at(local_stack.GOV, force=True)
+    yield local_stack.deploy(
+        accounts[0],
+        gov,
+        pm(config["dependencies"][0]).Vault,
+        rewards=accounts[1],
+        guardian=accounts[2],
+        management=accounts[3],
+    )
+
+
+# Memoized view calls for the fixtures, persisted between fork runs.
+@pytest.fixture(scope="session")
+def view_cache():
+    cache = ViewCache()
+    yield cache
+    cache.save()
+    _view_cache_stats.update(cache.stats())
+
+
+@pytest.fixture(scope="session")
 def gov(accounts):
     yield accounts.at("0xFEB4acf3df3cDEA7399794D0869ef76A6EfAff52", force=True)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def user(accounts):
     yield accounts[0]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def rewards(accounts):
     yield accounts[1]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def guardian(accounts):
     yield accounts[2]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def management(accounts):
     yield accounts[3]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def strategist(accounts):
     yield accounts[4]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def keeper(accounts):
     yield accounts[5]
 
 
-@pytest.fixture
-def token():
+@pytest.fixture(scope="session")
+def token(local_stack):
+    if local_stack:
+        yield local_stack.ycrv
+        return
     token_address = "0xFCc5c47bE19d06BF83eB04298b026F81069ff65b"  # this should be the address of the ERC-20 used by the strategy/vault (yCRV)
     yield Contract(token_address)
 
 
 @pytest.fixture
-def amount(accounts, token, user):
-    amount = 10_000 * 10 ** token.decimals()
+def amount(accounts, token, user, local, view_cache):
+    amount = 10_000 * 10 ** view_cache.call(token.decimals)
+    if local:
+        token.mint(user, amount, {"from": user})
+        yield amount
+        return
     # In order to get some funds for the token you are about to use,
     # it impersonate an exchange address to use it's funds.
     reserve = accounts.at("0x99f5aCc8EC2Da2BC0771c32814EFF52b712de1E5", force=True)
@@ -54,26 +226,96 @@ def amount(accounts, token, user):
     yield amount
 
 
-@pytest.fixture
-def weth():
+@pytest.fixture(scope="session")
+def weth(local_stack):
+    if local_stack:
+        yield local_stack.weth
+        return
     token_address = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
     yield Contract(token_address)
 
 
 @pytest.fixture
-def weth_amount(user, weth):
-    weth_amount = 10 ** weth.decimals()
-    user.transfer(weth, weth_amount)
+def weth_amount(user, weth, local, view_cache):
+    weth_amount = 10 ** view_cache.call(weth.decimals)
+    if local:
+        weth.mint(user, weth_amount, {"from": user})
+    else:
+        user.transfer(weth, weth_amount)
     yield weth_amount
 
 
-@pytest.fixture
-def reward_token():
+@pytest.fixture(scope="session")
+def reward_token(local_stack):
+    if local_stack:
+        yield local_stack.reward_token
+        return
     yield Contract("0xBF319dDC2Edc1Eb6FDf9910E39b37Be221C8805F")  # crvUSD v3 vault
 
 
+@pytest.fixture(scope="session")
+def crvusd(local_stack, reward_token, view_cache):
+    if local_stack:
+        yield local_stack.crvusd
+        return
+    yield Contract(view_cache.call(reward_token.asset))
+
+
+@pytest.fixture(scope="session")
+def crv(local_stack):
+    if local_stack:
+        yield local_stack.crv
+        return
+    yield Contract("0xD533a949740bb3306d119CC777fa900bA034cd52")
+
+
+@pytest.fixture(scope="session")
+def tricrv_pool(local_stack):
+    if local_stack:
+        yield local_stack.pool1
+        return
+    yield Contract("0x4eBdF703948ddCEA3B11f675B4D1Fba9d2414A14")
+
+
+# alternative crvUSD -> CRV pool for splitting swappers, local only for now
+@pytest.fixture(scope="session")
+def alt_pool(local_stack):
+    yield local_stack.alt_pool if local_stack else None
+
+
+@pytest.fixture(scope="session")
+def ycrv_pool(local_stack):
+    if local_stack:
+        yield local_stack.pool2
+        return
+    yield Contract("0x99f5aCc8EC2Da2BC0771c32814EFF52b712de1E5")
+
+
 @pytest.fixture
-def vault(pm, gov, rewards, guardian, management, token):
+def ycrv_whale(accounts, token, local):
+    if local:
+        whale = accounts[8]
+        token.mint(whale, 1_000_000e18, {"from": whale})
+        yield whale
+        return
+    yield accounts.at(
+        "0x71E47a4429d35827e0312AA13162197C23287546", force=True
+    )  # threshold multisig
+
+
+@pytest.fixture(scope="session")
+def proxy(local_stack):
+    if local_stack:
+        yield local_stack.proxy
+        return
+    yield Contract("0x78eDcb307AC1d1F8F5Fd070B377A6e69C8dcFC34")
+
+
+@pytest.fixture(scope="session")
+def vault(pm, gov, rewards, guardian, management, token, local_stack):
+    if local_stack:
+        yield local_stack.vault
+        return
     vault = Contract("0x27B5739e22ad9033bcBf192059122d163b60349D")
     # for i in range(0,20):
     #     s = vault.withdrawalQueue(i)
@@ -85,64 +327,132 @@ def vault(pm, gov, rewards, guardian, management, token):
     yield vault
 
 
-@pytest.fixture
-def registry(gov, reward_token, token):
+@pytest.fixture(scope="session")
+def registry(gov, reward_token, token, local, view_cache):
+    if local:
+        yield None
+        return
     registry = Contract("0x262be1d31d0754399d8d5dc63B99c22146E9f738")
-    deployment = registry.deployments(token)
+    deployment = view_cache.call(registry.deployments, token)
     if deployment["yearnBoostedStaker"] == ZERO_ADDRESS:
         tx = registry.createNewDeployment(token, 4, 0, reward_token, {"from": gov})
     yield registry
 
 
-@pytest.fixture
-def ybs(registry, interface, token):
-    deployment = registry.deployments(token)
+@pytest.fixture(scope="session")
+def ybs(registry, interface, token, local_stack, view_cache):
+    if local_stack:
+        yield local_stack.ybs
+        return
+    deployment = view_cache.call(registry.deployments, token)
     ybs = interface.IYearnBoostedStaker(deployment["yearnBoostedStaker"])
     yield ybs
 
 
-@pytest.fixture
-def reward_distributor(registry, interface, token):
-    deployment = registry.deployments(token)
+@pytest.fixture(scope="session")
+def reward_distributor(registry, interface, token, local_stack, view_cache):
+    if local_stack:
+        yield local_stack.reward_distributor
+        return
+    deployment = view_cache.call(registry.deployments, token)
     reward_distributor = interface.IRewardDistributor(deployment["rewardDistributor"])
     yield reward_distributor
 
 
-@pytest.fixture
-def utils(registry, interface, token):
-    deployment = registry.deployments(token)
+@pytest.fixture(scope="session")
+def utils(registry, interface, token, local_stack, view_cache):
+    if local_stack:
+        yield local_stack.utils
+        return
+    deployment = view_cache.call(registry.deployments, token)
     utils = interface.IYBSUtilities(deployment["utilities"])
     yield utils
 
 
-@pytest.fixture
-def swapper(gov, reward_token, token, ybs, Swapper):
-    token_in = "0xf939E0A03FB07F59A73314E73794Be0E57ac1b4E"  # crvUSD
+@pytest.fixture(scope="session")
+def swapper(gov, token, crvusd, crv, tricrv_pool, ycrv_pool, Swapper):
+    token_in = crvusd
     token_out = token
-    token_out_pool1 = "0xD533a949740bb3306d119CC777fa900bA034cd52"
-    pool1 = "0x4eBdF703948ddCEA3B11f675B4D1Fba9d2414A14"
-    pool2 = "0x99f5acc8ec2da2bc0771c32814eff52b712de1e5"
+    token_out_pool1 = crv
+    pool1 = tricrv_pool
+    pool2 = ycrv_pool
     swapper = gov.deploy(Swapper, token_in, token_out, pool1, token_out_pool1, pool2)
     yield swapper
 
 
-@pytest.fixture
-def swapper_v2(gov, reward_token, token, ybs, SwapperV2):
-    token_in = "0xf939E0A03FB07F59A73314E73794Be0E57ac1b4E"  # crvUSD
+@pytest.fixture(scope="session")
+def swapper_v2(gov, token, crvusd, crv, tricrv_pool, SwapperV2):
+    token_in = crvusd
     token_out = token
-    token_out_pool1 = "0xD533a949740bb3306d119CC777fa900bA034cd52"
-    pool1 = "0x4eBdF703948ddCEA3B11f675B4D1Fba9d2414A14"
+    token_out_pool1 = crv
+    pool1 = tricrv_pool
     swapper = gov.deploy(SwapperV2, token_in, token_out, pool1, token_out_pool1)
     yield swapper
 
 
-@pytest.fixture
-def old_strategy(vault):
+@pytest.fixture(scope="session")
+def swapper_v3(gov, token, crvusd, crv, tricrv_pool, ycrv_pool, SwapperV3):
+    token_in = crvusd
+    token_out = token
+    token_out_pool1 = crv
+    pool1 = tricrv_pool
+    pool2 = ycrv_pool
+    swapper = gov.deploy(SwapperV3, token_in, token_out, pool1, token_out_pool1, pool2)
+    yield swapper
+
+
+@pytest.fixture(scope="session")
+def swapper_v4(gov, token, crvusd, crv, tricrv_pool, ycrv_pool, alt_pool, SwapperV4):
+    token_in = crvusd
+    token_out = token
+    token_out_pool1 = crv
+    pool1 = tricrv_pool
+    pool2 = ycrv_pool
+    swapper = gov.deploy(SwapperV4, token_in, token_out, pool1, token_out_pool1, pool2)
+    if alt_pool:
+        swapper.setAltPool(alt_pool, {"from": gov})
+    yield swapper
+
+
+@pytest.fixture(scope="session")
+def swapper_v5(gov, token, crvusd, crv, tricrv_pool, SwapperV5):
+    token_in = crvusd
+    token_out = token
+    token_out_pool1 = crv
+    pool1 = tricrv_pool
+    swapper = gov.deploy(SwapperV5, token_in, token_out, pool1, token_out_pool1)
+    yield swapper
+
+
+@pytest.fixture(scope="session")
+def old_strategy(
+    vault,
+    local_stack,
+    strategist,
+    gov,
+    accounts,
+    Strategy,
+    ybs,
+    reward_distributor,
+    swapper_v2,
+):
+    if local_stack:
+        # stand in for the live strategy we migrate from
+        from scripts.local_stack import seed_strategy
+
+        old_strategy = strategist.deploy(
+            Strategy, vault, ybs, reward_distributor, swapper_v2
+        )
+        seed_strategy(local_stack, old_strategy, gov, accounts[9])
+        yield old_strategy
+        return
     old_strategy = Contract(vault.withdrawalQueue(0))
     yield old_strategy
 
 
-@pytest.fixture
+# Built once per session: deploy, migrate from the old strategy and set up the
+# max weighted stake. Tests start from a snapshot taken after this.
+@pytest.fixture(scope="session")
 def strategy(
     strategist,
     keeper,
@@ -151,10 +461,10 @@ def strategy(
     gov,
     ybs,
     reward_distributor,
-    swapper,
     old_strategy,
     token,
-    registry,
+    utils,
+    proxy,
     swapper_v2,
 ):
     # deploy!
@@ -162,7 +472,6 @@ def strategy(
     strategy.setKeeper(keeper)
 
     # check and print starting boost of strategy
-    utils = Contract(registry.deployments(token)["utilities"])
     print(
         "Current active boost:", utils.getUserActiveBoostMultiplier(old_strategy) / 1e18
     )
@@ -179,7 +488,6 @@ def strategy(
     ybs.setWeightedStaker(strategy, True, {"from": gov})
 
     # approve new strategy as a locker on proxy
-    proxy = Contract("0x78eDcb307AC1d1F8F5Fd070B377A6e69C8dcFC34")
     proxy.approveLocker(strategy, True, {"from": gov})
 
     # do the manual boost setup, 95% max boosted
@@ -206,20 +514,90 @@ def RELATIVE_APPROX():
 
 
 # Function scoped isolation fixture to enable xdist.
-# Snapshots the chain before each test and reverts after test completion.
+# Session fixtures (the mock stack and the fully wired strategy) are built once,
+# each test snapshots the chain after them and reverts on completion.
 @pytest.fixture(scope="function", autouse=True)
-def shared_setup(fn_isolation):
-    pass
+def shared_setup(chain):
+    chain.snapshot()
+    yield
+    chain.revert()
+
+
+# Profiles the harvests a test sent with --profile-harvests, before
+# shared_setup reverts them.
+@pytest.fixture(autouse=True)
+def profile_harvests(request, shared_setup):
+    out_dir = request.config.getoption("--profile-harvests")
+    start = len(brownie.history)
+    yield
+    if out_dir is None:
+        return
+    from scripts import gas_profile
+
+    labels = {}
+    for name, value in request.node.funcargs.items():
+        contracts = vars(value) if name == "local_stack" and value else {name: value}
+        labels.update(gas_profile.labels_of(**contracts))
+    harvests = [tx for tx in brownie.history[start:] if tx.fn_name == "harvest"]
+    for i, tx in enumerate(harvests):
+        result = gas_profile.profile(tx, labels)
+        gas_profile.write(result, out_dir, f"{request.node.name}-{i}")
+
+
+# Written back at the end of the session, see _write_gas_baseline.
+@pytest.fixture(scope="session")
+def gas_baseline(local):
+    baseline = json.loads(GAS_BASELINE.read_text())
+    yield baseline.get("local" if local else "fork", {}), _gas_measured
 
 
+# Records the gas of a benchmarked path and fails if it exceeds the baseline
+# by more than --gas-budget percent, or has no baseline unless --update-gas is
+# given. Takes a transaction or a gas amount.
 @pytest.fixture
-def crvusd_whale(accounts, token, user, reward_token):
+def gas(request, gas_baseline):
+    section, measured = gas_baseline
+    budget = request.config.getoption("--gas-budget")
+    update = request.config.getoption("--update-gas")
+
+    def gas(name, tx):
+        used = getattr(tx, "gas_used", tx)
+        expected = section.get(name)
+        measured[name] = used
+        _gas_report[name] = (used, expected)
+        if update:
+            return used
+        if expected is None:
+            pytest.fail(f"{name} has no gas baseline, record it with --update-gas")
+        assert used <= expected * (
+            1 + budget / 100
+        ), f"{name} used {used:,} gas, baseline {expected:,} (budget {budget}%)"
+        return used
+
+    yield gas
+
+
+# Records realized yCRV per crvUSD of a swapper at a sale size for the summary.
+@pytest.fixture
+def execution():
+    def execution(name, amount_in, amount_out):
+        rate = amount_out / amount_in
+        _execution_report.setdefault(amount_in, {})[name] = rate
+        return rate
+
+    yield execution
+
+
+@pytest.fixture
+def crvusd_whale(accounts, token, user, reward_token, crvusd, local):
     # In order to get some funds for the token you are about to use,
     # it impersonate an exchange address to use it's funds.
     amount = 100_000e18
-    crvusd = Contract(reward_token.asset())
-    reserve = accounts.at("0xA920De414eA4Ab66b97dA1bFE9e6EcA7d4219635", force=True)
-    crvusd.transfer(user, amount, {"from": reserve})
+    if local:
+        crvusd.mint(user, amount, {"from": user})
+    else:
+        reserve = accounts.at("0xA920De414eA4Ab66b97dA1bFE9e6EcA7d4219635", force=True)
+        crvusd.transfer(user, amount, {"from": reserve})
     crvusd.approve(reward_token, 2**256 - 1, {"from": user})
     reward_token.deposit(amount, user, {"from": user})
     yield amount
@@ -227,7 +605,6 @@ def crvusd_whale(accounts, token, user, reward_token):
 
 @pytest.fixture(scope="function")
 def deposit_rewards(user, reward_token, token, reward_distributor, crvusd_whale):
-
     def deposit_rewards(user=user, reward_distributor=reward_distributor, token=token):
         reward_token.approve(reward_distributor, 2**256 - 1, {"from": user})
 
@@ -0,0 +1,78 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from scripts.analytics import History  # noqa: E402
+
+WEEK = 60 * 60 * 24 * 7
+
+
+@pytest.fixture(autouse=True)
+def local_only(local):
+    if not local:
+        pytest.skip("analytics tests run against the local mock stack")
+
+
+@pytest.fixture
+def staked(chain, strategy, vault, token, user, amount, gov, deposit_rewards):
+    token.approve(vault, amount, {"from": user})
+    vault.deposit(amount, {"from": user})
+    strategy.harvest({"from": gov})
+    for _ in range(3):
+        deposit_rewards()
+        chain.sleep(WEEK)
+        chain.mine()
+
+
+def test_history_matches_chain(
+    strategy, ybs, utils, reward_distributor, staked, tmp_path
+):
+    history = History(utils, cache_dir=tmp_path)
+    week = utils.getWeek()
+    assert history.update([strategy]) == 2 * week
+
+    report = history.report(strategy)
+    assert len(report["week"]) == week
+    assert report["boost"][week - 1] == pytest.approx(
+        utils.getUserActiveBoostMultiplier(strategy) / 1e18
+    )
+    for w in range(week):
+        # cached as integers, exact to the wei
+        assert report["stake"][w] == utils.getAccountStakeAmountAt(strategy, w)
+        assert report["max_stake"][w] == ybs.accountWeeklyMaxStake(strategy, w)
+        assert report["rewards"][w] == pytest.approx(
+            reward_distributor.getClaimableAt(strategy, w), abs=1e3
+        )
+
+
+def test_history_fetches_only_new_weeks(chain, strategy, utils, staked, tmp_path):
+    History(utils, cache_dir=tmp_path).update([strategy])
+
+    chain.sleep(WEEK)
+    chain.mine()
+
+    # a fresh instance picks up the cache from disk
+    history = History(utils, cache_dir=tmp_path)
+    assert history.update([strategy]) == 2
+    assert history.update([strategy]) == 0
+    assert len(history.report(strategy)["week"]) == utils.getWeek()
+
+
+def test_history_refetches_pushable_rewards(
+    chain, utils, reward_distributor, gov, deposit_rewards, tmp_path
+):
+    # the strategy's stake from setup has no weight until next week
+    deposit_rewards()
+    chain.sleep(WEEK)
+    chain.mine()
+    history = History(utils, cache_dir=tmp_path)
+    history.update()
+    week = utils.getWeek() - 1
+    # moves the cached week's rewards to this one if it had no weight
+    reward_distributor.pushRewards(week, {"from": gov})
+
+    history = History(utils, cache_dir=tmp_path)
+    assert history.update() == 0
+    assert list(history.columns["global:rewards"]) == [
+        reward_distributor.weeklyRewardAmount(w) for w in range(week + 1)
+    ]
@@ -0,0 +1,115 @@
+import brownie
+from brownie import chain
+
+WEEK = 60 * 60 * 24 * 7
+
+
+def new_strategy(factory, strategy, vault, keeper, sender):
+    return factory.newStrategy(
+        vault,
+        strategy.swapper(),
+        keeper,
+        (1_000 * 10**18, 60_000 * 10**18, False),
+        20_000 * 10**18,
+        {"from": sender},
+    )
+
+
+def test_factory_clone_is_configured(
+    strategy,
+    vault,
+    ybs,
+    reward_distributor,
+    keeper,
+    strategist,
+    gov,
+    Strategy,
+    StrategyFactory,
+):
+    factory = gov.deploy(StrategyFactory, strategy)
+    tx = new_strategy(factory, strategy, vault, keeper, strategist)
+    clone = Strategy.at(tx.events["NewStrategy"]["strategy"])
+
+    assert tx.events["NewStrategy"]["vault"] == vault
+    assert tx.events["NewStrategy"]["ybs"] == ybs == factory.ybs()
+    assert clone.address != strategy.address
+    assert clone.vault() == vault and clone.want() == strategy.want()
+    assert clone.strategist() == strategist and clone.keeper() == keeper
+    assert clone.ybs() == ybs and clone.rewardDistributor() == reward_distributor
+    assert clone.rewardToken() == strategy.rewardToken()
+    assert clone.rewardTokenUnderlying() == strategy.rewardTokenUnderlying()
+    assert clone.swapper() == strategy.swapper()
+    assert clone.swapThresholds() == (1_000 * 10**18, 60_000 * 10**18, False)
+    assert clone.creditThreshold() == 20_000 * 10**18
+    # constructor defaults hold for clones too
+    assert clone.thresholdTimeUntilWeekEnd() == 60 * 60
+    assert clone.maxClaimWeeks() == 8
+    assert clone.minReportDelay() == 22 * 60 * 60
+
+    args = (vault, strategist, keeper, strategy.swapper())
+    with brownie.reverts("Strategy already initialized"):
+        clone.initialize(*args, (1, 2, False), 0, {"from": strategist})
+    with brownie.reverts("Strategy already initialized"):
+        strategy.initialize(*args, (1, 2, False), 0, {"from": strategist})
+
+
+def test_factory_clone_harvests(
+    strategy,
+    vault,
+    ybs,
+    proxy,
+    keeper,
+    strategist,
+    gov,
+    Strategy,
+    StrategyFactory,
+):
+    factory = gov.deploy(StrategyFactory, strategy)
+    tx = new_strategy(factory, strategy, vault, keeper, strategist)
+    clone = Strategy.at(tx.events["NewStrategy"]["strategy"])
+    proxy.approveLocker(clone, True, {"from": gov})
+    total = strategy.estimatedTotalAssets()
+    vault.migrateStrategy(strategy, clone, {"from": gov})
+    # ybs moves even amounts
+    assert clone.estimatedTotalAssets() >= total - 1
+
+    # mid week, nothing to lock or claim yet
+    chain.mine(timestamp=(chain.time() // WEEK + 1) * WEEK + 60 * 60 * 24)
+    tx = clone.harvest({"from": keeper})
+    assert tx.events["Harvested"]["loss"] == 0
+    assert clone.balanceOfWant() <= 1
+    assert ybs.balanceOf(clone) >= total - 2
+
+
+def test_gas_factory_clone_vs_full_deploy(
+    strategy,
+    vault,
+    ybs,
+    reward_distributor,
+    keeper,
+    strategist,
+    gov,
+    gas,
+    Strategy,
+    StrategyFactory,
+):
+    factory = gov.deploy(StrategyFactory, strategy)
+    clone_tx = new_strategy(factory, strategy, vault, keeper, strategist)
+
+    # what scripts/deploy.py sent before the factory
+    full = strategist.deploy(
+        Strategy, vault, ybs, reward_distributor, strategy.swapper()
+    )
+    txs = [
+        full.tx,
+        full.setKeeper(keeper, {"from": strategist}),
+        full.setSwapThresholds(
+            1_000 * 10**18, 60_000 * 10**18, False, {"from": gov}
+        ),
+        full.setCreditThreshold(20_000 * 10**18, {"from": gov}),
+    ]
+    full_gas = sum(tx.gas_used for tx in txs)
+
+    gas("deploy_full_strategy", full_gas)
+    gas("deploy_clone_strategy", clone_tx)
+    assert clone_tx.gas_used * 3 < full_gas
@@ -0,0 +1,330 @@
+# Gas benchmarks for the harvest, swap and migration paths. Each path is checked
+# against tests/gas_baseline.json, see --gas-budget and --update-gas.
+
+import pytest
+
+WEEK = 60 * 60 * 24 * 7
+DAY = 60 * 60 * 24
+
+
+def avoid_week_end(chain, strategy):
+    # keep the lock branch out of paths that don't benchmark it
+    week_end = (chain.time() // WEEK + 1) * WEEK
+    if week_end - chain.time() <= strategy.thresholdTimeUntilWeekEnd() + 600:
+        chain.sleep(week_end - chain.time() + 600)
+        chain.mine()
+
+
+def sleep_to_week_end(chain, strategy):
+    week_end = (chain.time() // WEEK + 1) * WEEK
+    chain.sleep(week_end - chain.time() - strategy.thresholdTimeUntilWeekEnd() + 60)
+    chain.mine()
+
+
+def accrue_rewards(chain, gov, reward_distributor, utils, deposit_rewards):
+    deposit_rewards()
+    chain.sleep(WEEK)
+    chain.mine()
+    if utils.getGlobalActiveBoostMultiplier() == 0:
+        reward_distributor.pushRewards(utils.getWeek() - 1, {"from": gov})
+        chain.sleep(WEEK)
+        chain.mine()
+
+
+@pytest.fixture
+def deposited(strategy, vault, token, user, amount, gov):
+    token.approve(vault, amount, {"from": user})
+    vault.deposit(amount, {"from": user})
+    strategy.harvest({"from": gov})
+
+
+def test_gas_harvest_deposit(chain, strategy, vault, token, user, amount, gov, gas):
+    token.approve(vault, amount, {"from": user})
+    vault.deposit(amount, {"from": user})
+    avoid_week_end(chain, strategy)
+    gas("harvest_deposit", strategy.harvest({"from": gov}))
+
+
+def test_gas_harvest_idle(chain, strategy, gov, deposited, gas):
+    chain.sleep(DAY)
+    avoid_week_end(chain, strategy)
+    gas("harvest_idle", strategy.harvest({"from": gov}))
+
+
+def test_gas_harvest_week_end_lock(chain, strategy, gov, deposited, gas):
+    sleep_to_week_end(chain, strategy)
+    gas("harvest_week_end_lock", strategy.harvest({"from": gov}))
+
+
+def test_gas_harvest_week_end_locked(chain, strategy, gov, deposited, gas):
+    # a second harvest in the window skips the proxy
+    sleep_to_week_end(chain, strategy)
+    strategy.harvest({"from": gov})
+    assert not strategy.isLockPending()
+    chain.sleep(60)
+    gas("harvest_week_end_locked", strategy.harvest({"from": gov}))
+
+
+@pytest.mark.parametrize("route", ["zap", "pool2", "router", "direct"])
+def test_gas_harvest_rewards(
+    chain,
+    strategy,
+    gov,
+    reward_distributor,
+    utils,
+    deposit_rewards,
+    deposited,
+    swapper,
+    swapper_v3,
+    swapper_v5,
+    route,
+    gas,
+):
+    if route == "pool2":
+        strategy.upgradeSwapper(swapper, {"from": gov})
+    elif route == "router":
+        strategy.upgradeSwapper(swapper_v3, {"from": gov})
+    elif route == "direct":
+        strategy.upgradeSwapper(swapper_v5, {"from": gov})
+    accrue_rewards(chain, gov, reward_distributor, utils, deposit_rewards)
+    assert reward_distributor.getClaimable(strategy) > 0
+
+    # claim, redeem, swap and stake as max weighted
+    avoid_week_end(chain, strategy)
+    gas(f"harvest_claim_swap_{route}", strategy.harvest({"from": gov}))
+
+    # sell the next chunk of what was redeemed, nothing to claim
+    chain.sleep(DAY)
+    avoid_week_end(chain, strategy)
+    gas(f"harvest_swap_{route}", strategy.harvest({"from": gov}))
+
+
+@pytest.mark.parametrize("case", ["profit_only", "debt_increase", "debt_decrease"])
+def test_gas_harvest_netting(
+    chain,
+    strategy,
+    vault,
+    token,
+    user,
+    amount,
+    gov,
+    ybs,
+    reward_distributor,
+    utils,
+    deposit_rewards,
+    deposited,
+    case,
+    gas,
+):
+    accrue_rewards(chain, gov, reward_distributor, utils, deposit_rewards)
+    if case == "debt_increase":
+        token.approve(vault, amount, {"from": user})
+        vault.deposit(amount, {"from": user})
+    elif case == "debt_decrease":
+        vault.updateStrategyDebtRatio(strategy, 5_000, {"from": gov})
+    avoid_week_end(chain, strategy)
+    max_weighted = ybs.accountWeeklyMaxStake(strategy, ybs.getWeek())
+    tx = strategy.harvest({"from": gov})
+    profit = tx.events["Harvested"]["profit"]
+    assert profit > 0
+
+    # at most one staker call per direction and kind
+    stakes = tx.events["Stake"] if "Stake" in tx.events else []
+    unstakes = tx.events["Unstake"] if "Unstake" in tx.events else []
+    assert len(unstakes) <= 1
+    assert len(stakes) <= 2
+    if case != "debt_decrease":
+        assert len(unstakes) + len(stakes) <= 2
+    # the swap output still ends up max weighted
+    assert ybs.accountWeeklyMaxStake(strategy, ybs.getWeek()) > max_weighted
+    gas(f"harvest_netting_{case}", tx)
+
+
+def test_gas_harvest_trigger(chain, strategy, gov, deposited, gas):
+    # what a keeper pays to simulate the trigger when nothing is due
+    avoid_week_end(chain, strategy)
+    assert not strategy.harvestTrigger(0)
+    gas("harvest_trigger", strategy.harvestTrigger.estimate_gas(0))
+
+
+# The same claim and swap harvest and trigger check on the packed config and on
+# the layout from before it, compare the pairs in the gas summary.
+@pytest.mark.parametrize("layout", ["packed", "unpacked"])
+def test_gas_config_layout(
+    chain,
+    strategy,
+    vault,
+    strategist,
+    gov,
+    ybs,
+    reward_distributor,
+    proxy,
+    utils,
+    deposit_rewards,
+    deposited,
+    layout,
+    gas,
+    Strategy,
+    StrategyUnpacked,
+):
+    container = Strategy if layout == "packed" else StrategyUnpacked
+    new_strategy = strategist.deploy(
+        container, vault, ybs, reward_distributor, strategy.swapper()
+    )
+    vault.migrateStrategy(strategy, new_strategy, {"from": gov})
+    ybs.setWeightedStaker(new_strategy, True, {"from": gov})
+    proxy.approveLocker(new_strategy, True, {"from": gov})
+    new_strategy.harvest({"from": gov})
+
+    accrue_rewards(chain, gov, reward_distributor, utils, deposit_rewards)
+    avoid_week_end(chain, new_strategy)
+    gas(f"harvest_trigger_{layout}", new_strategy.harvestTrigger.estimate_gas(0))
+    gas(f"harvest_claim_swap_{layout}", new_strategy.harvest({"from": gov}))
+
+
+def test_gas_harvest_claim_range(
+    chain, strategy, gov, reward_distributor, deposit_rewards, deposited, gas
+):
+    # rewards pile up for 16 weeks without a harvest
+    for _ in range(16):
+        deposit_rewards()
+        chain.sleep(WEEK)
+        chain.mine()
+    strategy.setMaxClaimWeeks(4, {"from": gov})
+
+    # the first harvest also pays ybs checkpointing the missed weeks
+    avoid_week_end(chain, strategy)
+    strategy.harvest({"from": gov})
+
+    used = []
+    while reward_distributor.getClaimable(strategy) > 0:
+        avoid_week_end(chain, strategy)
+        tx = strategy.harvest({"from": gov})
+        used.append(tx.gas_used)
+    assert len(used) >= 3
+    # each harvest claims 4 weeks, so the cost doesn't grow with the backlog
+    assert max(used) <= min(used) * 1.1
+    gas("harvest_claim_range", max(used))
+
+
+def test_gas_harvest_bypass(
+    chain,
+    strategy,
+    gov,
+    reward_distributor,
+    utils,
+    deposit_rewards,
+    deposited,
+    gas,
+):
+    accrue_rewards(chain, gov, reward_distributor, utils, deposit_rewards)
+    strategy.harvest({"from": gov})
+    strategy.setBypasses(True, True, {"from": gov})
+    chain.sleep(DAY)
+    avoid_week_end(chain, strategy)
+    gas("harvest_bypass", strategy.harvest({"from": gov}))
+
+
+def test_gas_harvest_debt_decrease(chain, strategy, vault, gov, deposited, gas):
+    vault.updateStrategyDebtRatio(strategy, 5_000, {"from": gov})
+    avoid_week_end(chain, strategy)
+    gas("harvest_debt_decrease", strategy.harvest({"from": gov}))
+
+
+def test_gas_migration(
+    strategy,
+    vault,
+    strategist,
+    gov,
+    Strategy,
+    ybs,
+    reward_distributor,
+    swapper_v2,
+    deposited,
+    gas,
+):
+    new_strategy = strategist.deploy(
+        Strategy, vault, ybs, reward_distributor, swapper_v2
+    )
+    gas("deploy_strategy", new_strategy.tx)
+    gas("migrate", vault.migrateStrategy(strategy, new_strategy, {"from": gov}))
+
+
+def test_gas_migration_keep_boost(
+    chain,
+    strategy,
+    vault,
+    strategist,
+    gov,
+    Strategy,
+    ybs,
+    utils,
+    reward_distributor,
+    swapper_v2,
+    deposited,
+    gas,
+):
+    new_strategy = strategist.deploy(
+        Strategy, vault, ybs, reward_distributor, swapper_v2
+    )
+    ybs.setWeightedStaker(new_strategy, True, {"from": gov})
+
+    # unstake to the new strategy, then approximate the boost by hand
+    txs = [
+        vault.migrateStrategy(strategy, new_strategy, {"from": gov}),
+        new_strategy.manualStakeAsMaxWeighted(95e16, {"from": gov}),
+    ]
+    gas("migration_restake", sum(tx.gas_used for tx in txs))
+    chain.undo(2)
+
+    # the old strategy restakes for the new one with its weight
+    boost = utils.getUserProjectedBoostMultiplier(strategy)
+    txs = [
+        new_strategy.setStakeMigrator(strategy, True, {"from": gov}),
+        vault.migrateStrategy(strategy, new_strategy, {"from": gov}),
+    ]
+    gas("migration_keep_boost", sum(tx.gas_used for tx in txs))
+    assert utils.getUserProjectedBoostMultiplier(new_strategy) == pytest.approx(
+        boost, rel=1e-5
+    )
+
+
+@pytest.mark.parametrize(
+    "name", ["swapper", "swapper_v2", "swapper_v3", "swapper_v4", "swapper_v5"]
+)
+def test_gas_swap(request, crvusd, user, crvusd_whale, reward_token, name, gas):
+    swapper = request.getfixturevalue(name)
+    gas(f"deploy_{name}", swapper.tx)
+
+    amount = 1_000e18
+    reward_token.withdraw(amount, user, user, {"from": user})
+    crvusd.approve(swapper, amount, {"from": user})
+    gas(f"swap_{name}", swapper.swap(amount, {"from": user}))
+
+
+# The split search is the swapper_v4 cost that matters on mainnet, where every
+# get_dy on tricrypto-ng is a Newton solve. Without an alternative pool, pool1
+# stands in for it so both sides of the pool1 split quote on tricrypto.
+@pytest.mark.parametrize("size", [1_000e18, 50_000e18])
+def test_gas_split_search(swapper_v4, tricrv_pool, alt_pool, gov, size, gas):
+    if not alt_pool:
+        swapper_v4.setAltPool(tricrv_pool, {"from": gov})
+    gas(f"quote_swapper_v4_{size / 1e18:.0f}", swapper_v4.quote.estimate_gas(size))
+
+
+def test_gas_swap_direct(
+    swapper, swapper_v2, swapper_v5, crvusd, user, crvusd_whale, reward_token
+):
+    amount = 1_000e18
+    reward_token.withdraw(3 * amount, user, user, {"from": user})
+    used = {}
+    transfers = {}
+    for name, s in [("pool2", swapper), ("zap", swapper_v2), ("direct", swapper_v5)]:
+        crvusd.approve(s, amount, {"from": user})
+        tx = s.swap(amount, {"from": user})
+        used[name] = tx.gas_used
+        transfers[name] = len(tx.events["Transfer"])
+
+    # crvUSD skips the swapper: one transfer less than the zap route
+    assert transfers["direct"] == transfers["zap"] - 1
+    assert used["direct"] < min(used["pool2"], used["zap"])
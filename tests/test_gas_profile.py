@@ -0,0 +1,99 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from brownie import chain, config
+
+from scripts import gas_profile
+
+WEEK = 60 * 60 * 24 * 7
+
+
+def step(depth, gas, cost, fn, jump_depth=0):
+    contract = fn.split(".")[0]
+    return {
+        "depth": depth,
+        "gas": gas,
+        "gasCost": cost,
+        "fn": fn,
+        "jumpDepth": jump_depth,
+        "contractName": contract,
+        "address": f"0x{contract}",
+    }
+
+
+def test_gas_profile_charges_callee_gas_to_callee(tmp_path):
+    # Strategy.harvest -> Strategy._stake -> CALL into ybs.stake, which spends
+    # 700 of the 10_000 forwarded
+    trace = [
+        step(1, 100_000, 3, "Strategy.harvest"),
+        step(1, 99_997, 8, "Strategy._stake", 1),
+        step(1, 99_989, 12_600, "Strategy._stake", 1),
+        step(2, 10_000, 200, "Ybs.stake"),
+        step(2, 9_800, 500, "Ybs.stake"),
+        step(1, 97_289, 3, "Strategy._stake", 1),
+        step(1, 97_286, 0, "Strategy.harvest"),
+    ]
+    assert gas_profile.step_costs(trace) == [3, 8, 2_000, 200, 500, 3, 0]
+
+    tx = SimpleNamespace(trace=trace, txid="0xabc", gas_used=30_000)
+    result = gas_profile.profile(tx)
+    assert result["traced"] == 2_714
+    assert result["contracts"] == {"Strategy": 2_014, "Ybs": 700}
+    assert result["functions"]["Strategy.harvest"] == {
+        "self": 3,
+        "inclusive": 2_714,
+        "calls": 1,
+    }
+    assert result["functions"]["Strategy._stake"]["self"] == 2_011
+    assert result["functions"]["Strategy._stake"]["inclusive"] == 2_711
+    assert result["functions"]["Ybs.stake"]["inclusive"] == 700
+
+    events = result["speedscope"]["profiles"][0]["events"]
+    frames = [f["name"] for f in result["speedscope"]["shared"]["frames"]]
+    opened = [(e["type"], frames[e["frame"]], e["at"]) for e in events]
+    assert opened == [
+        ("O", "Strategy.harvest", 0),
+        ("O", "Strategy._stake", 3),
+        ("O", "Ybs.stake", 2_011),
+        ("C", "Ybs.stake", 2_711),
+        ("C", "Strategy._stake", 2_714),
+        ("C", "Strategy.harvest", 2_714),
+    ]
+
+    summary, speedscope = gas_profile.write(result, tmp_path, "harvest")
+    assert "speedscope" not in json.loads(summary.read_text())
+    assert json.loads(speedscope.read_text())["profiles"][0]["endValue"] == 2_714
+
+
+def test_gas_profile_local_harvest(
+    local, local_stack, strategy, gov, deposit_rewards, ybs
+):
+    if not local:
+        pytest.skip("needs the mock stack's labels")
+    deposit_rewards()
+    chain.mine(timestamp=(chain.time() // WEEK + 2) * WEEK - 3600)
+    tx = strategy.harvest({"from": gov})
+
+    labels = gas_profile.labels_of(**vars(local_stack), strategy=strategy)
+    result = gas_profile.profile(tx, labels)
+    assert 0 < result["traced"] < tx.gas_used
+    assert result["functions"]["Strategy.harvest"]["inclusive"] == result["traced"]
+    assert {"strategy", "ybs", "reward_distributor", "pool1", "zap", "proxy"} <= set(
+        result["contracts"]
+    )
+    assert sum(result["contracts"].values()) == result["traced"]
+
+
+def test_gas_profile_default_harvest(local, pm):
+    # what `brownie run gas_profile main` profiles without a txid
+    if not local:
+        pytest.skip("deploys its own mock stack")
+    tx, labels = gas_profile._local_harvest(pm(config["dependencies"][0]).Vault)
+    assert tx.status == 1 and tx.events["Harvested"]["profit"] > 0
+
+    result = gas_profile.profile(tx, labels)
+    assert result["functions"]["Strategy.harvest"]["inclusive"] == result["traced"]
+    assert {"strategy", "ybs", "reward_distributor", "pool1", "zap"} <= set(
+        result["contracts"]
+    )
@@ -0,0 +1,113 @@
+import pytest
+
+from scripts.indexer import WEEK, Indexer, discover
+
+
+@pytest.fixture(autouse=True)
+def local_only(local):
+    if not local:
+        pytest.skip("indexes a chain populated by the mock stack")
+
+
+class NarrowNode(Indexer):
+    # a node that refuses ranges over 4 blocks
+    calls = 0
+
+    def _get_logs(self, from_block, to_block):
+        self.calls += 1
+        if to_block - from_block >= 4:
+            raise ValueError("query exceeds max block range 4")
+        return super()._get_logs(from_block, to_block)
+
+
+def harvest_with_rewards(chain, strategy, reward_distributor, utils, gov, deposit):
+    deposit()
+    chain.sleep(WEEK)
+    chain.mine()
+    if utils.getGlobalActiveBoostMultiplier() == 0:
+        reward_distributor.pushRewards(utils.getWeek() - 1, {"from": gov})
+        chain.sleep(WEEK)
+        chain.mine()
+    return strategy.harvest({"from": gov})
+
+
+def test_indexer_resumes_and_answers(
+    chain,
+    tmp_path,
+    strategy,
+    vault,
+    token,
+    user,
+    amount,
+    gov,
+    ybs,
+    reward_distributor,
+    utils,
+    deposit_rewards,
+):
+    start = chain.height
+    token.approve(vault, amount, {"from": user})
+    vault.deposit(amount, {"from": user})
+    txs = [strategy.harvest({"from": gov})]
+    txs.append(
+        harvest_with_rewards(
+            chain, strategy, reward_distributor, utils, gov, deposit_rewards
+        )
+    )
+    assert txs[-1].events["Harvested"]["profit"] > 0
+
+    contracts = discover(strategy)
+    assert {
+        "strategy",
+        "want",
+        "swapper",
+        "ybs",
+        "reward_distributor",
+        "pool1",
+    } <= set(contracts)
+    indexer = Indexer(tmp_path / "events.db", contracts, start_block=start)
+    assert indexer.sync() > 0
+    harvests = indexer.events("Harvested")
+    assert [h["tx_hash"] for h in harvests] == [tx.txid for tx in txs]
+    assert [h["week"] for h in harvests] == [tx.timestamp // WEEK for tx in txs]
+    assert harvests[-1]["args"]["profit"] == txs[-1].events["Harvested"]["profit"]
+    assert indexer.events("Stake", "ybs")
+
+    weeks = {}
+    for tx in txs:
+        week = tx.timestamp // WEEK
+        count, gas = weeks.get(week, (0, 0))
+        weeks[week] = (count + 1, gas + tx.gas_used)
+    assert indexer.gas_per_harvest() == [(w, *v) for w, v in sorted(weeks.items())]
+
+    [(week, sold, realized, rate)] = indexer.realized_rate()
+    exchange = txs[-1].events["TokenExchange"][0]
+    assert week == txs[-1].timestamp // WEEK
+    assert sold == exchange["tokens_sold"]
+    # the swap output, not the unstaked yCRV or the vault's credit
+    received = [
+        list(t.values())
+        for t in txs[-1].events["Transfer"]
+        if t.address == token.address
+    ]
+    assert realized == sum(
+        value
+        for sender, receiver, value in received
+        if receiver == strategy and sender not in (vault, ybs)
+    )
+    assert rate == realized / sold > 0
+
+    # a new run picks up after the last indexed block
+    resumed = Indexer(tmp_path / "events.db", contracts, start_block=start)
+    assert resumed.sync() == 0
+    chain.sleep(60 * 60)
+    tx = strategy.harvest({"from": gov})
+    indexed = len(resumed.events())
+    assert resumed.sync() == len(resumed.events()) - indexed > 0
+    assert resumed.events("Harvested")[-1]["tx_hash"] == tx.txid
+
+    # ranges the node refuses are split until it answers
+    narrow = NarrowNode(tmp_path / "narrow.db", contracts, start_block=start)
+    narrow.sync()
+    assert narrow.calls > (chain.height - start) // 4
+    assert narrow.events() == resumed.events()
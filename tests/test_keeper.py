@@ -0,0 +1,88 @@
+import pytest
+from brownie import web3
+
+from scripts.keeper import Keeper, week_end_window
+
+WEEK = 60 * 60 * 24 * 7
+
+
+@pytest.fixture(autouse=True)
+def local_only(local):
+    if not local:
+        pytest.skip("keeper tests run against the local mock stack")
+
+
+@pytest.fixture
+def strategies(
+    strategy, strategist, gov, vault, Strategy, ybs, reward_distributor, swapper_v2
+):
+    second = strategist.deploy(Strategy, vault, ybs, reward_distributor, swapper_v2)
+    vault.addStrategy(second, 0, 0, 2**256 - 1, 1_000, {"from": gov})
+    # only the week end window should trigger in these tests
+    for s in (strategy, second):
+        s.setMinReportDelay(4 * WEEK, {"from": gov})
+        s.setCreditThreshold(2**256 - 1, {"from": gov})
+    yield [strategy, second]
+
+
+def test_keeper_checks_in_one_call(chain, strategies, vault, monkeypatch):
+    keeper = Keeper(strategies)
+
+    calls = []
+    make_request = web3.provider.make_request
+
+    def counting(method, params):
+        if method == "eth_call":
+            calls.append(params)
+        return make_request(method, params)
+
+    monkeypatch.setattr(web3.provider, "make_request", counting)
+    now, checks = keeper.check()
+    monkeypatch.undo()
+
+    assert len(calls) == 1
+    assert now == chain[-1].timestamp
+    for strategy, check in zip(strategies, checks):
+        assert check.ok
+        assert check.trigger == strategy.harvestTrigger(0)
+        assert check.threshold_time_until_week_end == (
+            strategy.thresholdTimeUntilWeekEnd()
+        )
+        assert check.min_report_delay == strategy.minReportDelay()
+        assert check.last_report == vault.strategies(strategy)["lastReport"]
+
+
+def test_keeper_harvests_in_week_end_window(
+    chain, strategies, vault, token, user, amount, keeper
+):
+    strategy, second = strategies
+    # only the first strategy has credit to take at the week end
+    token.approve(vault, amount, {"from": user})
+    vault.deposit(amount, {"from": user})
+
+    threshold = strategy.thresholdTimeUntilWeekEnd()
+    start, _ = week_end_window(chain.time(), threshold)
+    if start - chain.time() < 600:
+        chain.sleep(WEEK)
+        chain.mine()
+
+    bot = Keeper(strategies)
+    now, checks = bot.check()
+    assert not any(c.trigger for c in checks)
+    start, week_end = week_end_window(now, threshold)
+    assert bot.next_check(now, checks) == start
+
+    second_report = vault.strategies(second)["lastReport"]
+
+    def sleep(seconds):
+        chain.sleep(seconds)
+        chain.mine()
+
+    # first round sleeps until the window opens, second one harvests
+    bot.run(keeper, max_wait=WEEK, rounds=2, sleep=sleep)
+    assert start <= vault.strategies(strategy)["lastReport"] < week_end
+    assert vault.strategies(second)["lastReport"] == second_report
+
+    now, checks = bot.check()
+    assert not any(c.trigger for c in checks)
+    assert bot.next_check(now, checks) == week_end
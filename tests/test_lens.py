@@ -0,0 +1,67 @@
+import brownie
+
+from scripts.lens import Lens
+
+WEEK = 60 * 60 * 24 * 7
+
+
+def test_lens_matches_direct_calls(
+    chain, strategy, vault, reward_distributor, utils, gov, StrategyLens
+):
+    lens = gov.deploy(StrategyLens)
+    block = chain.height
+    [state, unreadable] = Lens(lens.address).states(
+        [strategy, vault], utils, block_identifier=block
+    )
+
+    assert state["ok"] and state["strategy"] == strategy
+    assert state["estimatedTotalAssets"] == strategy.estimatedTotalAssets()
+    assert state["balanceOfWant"] == strategy.balanceOfWant()
+    assert state["balanceOfStaked"] == strategy.balanceOfStaked()
+    assert state["balanceOfReward"] == strategy.balanceOfReward()
+    underlying = brownie.interface.IERC20(strategy.rewardTokenUnderlying())
+    assert state["balanceOfRewardUnderlying"] == underlying.balanceOf(strategy)
+    params = vault.strategies(strategy)
+    assert state["totalDebt"] == params["totalDebt"]
+    assert state["lastReport"] == params["lastReport"]
+    assert (
+        state["swapThresholdMin"],
+        state["swapThresholdMax"],
+        state["autoAdjustThresholds"],
+    ) == strategy.swapThresholds()
+    assert state["bypassClaim"] == strategy.bypassClaim()
+    assert state["bypassMaxStake"] == strategy.bypassMaxStake()
+    assert state["claimable"] == reward_distributor.getClaimable(strategy)
+    assert state["thresholdTimeUntilWeekEnd"] == strategy.thresholdTimeUntilWeekEnd()
+    now = chain[block].timestamp
+    assert state["secondsUntilWeekEnd"] == (now // WEEK + 1) * WEEK - now
+    assert state["isLockPending"] == strategy.isLockPending(block_identifier=block)
+    reason = strategy.harvestTriggerReasons(block_identifier=block)
+    assert state["triggerReason"] == reason
+    assert state["harvestTrigger"] == (reason != 0)
+    assert state["activeBoost"] == utils.getUserActiveBoostMultiplier(strategy)
+    assert state["projectedBoost"] == utils.getUserProjectedBoostMultiplier(strategy)
+
+    # the vault isn't a strategy, it doesn't fail the call
+    assert not unreadable["ok"] and unreadable["strategy"] == vault
+    assert unreadable["estimatedTotalAssets"] == 0
+
+    # no utilities, no boost
+    [state] = Lens(lens.address).states([strategy])
+    assert state["ok"] and state["activeBoost"] == 0 == state["projectedBoost"]
+
+    with brownie.reverts("!length"):
+        lens.getStates([strategy, strategy], [utils])
+
+
+def test_lens_week_end_window(chain, strategy, gov, StrategyLens):
+    lens = Lens(gov.deploy(StrategyLens).address)
+    week_end = (chain.time() // WEEK + 1) * WEEK
+    chain.mine(timestamp=week_end - strategy.thresholdTimeUntilWeekEnd() + 60)
+    [state] = lens.states([strategy])
+    assert state["isNearWeekEnd"] and state["isLockPending"]
+    assert state["harvestTrigger"] == strategy.harvestTrigger(0)
+
+    strategy.harvest({"from": gov})
+    [state] = lens.states([strategy])
+    assert state["isNearWeekEnd"] and not state["isLockPending"]
@@ -34,3 +34,50 @@ def test_migration(
     )
     vault.migrateStrategy(strategy, new_strategy, {"from": gov})
     assert new_strategy.estimatedTotalAssets() >= amount
+
+
+def test_migration_keeps_boost(
+    chain,
+    token,
+    vault,
+    strategy,
+    amount,
+    Strategy,
+    strategist,
+    gov,
+    user,
+    RELATIVE_APPROX,
+    reward_distributor,
+    ybs,
+    utils,
+    swapper_v2,
+):
+    token.approve(vault.address, amount, {"from": user})
+    vault.deposit(amount, {"from": user})
+    strategy.harvest({"from": gov})
+    # let the pending stake grow some weight
+    chain.sleep(2 * 60 * 60 * 24 * 7)
+    chain.mine()
+
+    new_strategy = strategist.deploy(
+        Strategy, vault, ybs, reward_distributor, swapper_v2
+    )
+    new_strategy.setStakeMigrator(strategy, True, {"from": gov})
+    staked = strategy.balanceOfStaked()
+    boost = utils.getUserProjectedBoostMultiplier(strategy)
+    vault.migrateStrategy(strategy, new_strategy, {"from": gov})
+
+    # the position moved as a stake, nothing went through the new strategy
+    assert ybs.balanceOf(strategy) == 0
+    assert ybs.balanceOf(new_strategy) == staked
+    assert new_strategy.balanceOfWant() == 0
+    assert utils.getUserProjectedBoostMultiplier(new_strategy) == pytest.approx(
+        boost, rel=RELATIVE_APPROX
+    )
+
+    # active boost is last week's, so it's this week's boost once the week turns
+    chain.sleep(60 * 60 * 24 * 7)
+    chain.mine()
+    assert utils.getUserActiveBoostMultiplier(new_strategy) == pytest.approx(
+        boost, rel=RELATIVE_APPROX
+    )
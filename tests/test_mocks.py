@@ -0,0 +1,56 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def only_local(local):
+    if not local:
+        pytest.skip("mock stack only exists with --local")
+
+
+def test_staker_weight_growth(chain, token, ybs, utils, user, gov):
+    max_weeks = ybs.MAX_STAKE_GROWTH_WEEKS()
+    token.mint(user, 200e18, {"from": user})
+    token.approve(ybs, 2**256 - 1, {"from": user})
+    ybs.stake(100e18, {"from": user})
+    week = ybs.getWeek()
+    assert ybs.getAccountWeightAt(user, week) == 50e18
+
+    # weight grows by half the stake each week, then stops
+    chain.sleep(60 * 60 * 24 * 7 * (max_weeks + 2))
+    chain.mine()
+    assert ybs.getAccountWeightAt(user, week + 1) == 100e18
+    assert ybs.getAccountWeight(user) == 50e18 * (max_weeks + 1)
+    assert utils.getUserActiveBoostMultiplier(user) == (max_weeks + 1) * 1e18
+
+    # max weighted stakes start fully grown
+    ybs.setWeightedStaker(user, True, {"from": gov})
+    ybs.stakeAsMaxWeighted(user, 100e18, {"from": user})
+    assert ybs.getAccountWeight(user) == 100e18 * (max_weeks + 1)
+
+    # pending stake is removed before realized stake
+    ybs.stake(10e18, {"from": user})
+    ybs.unstake(10e18, user, {"from": user})
+    assert ybs.getAccountWeight(user) == 100e18 * (max_weeks + 1)
+    assert ybs.balanceOf(user) == 200e18
+
+
+def test_distributor_splits_by_weight(
+    chain, accounts, token, ybs, reward_distributor, reward_token, crvusd_whale, user
+):
+    alice, bob = accounts[6], accounts[7]
+    for account, stake in ((alice, 300e18), (bob, 100e18)):
+        token.mint(account, stake, {"from": account})
+        token.approve(ybs, stake, {"from": account})
+        ybs.stake(stake, {"from": account})
+
+    reward_token.approve(reward_distributor, 2**256 - 1, {"from": user})
+    reward_distributor.depositReward(1_000e18, {"from": user})
+    assert reward_distributor.getClaimable(alice) == 0
+
+    chain.sleep(60 * 60 * 24 * 7)
+    chain.mine()
+    assert reward_distributor.getClaimable(alice) == 750e18
+    reward_distributor.claim({"from": alice})
+    assert reward_token.balanceOf(alice) == 750e18
+    assert reward_distributor.getClaimable(alice) == 0
+    assert reward_distributor.getClaimable(bob) == 250e18
@@ -17,6 +17,8 @@ def test_operation(
     amount,
     RELATIVE_APPROX,
     deposit_rewards,
+    ycrv_pool,
+    ycrv_whale,
 ):
     # do a harvest to get all of our loose vault funds into the strategy (assuming no more profitable harvests left)
     assert vault.strategies(strategy)["debtRatio"] == 10_000
@@ -89,10 +91,8 @@ def test_operation(
         print("🤑 Just swapped", swapped / 1e18, "CRV for", received / 1e18, "yCRV\n")
 
     # have a whale swap in a 500k yCRV
-    whale = accounts.at(
-        "0x71E47a4429d35827e0312AA13162197C23287546", force=True
-    )  # threshold multisig
-    pool = Contract("0x99f5aCc8EC2Da2BC0771c32814EFF52b712de1E5")
+    whale = ycrv_whale
+    pool = ycrv_pool
     token.approve(pool, 2**256 - 1, {"from": whale})
     pool.exchange(1, 0, 500_000e18, 0, {"from": whale})
 
@@ -194,8 +194,8 @@ def test_triggers(
 
     # sleep to within 1 hour of epoch flip, should be true to claim before end of epoch (again, adjust based on time)
     # chain.sleep(60 * 60 * 1)
-    #chain.mine()
-    #assert strategy.harvestTrigger(0)
+    # chain.mine()
+    # assert strategy.harvestTrigger(0)
 
     # do a harvest to get all of our loose vault funds into the strategy and test our locking
     assert vault.strategies(strategy)["debtRatio"] == 10_000
@@ -245,3 +245,58 @@ def test_triggers(
 
     # harvest trigger should be false
     assert not strategy.harvestTrigger(0)
+
+
+def test_swap_size_by_price_impact(
+    chain,
+    gov,
+    user,
+    vault,
+    strategy,
+    token,
+    amount,
+    utils,
+    reward_distributor,
+    deposit_rewards,
+    crvusd,
+    tricrv_pool,
+    reward_token,
+):
+    token.approve(vault.address, amount, {"from": user})
+    vault.deposit(amount, {"from": user})
+    strategy.harvest({"from": gov})
+    deposit_rewards()
+    chain.sleep(60 * 60 * 24 * 7)
+    chain.mine()
+    if utils.getGlobalActiveBoostMultiplier() == 0:
+        reward_distributor.pushRewards(utils.getWeek() - 1, {"from": gov})
+        chain.sleep(60 * 60 * 24 * 7)
+        chain.mine()
+
+    # only users with the right permissions can set it, and it must be under 100%
+    with brownie.reverts():
+        strategy.setMaxPriceImpact(10, {"from": user})
+    with brownie.reverts("!impact"):
+        strategy.setMaxPriceImpact(10_000, {"from": gov})
+    assert strategy.swapSizeForPriceImpact() == 0
+
+    # 1 bp of the pool's crvUSD per sale, smaller than this week's rewards
+    strategy.setMaxPriceImpact(1, {"from": gov})
+    swapper = Contract(strategy.swapper())
+    depth = tricrv_pool.balances(swapper.pool1InTokenIdx())
+    sized = strategy.swapSizeForPriceImpact()
+    assert sized == depth * 1 // 9_999
+
+    # sells exactly the sized amount and leaves the rest for later harvests
+    tx = strategy.harvest({"from": gov})
+    assert crvusd.balanceOf(strategy) > 0
+    assert tx.events["TokenExchange"][0]["tokens_sold"] == sized
+
+    # a thin pool falls back to the schedule once a week of it is waiting
+    sized = strategy.swapSizeForPriceImpact()
+    schedule = sized * 2
+    strategy.setSwapThresholds(10**18, schedule, False, {"from": gov})
+    backlog = 8 * schedule - crvusd.balanceOf(strategy)
+    reward_token.withdraw(backlog, strategy, user, {"from": user})
+    tx = strategy.harvest({"from": gov})
+    assert tx.events["TokenExchange"][0]["tokens_sold"] == schedule
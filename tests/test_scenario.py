@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+
+import pytest
+
+from scripts.scenario import (
+    DAY,
+    HOUR,
+    WEEK,
+    Deposit,
+    DepositRewards,
+    Harvest,
+    Scenario,
+    WeekEnd,
+    WeekStart,
+    Withdraw,
+    run,
+    run_scenario,
+)
+
+
+@pytest.fixture(autouse=True)
+def local_only(local):
+    if not local:
+        pytest.skip("scenarios mint from the local mock stack")
+
+
+@pytest.fixture
+def env(accounts, token, strategy, gov, user, local_stack):
+    yield SimpleNamespace(
+        **vars(local_stack),
+        token=token,
+        strategy=strategy,
+        gov=gov,
+        user=user,
+        whale=accounts[8],
+    )
+
+
+def test_scenario_lands_on_week_anchors(chain, env, vault, strategy):
+    start_week = chain.time() // WEEK + 1
+    # out of order on purpose, the runner sorts by time
+    scenario = Scenario(
+        "rewards",
+        [
+            (WeekEnd(1, HOUR), Harvest()),
+            (WeekStart(0), Deposit(10_000 * 10**18)),
+            (WeekStart(0, DAY), DepositRewards(5_000 * 10**18)),
+        ],
+    )
+    result = run_scenario(scenario, env, chain)
+
+    assert result.error is None
+    assert result.harvests == 1
+    assert result.profit > 0 and result.loss == 0
+    assert set(result.gas) == {"Deposit", "DepositRewards", "Harvest"}
+    harvested_at = vault.strategies(strategy)["lastReport"]
+    assert 0 <= harvested_at - ((start_week + 2) * WEEK - HOUR) < 60
+
+
+def test_scenario_reports_failing_event(chain, env, vault, user):
+    shares = vault.balanceOf(user)
+    result = run_scenario(
+        Scenario("overdraw", [(WeekStart(0), Withdraw(shares + 10**18))]), env, chain
+    )
+    assert result.error.startswith("Withdraw at week 0")
+
+
+def test_run_plays_scenarios_on_worker_chains():
+    rewards = Scenario(
+        "rewards",
+        [
+            (WeekStart(0), Deposit(10_000 * 10**18)),
+            (WeekStart(0, DAY), DepositRewards(5_000 * 10**18)),
+            (WeekEnd(1, HOUR), Harvest()),
+        ],
+    )
+    # nothing deposited on the worker's chain
+    overdraw = Scenario("overdraw", [(WeekStart(0), Withdraw(10**18))])
+    [played, failed] = run([rewards, overdraw], processes=2)
+
+    assert played.name == "rewards" and played.error is None
+    assert played.harvests == 1 and played.profit > 0
+    assert failed.name == "overdraw"
+    assert failed.error.startswith("Withdraw at week 0")
@@ -0,0 +1,207 @@
+from brownie import Contract
+import pytest
+
+from scripts.simulate import (
+    HOUR,
+    WEEK,
+    Environment,
+    Params,
+    StrategyState,
+    TriggerReason,
+    VaultModel,
+    harvest,
+    harvest_trigger_reason,
+    run,
+)
+
+
+def chain_state(strategy, vault, ybs, block):
+    st = strategy.swapThresholds(block_identifier=block)
+    params = vault.strategies(strategy, block_identifier=block)
+    underlying = Contract(strategy.rewardTokenUnderlying())
+    sim_strategy = StrategyState(
+        swap_min=st["min"],
+        swap_max=st["max"],
+        auto_adjust=st["autoAdjustThresholds"],
+        bypass_claim=strategy.bypassClaim(block_identifier=block),
+        bypass_max_stake=strategy.bypassMaxStake(block_identifier=block),
+        threshold_time_until_week_end=strategy.thresholdTimeUntilWeekEnd(
+            block_identifier=block
+        ),
+        min_report_delay=strategy.minReportDelay(block_identifier=block),
+        credit_threshold=strategy.creditThreshold(block_identifier=block),
+        force_harvest_trigger_once=strategy.forceHarvestTriggerOnce(
+            block_identifier=block
+        ),
+        approved_weighted_staker=ybs.approvedWeightedStaker(
+            strategy, block_identifier=block
+        ),
+        max_price_impact=strategy.maxPriceImpact(block_identifier=block),
+        max_claim_weeks=strategy.maxClaimWeeks(block_identifier=block),
+        last_lock_week=strategy.lastLockWeek(block_identifier=block),
+        want=strategy.balanceOfWant(block_identifier=block),
+        staked=strategy.balanceOfStaked(block_identifier=block),
+        reward_shares=strategy.balanceOfReward(block_identifier=block),
+        reward_underlying=underlying.balanceOf(strategy, block_identifier=block),
+    )
+    sim_vault = VaultModel(
+        idle=vault.totalIdle(block_identifier=block),
+        total_debt=params["totalDebt"],
+        debt_ratio=params["debtRatio"],
+        last_report=params["lastReport"],
+        emergency_shutdown=vault.emergencyShutdown(block_identifier=block),
+    )
+    return sim_strategy, sim_vault
+
+
+def claimable(strategy, reward_distributor, max_weeks, block):
+    # same reads as Strategy._claimable
+    if max_weeks == 0:
+        return reward_distributor.getClaimable(strategy, block_identifier=block)
+    start, end = reward_distributor.getSuggestedClaimRange(
+        strategy, block_identifier=block
+    )
+    if reward_distributor.getWeek(block_identifier=block) <= start:
+        return 0
+    end = min(end, start + max_weeks - 1)
+    return reward_distributor.getTotalClaimableByRange(
+        strategy, start, end, block_identifier=block
+    )
+
+
+def chain_environment(strategy, reward_distributor, reward_token, quoter, block):
+    # every external read is pinned to the block before the harvest
+    swapper = Contract(strategy.swapper())
+    pool1 = Contract(swapper.pool1())
+    return Environment(
+        claimable=lambda max_weeks: claimable(
+            strategy, reward_distributor, max_weeks, block
+        ),
+        redeem=lambda shares: reward_token.previewRedeem(
+            shares, block_identifier=block
+        ),
+        swap=lambda amount: swapper.swap.call(
+            amount, {"from": quoter}, block_identifier=block
+        ),
+        swap_depth=lambda: pool1.balances(
+            swapper.pool1InTokenIdx(), block_identifier=block
+        ),
+    )
+
+
+def test_simulator_parity(
+    chain,
+    accounts,
+    token,
+    gov,
+    vault,
+    ybs,
+    reward_distributor,
+    reward_token,
+    strategy,
+    user,
+    utils,
+    amount,
+    deposit_rewards,
+    crvusd,
+    local,
+):
+    # quote swaps from an account holding crvUSD so the static call matches the harvest
+    if local:
+        quoter = accounts[7]
+        crvusd.mint(quoter, 1_000_000e18, {"from": quoter})
+    else:
+        quoter = accounts.at("0xA920De414eA4Ab66b97dA1bFE9e6EcA7d4219635", force=True)
+    crvusd.approve(strategy.swapper(), 2**256 - 1, {"from": quoter})
+
+    token.approve(vault.address, amount, {"from": user})
+    vault.deposit(amount, {"from": user})
+    deposit_rewards()
+
+    for step in range(6):
+        if step == 2:
+            vault.updateStrategyDebtRatio(strategy, 5_000, {"from": gov})
+        if step == 3:
+            strategy.setMaxPriceImpact(10, {"from": gov})
+        if step == 4:
+            vault.updateStrategyDebtRatio(strategy, 10_000, {"from": gov})
+
+        chain.sleep(60 * 60 * 23)
+        chain.mine()
+        if step == 1 and utils.getGlobalActiveBoostMultiplier() == 0:
+            reward_distributor.pushRewards(utils.getWeek() - 1, {"from": gov})
+            chain.sleep(WEEK)
+            chain.mine()
+
+        tx = strategy.harvest({"from": gov})
+        block = tx.block_number - 1
+
+        sim_strategy, sim_vault = chain_state(strategy, vault, ybs, block)
+        env = chain_environment(
+            strategy, reward_distributor, reward_token, quoter, block
+        )
+
+        reason = harvest_trigger_reason(
+            sim_strategy,
+            sim_vault,
+            env,
+            chain[block].timestamp,
+            strategy.isBaseFeeAcceptable(block_identifier=block),
+        )
+        assert reason == strategy.harvestTriggerReasons(block_identifier=block)
+        assert (reason != TriggerReason.NONE) == strategy.harvestTrigger(
+            0, block_identifier=block
+        )
+
+        profit, loss, debt_payment = harvest(sim_strategy, sim_vault, env, tx.timestamp)
+
+        event = tx.events["Harvested"]
+        assert (profit, loss, debt_payment) == (
+            event["profit"],
+            event["loss"],
+            event["debtPayment"],
+        )
+        assert sim_strategy.swap_max == strategy.swapThresholds()["max"]
+        assert sim_strategy.staked == strategy.balanceOfStaked()
+        assert sim_strategy.want == strategy.balanceOfWant()
+        assert sim_strategy.reward_shares == strategy.balanceOfReward()
+        assert sim_strategy.reward_underlying == crvusd.balanceOf(strategy)
+        assert sim_vault.total_debt == vault.strategies(strategy)["totalDebt"]
+        assert sim_vault.idle == vault.totalIdle()
+
+
+def test_simulator_sells_weekly_rewards():
+    weekly = [70_000 * 10**18] * 8
+    result = run(Params(), weekly)
+
+    # auto adjusted thresholds sell each week of rewards before the next drop
+    assert result.unsold == 0
+    assert result.sold == sum(weekly)
+    assert result.harvests == pytest.approx(
+        (len(weekly) + 1) * WEEK / (22 * HOUR), rel=0.1
+    )
+
+
+def test_simulator_sizes_sales_by_depth():
+    weekly = [70_000 * 10**18] * 8
+    thin = 1_000_000 * 10**18
+    fixed = run(Params(), weekly, depth=thin)
+    sized = run(Params(max_price_impact=50), weekly, depth=thin)
+
+    # smaller sales into a thin pool get a better price
+    assert sized.price > fixed.price
+
+    # a deep pool takes each week's rewards in one sale
+    deep = run(Params(max_price_impact=50), weekly, depth=100_000_000 * 10**18)
+    assert deep.unsold == 0
+    assert deep.sold == sum(weekly)
+
+
+def test_simulator_thin_pool_backlog_is_bounded():
+    # 50 bps of a 1M pool sells under the schedule, the backlog stops growing
+    # once a week of scheduled sales is waiting
+    for weeks in (8, 26):
+        weekly = [70_000 * 10**18] * weeks
+        result = run(Params(max_price_impact=50), weekly, depth=1_000_000 * 10**18)
+        assert result.unsold < weekly[0]
+        assert result.sold == sum(weekly) - result.unsold
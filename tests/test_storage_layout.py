@@ -0,0 +1,94 @@
+# The hot config is packed into two slots, these tests pin the packing so a
+# reordering or a widened type shows up here and not as a gas regression.
+
+import brownie
+from brownie import web3
+
+from scripts.unpacked_strategy import SOURCE, TARGET, unpacked
+
+HOUR = 60 * 60
+
+
+def read_slot(strategy, slot):
+    return int.from_bytes(web3.eth.get_storage_at(strategy.address, slot), "big")
+
+
+def config_slot(strategy):
+    # the slot holding the swapper address in its low 20 bytes
+    swapper = int(strategy.swapper(), 16)
+    for slot in range(64):
+        if read_slot(strategy, slot) & (2**160 - 1) == swapper:
+            return slot
+    raise AssertionError("config slot not found")
+
+
+def decode(strategy):
+    slot = config_slot(strategy)
+    thresholds = read_slot(strategy, slot - 1)
+    config = read_slot(strategy, slot)
+    return {
+        "swap_min": thresholds & (2**112 - 1),
+        "swap_max": (thresholds >> 112) & (2**112 - 1),
+        "auto_adjust": (thresholds >> 224) & 0xFF,
+        "swapper": config & (2**160 - 1),
+        "bypass_claim": (config >> 160) & 0xFF,
+        "bypass_max_stake": (config >> 168) & 0xFF,
+        "threshold_time_until_week_end": (config >> 176) & 0xFFFFFFFF,
+        "max_price_impact": (config >> 208) & 0xFFFF,
+        "max_claim_weeks": (config >> 224) & 0xFFFF,
+        "last_lock_week": config >> 240,
+    }
+
+
+def test_storage_layout_packs_config(strategy, gov):
+    strategy.setSwapThresholds(123 * 10**18, 4_567 * 10**18, False, {"from": gov})
+    strategy.setBypasses(True, True, {"from": gov})
+    strategy.setWeekEndHarvestTrigger(3 * HOUR, {"from": gov})
+    strategy.setMaxPriceImpact(75, {"from": gov})
+    strategy.setMaxClaimWeeks(12, {"from": gov})
+
+    assert decode(strategy) == {
+        "swap_min": 123 * 10**18,
+        "swap_max": 4_567 * 10**18,
+        "auto_adjust": 0,
+        "swapper": int(strategy.swapper(), 16),
+        "bypass_claim": 1,
+        "bypass_max_stake": 1,
+        "threshold_time_until_week_end": 3 * HOUR,
+        "max_price_impact": 75,
+        "max_claim_weeks": 12,
+        "last_lock_week": strategy.lastLockWeek(),
+    }
+    # setters don't clobber their neighbours
+    assert strategy.bypassClaim() and strategy.bypassMaxStake()
+    assert strategy.thresholdTimeUntilWeekEnd() == 3 * HOUR
+    assert strategy.maxPriceImpact() == 75
+    assert strategy.maxClaimWeeks() == 12
+
+    with brownie.reverts("!weeks"):
+        strategy.setMaxClaimWeeks(2**16, {"from": gov})
+
+
+def test_storage_layout_after_migration(
+    strategy, strategist, vault, gov, ybs, reward_distributor, Strategy
+):
+    new_strategy = strategist.deploy(
+        Strategy, vault, ybs, reward_distributor, strategy.swapper()
+    )
+    vault.migrateStrategy(strategy, new_strategy, {"from": gov})
+
+    # constructor defaults land in the packed slots
+    layout = decode(new_strategy)
+    assert layout["swap_min"] == 100 * 10**18
+    assert layout["swap_max"] == 10_000 * 10**18
+    assert layout["auto_adjust"] == 1
+    assert layout["threshold_time_until_week_end"] == HOUR
+    assert layout["max_claim_weeks"] == 8
+    assert layout["max_price_impact"] == 0
+    assert layout["last_lock_week"] == 0
+    assert new_strategy.estimatedTotalAssets() > 0
+
+
+def test_storage_layout_unpacked_mock_in_step():
+    # the gas benchmarks compare against it, run scripts/unpacked_strategy.py
+    assert TARGET.read_text() == unpacked(SOURCE.read_text())
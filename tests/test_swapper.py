@@ -0,0 +1,213 @@
+import pytest
+import brownie
+from brownie import ZERO_ADDRESS
+
+
+def route_quotes(swapper, tricrv_pool, ycrv_pool, amount):
+    # yCRV out of minting 1:1 vs exchanging on pool2, for `amount` crvUSD in
+    crv_out = tricrv_pool.get_dy(
+        swapper.pool1InTokenIdx(), swapper.pool1OutTokenIdx(), amount
+    )
+    swap_out = ycrv_pool.get_dy(
+        swapper.pool2InTokenIdx(), swapper.pool2OutTokenIdx(), crv_out
+    )
+    return crv_out, swap_out
+
+
+def test_swapper_v3_takes_best_route(
+    swapper_v3,
+    crvusd,
+    token,
+    tricrv_pool,
+    ycrv_pool,
+    ycrv_whale,
+    user,
+    crvusd_whale,
+    reward_token,
+):
+    amount = 1_000e18
+    reward_token.withdraw(2 * amount, user, user, {"from": user})
+    crvusd.approve(swapper_v3, 2**256 - 1, {"from": user})
+
+    mint_out, swap_out = route_quotes(swapper_v3, tricrv_pool, ycrv_pool, amount)
+    expected = swapper_v3.quote(amount)
+    assert expected == max(mint_out, swap_out)
+
+    before = token.balanceOf(user)
+    tx = swapper_v3.swap(amount, {"from": user})
+    assert tx.events["Routed"]["minted"] == (mint_out >= swap_out)
+    assert token.balanceOf(user) - before == tx.return_value >= expected
+
+    # have a whale swap in 500k yCRV, now pool2 pays more than minting
+    token.approve(ycrv_pool, 2**256 - 1, {"from": ycrv_whale})
+    ycrv_pool.exchange(
+        swapper_v3.pool2OutTokenIdx(),
+        swapper_v3.pool2InTokenIdx(),
+        500_000e18,
+        0,
+        {"from": ycrv_whale},
+    )
+    mint_out, swap_out = route_quotes(swapper_v3, tricrv_pool, ycrv_pool, amount)
+    assert swap_out > mint_out
+    assert swapper_v3.quote(amount) == swap_out
+
+    before = token.balanceOf(user)
+    tx = swapper_v3.swap(amount, {"from": user})
+    assert not tx.events["Routed"]["minted"]
+    assert "TokenExchange" in tx.events
+    assert token.balanceOf(user) - before == tx.return_value == swap_out
+
+
+def test_swapper_v3_sweep(swapper_v3, crvusd, gov, user, crvusd_whale, reward_token):
+    owner = gov
+    assert swapper_v3.owner() == owner
+    reward_token.withdraw(1_000e18, swapper_v3, user, {"from": user})
+    before = crvusd.balanceOf(owner)
+
+    with brownie.reverts("!authorized"):
+        swapper_v3.sweep(crvusd, {"from": user})
+
+    swapper_v3.sweep(crvusd, {"from": owner})
+    assert crvusd.balanceOf(owner) - before == 1_000e18
+
+
+@pytest.mark.parametrize("size", [1_000e18, 10_000e18, 50_000e18])
+def test_swapper_v4_split_execution(
+    swapper,
+    swapper_v2,
+    swapper_v3,
+    swapper_v4,
+    crvusd,
+    user,
+    crvusd_whale,
+    reward_token,
+    size,
+    execution,
+):
+    reward_token.withdraw(size, user, user, {"from": user})
+    swappers = {
+        "pool2": swapper,
+        "zap": swapper_v2,
+        "router": swapper_v3,
+        "split": swapper_v4,
+    }
+    realized = {}
+    for name, s in swappers.items():
+        crvusd.approve(s, size, {"from": user})
+        realized[name] = s.swap.call(size, {"from": user})
+        execution(name, size, realized[name])
+
+    # bisection lands within 1/32 of the sale of the optimal split
+    best_single = max(v for k, v in realized.items() if k != "split")
+    assert realized["split"] >= best_single * 0.999
+    assert swapper_v4.quote(size) == realized["split"]
+
+
+def test_swapper_v4_alt_pool(swapper_v4, alt_pool, crv, gov, user):
+    if not alt_pool:
+        pytest.skip("no alternative crvUSD -> CRV pool on this network")
+    assert swapper_v4.altPool() == alt_pool
+
+    with brownie.reverts("!authorized"):
+        swapper_v4.setAltPool(ZERO_ADDRESS, {"from": user})
+    # must trade tokenIn for tokenOutPool1
+    with brownie.reverts("!altPool"):
+        swapper_v4.setAltPool(swapper_v4.pool2(), {"from": gov})
+
+    swapper_v4.setAltPool(ZERO_ADDRESS, {"from": gov})
+    assert swapper_v4.altPool() == ZERO_ADDRESS
+
+
+@pytest.mark.parametrize(
+    "name", ["swapper", "swapper_v2", "swapper_v3", "swapper_v4", "swapper_v5"]
+)
+def test_swapper_defers_on_price_deviation(
+    request,
+    chain,
+    local,
+    crvusd,
+    crv,
+    token,
+    tricrv_pool,
+    accounts,
+    gov,
+    user,
+    crvusd_whale,
+    reward_token,
+    name,
+):
+    if not local:
+        pytest.skip("needs to move TriCRV spot well off its oracle")
+    swapper = request.getfixturevalue(name)
+    if name == "swapper_v4":
+        # or the split routes around pool1
+        swapper.setAltPool(ZERO_ADDRESS, {"from": gov})
+    amount = 1_000e18
+    reward_token.withdraw(amount, user, user, {"from": user})
+    crvusd.approve(swapper, amount, {"from": user})
+
+    # front run: buy CRV so our sale gets a much worse price than the oracle
+    attacker = accounts[9]
+    crvusd.mint(attacker, 2_000_000e18, {"from": attacker})
+    crvusd.approve(tricrv_pool, 2**256 - 1, {"from": attacker})
+    tricrv_pool.exchange(
+        swapper.pool1InTokenIdx(),
+        swapper.pool1OutTokenIdx(),
+        2_000_000e18,
+        0,
+        {"from": attacker},
+    )
+
+    before = token.balanceOf(user)
+    tx = swapper.swap(amount, {"from": user})
+    assert tx.return_value == 0
+    assert "SwapDeferred" in tx.events
+    assert crvusd.balanceOf(user) == amount
+    assert token.balanceOf(user) == before
+
+    # a wider tolerance lets it through
+    swapper.setSlippageTolerance(5_000, {"from": gov})
+    tx = swapper.swap(amount, {"from": user})
+    assert tx.return_value > 0
+    assert "SwapDeferred" not in tx.events
+    assert token.balanceOf(user) - before == tx.return_value
+
+
+def test_swapper_slippage_tolerance(
+    swapper, swapper_v2, swapper_v3, swapper_v4, swapper_v5, gov, user
+):
+    for s in [swapper, swapper_v2, swapper_v3, swapper_v4, swapper_v5]:
+        with brownie.reverts("!authorized"):
+            s.setSlippageTolerance(100, {"from": user})
+        with brownie.reverts("!tolerance"):
+            s.setSlippageTolerance(10_000, {"from": gov})
+        s.setSlippageTolerance(100, {"from": gov})
+        assert s.slippageTolerance() == 100
+
+    crv, ycrv = swapper.minAmountsOut(1_000e18)
+    assert swapper_v2.minAmountOut(1_000e18) == crv
+    assert swapper_v3.minAmountsOut(1_000e18) == (crv, ycrv)
+    assert swapper_v4.minAmountsOut(1_000e18) == (crv, ycrv)
+    assert swapper_v5.minAmountOut(1_000e18) == crv
+    assert 0 < ycrv
+
+
+def test_swapper_v5_pays_pool1_from_caller(
+    swapper_v5, crvusd, crv, token, tricrv_pool, user, crvusd_whale, reward_token
+):
+    amount = 1_000e18
+    reward_token.withdraw(amount, user, user, {"from": user})
+    crvusd.approve(swapper_v5, amount, {"from": user})
+
+    before = token.balanceOf(user)
+    tx = swapper_v5.swap(amount, {"from": user})
+    assert token.balanceOf(user) - before == tx.return_value > 0
+    # crvUSD names its Transfer fields sender/receiver
+    paid = list(tx.events["Transfer"][0].values())
+    assert paid[:2] == [user, tricrv_pool]
+    assert crvusd.balanceOf(swapper_v5) == 0 == crv.balanceOf(swapper_v5)
+
+    # only pool1 can make it pull
+    crvusd.approve(swapper_v5, amount, {"from": user})
+    with brownie.reverts("!pool1"):
+        swapper_v5.pool1Callback(user, user, crvusd, amount, 0, {"from": user})
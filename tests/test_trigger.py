@@ -41,3 +41,65 @@ def test_operation(
     assert not strategy.harvestTrigger(0)
     vault.deposit(1e18, {"from": user})
     assert not strategy.harvestTrigger(0)
+
+
+def test_trigger_reasons(chain, gov, vault, strategy, token, user, amount):
+    # 0 none, 1 week end, 2 forced, 3 report delay, 4 credit, 5 claimable
+    WEEK = 60 * 60 * 24 * 7
+    if strategy.harvestTrigger(0):
+        strategy.harvest({"from": gov})
+    strategy.setCreditThreshold(100e18, {"from": gov})
+
+    # stay clear of the week end window
+    week_end = (chain.time() // WEEK + 1) * WEEK
+    if week_end - chain.time() < strategy.thresholdTimeUntilWeekEnd() + 600:
+        chain.sleep(week_end - chain.time() + 600)
+        chain.mine()
+        strategy.harvest({"from": gov})
+    assert strategy.harvestTriggerReasons() == 0
+    assert not strategy.harvestTrigger(0)
+
+    strategy.setForceHarvestTriggerOnce(True, {"from": gov})
+    assert strategy.harvestTriggerReasons() == 2
+    assert strategy.harvestTrigger(0)
+    strategy.setForceHarvestTriggerOnce(False, {"from": gov})
+
+    token.approve(vault, amount, {"from": user})
+    vault.deposit(amount, {"from": user})
+    assert strategy.harvestTriggerReasons() == 4
+
+    # credit below the threshold only triggers in the week end window
+    strategy.setCreditThreshold(amount * 2, {"from": gov})
+    assert strategy.harvestTriggerReasons() == 0
+    week_end = (chain.time() // WEEK + 1) * WEEK
+    chain.sleep(week_end - chain.time() - strategy.thresholdTimeUntilWeekEnd() + 60)
+    chain.mine()
+    assert strategy.harvestTriggerReasons() == 1
+
+    chain.sleep(strategy.minReportDelay() + 1)
+    chain.mine()
+    assert strategy.harvestTriggerReasons() == 3
+
+
+def test_lock_once_per_week(chain, gov, strategy, proxy):
+    WEEK = 60 * 60 * 24 * 7
+    week_end = (chain.time() // WEEK + 1) * WEEK
+    window_start = week_end - strategy.thresholdTimeUntilWeekEnd()
+    if window_start + 60 > chain.time():
+        chain.sleep(window_start + 60 - chain.time())
+        chain.mine()
+
+    assert strategy.isLockPending()
+    tx = strategy.harvest({"from": gov})
+    assert proxy.address in [call["to"] for call in tx.subcalls]
+    assert not strategy.isLockPending()
+    assert strategy.lastLockWeek() == chain.time() // WEEK
+
+    # a second harvest in the same window doesn't call the proxy again
+    chain.sleep(60)
+    tx = strategy.harvest({"from": gov})
+    assert proxy.address not in [call["to"] for call in tx.subcalls]
+
+    chain.sleep(WEEK)
+    chain.mine()
+    assert strategy.isLockPending()
@@ -0,0 +1,67 @@
+from brownie import web3
+
+from scripts.view_cache import ViewCache
+
+
+def test_view_cache_permanent(strategy, swapper, ybs, tmp_path):
+    cache = ViewCache(tmp_path / "cache.json")
+    for _ in range(2):
+        assert cache.call(strategy.rewardToken) == strategy.rewardToken()
+        assert cache.call(swapper.tokenIn) == swapper.tokenIn()
+        assert cache.call(ybs.MAX_STAKE_GROWTH_WEEKS) == ybs.MAX_STAKE_GROWTH_WEEKS()
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 3
+
+
+def test_view_cache_code_hash_per_session(
+    chain, swapper, token, user, tmp_path, monkeypatch
+):
+    cache = ViewCache(tmp_path / "cache.json")
+    lookups = []
+    get_code = web3.eth.get_code
+    monkeypatch.setattr(
+        web3.eth, "get_code", lambda *args: lookups.append(args) or get_code(*args)
+    )
+    for _ in range(3):
+        assert cache.call(swapper.tokenIn) == swapper.tokenIn()
+    assert len(lookups) == 1
+
+    # a revert can leave other code at the address, look it up again
+    token.transfer(user, 0, {"from": user})
+    chain.undo()
+    cache.call(swapper.tokenIn)
+    assert len(lookups) == 2
+
+
+def test_view_cache_per_block(chain, token, user, tmp_path):
+    cache = ViewCache(tmp_path / "cache.json")
+    before = cache.call(token.balanceOf, user)
+    assert cache.call(token.balanceOf, user) == before
+    assert cache.hits == 1
+
+    token.transfer(user, 0, {"from": user})
+    assert cache.call(token.balanceOf, user) == token.balanceOf(user)
+    assert cache.misses == 2
+    # older blocks stay cached
+    height = chain.height - 1
+    assert cache.call(token.balanceOf, user, block_identifier=height) == before
+    assert cache.hits == 2
+
+
+def test_view_cache_lru_and_persistence(token, user, gov, strategy, tmp_path):
+    path = tmp_path / "cache.json"
+    cache = ViewCache(path, max_entries=2, persist=True)
+    cache.call(token.decimals)
+    cache.call(token.balanceOf, user)
+    cache.call(token.decimals)
+    # evicts balanceOf(user), the least recently used
+    cache.call(token.balanceOf, gov)
+    assert cache.stats()["entries"] == 2
+    cache.save()
+
+    reloaded = ViewCache(path, max_entries=2)
+    assert reloaded.call(token.decimals) == token.decimals()
+    assert reloaded.call(token.balanceOf, gov) == token.balanceOf(gov)
+    assert reloaded.stats()["hits"] == 2
+    reloaded.call(token.balanceOf, user)
+    assert reloaded.stats()["misses"] == 1